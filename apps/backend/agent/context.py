@@ -0,0 +1,233 @@
+"""Token-budgeted graph context for RAG answers.
+
+The builder picks the k-hop neighbourhood of the entities mentioned in a
+question, ranks it by graph distance and recency, and serializes it in a
+compact, deterministic text form that fits a token budget. Results are
+cached per (project, entity set, graph version), so repeated questions about
+an unchanged graph cost a dictionary lookup.
+
+Mentions are looked up in a table of normalized entity names, built once per
+project and graph version, so finding them costs a lookup per run of words in
+the question rather than a scan of the project.
+"""
+
+import math
+import re
+from collections import OrderedDict, deque
+from typing import Any, NamedTuple
+
+from agent.resolver import normalize_name
+from config.config import get_settings
+from graphstore.memory import InMemoryGraphStore, get_graph_store
+from models.graph import Edge, Node
+
+CacheKey = tuple[str | None, frozenset[str], int]
+
+# Properties already rendered in the node header.
+_HEADER_PROPERTIES = {"name", "progetto_id"}
+
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+class _NameTable(NamedTuple):
+    """The entity names of a project at a graph version."""
+
+    version: int
+    ids: dict[str, set[str]]
+    max_words: int
+
+
+def _phrase(text: str) -> str:
+    """Normalize text to single-spaced words, dropping punctuation."""
+    return " ".join(_NON_WORD.sub(" ", normalize_name(text)).split())
+
+
+def estimate_tokens(text: str, chars_per_token: int = 4) -> int:
+    """Estimate the token count of a text without running a tokenizer."""
+    return math.ceil(len(text) / chars_per_token)
+
+
+def _format_value(value: Any) -> str:
+    """Render a property value compactly on a single line."""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    return str(value)
+
+
+def format_node(node: Node) -> str:
+    """Serialize a node as a single line."""
+    line = f"[{node.type} {node.id}] {node.properties.get('name', '')}".rstrip()
+    extra = [
+        f"{key}={_format_value(value)}"
+        for key, value in sorted(node.properties.items())
+        if key not in _HEADER_PROPERTIES and value is not None
+    ]
+    if extra:
+        line += " | " + "; ".join(extra)
+    return line
+
+
+def format_edge(edge: Edge) -> str:
+    """Serialize an edge as a single line."""
+    return f"{edge.source} -{edge.type}-> {edge.target}"
+
+
+class GraphContextBuilder:
+    """Assembles the graph context fed to the answer node."""
+
+    def __init__(
+        self,
+        store: InMemoryGraphStore,
+        *,
+        token_budget: int = 1024,
+        hops: int = 2,
+        recency_weight: float = 0.5,
+        cache_size: int = 128,
+        chars_per_token: int = 4,
+    ):
+        """Initialize the context builder.
+
+        Args:
+            store: The graph store to read subgraphs from
+            token_budget: Maximum estimated tokens of the serialized context
+            hops: Neighbourhood radius around the mentioned entities
+            recency_weight: Weight of recency relative to graph distance
+            cache_size: Number of assembled contexts kept in the LRU cache
+            chars_per_token: Characters per token used for budget estimates
+
+        """
+        self._store = store
+        self._token_budget = token_budget
+        self._hops = hops
+        self._recency_weight = recency_weight
+        self._cache_size = cache_size
+        self._chars_per_token = chars_per_token
+        self._cache: OrderedDict[CacheKey, str] = OrderedDict()
+        self._names: dict[str | None, _NameTable] = {}
+
+    def find_mentions(self, question: str, project_id: str | None = None) -> set[str]:
+        """Return the ids of the entities whose name appears in the question."""
+        table = self._name_table(project_id)
+        words = _phrase(question).split()
+        mentioned: set[str] = set()
+        for start in range(len(words)):
+            for end in range(start + 1, min(start + table.max_words, len(words)) + 1):
+                mentioned |= table.ids.get(" ".join(words[start:end]), set())
+        return mentioned
+
+    def _name_table(self, project_id: str | None) -> _NameTable:
+        """Return the entity names of a project, rebuilt when the graph changes."""
+        version = self._store.version
+        table = self._names.get(project_id)
+        if table is None or table.version != version:
+            ids: dict[str, set[str]] = {}
+            for node in self._store.nodes(progetto_id=project_id):
+                name = node.properties.get("name")
+                if isinstance(name, str) and (phrase := _phrase(name)):
+                    ids.setdefault(phrase, set()).add(node.id)
+            max_words = max((phrase.count(" ") + 1 for phrase in ids), default=0)
+            table = self._names[project_id] = _NameTable(version, ids, max_words)
+        return table
+
+    def build(self, question: str, project_id: str | None = None) -> str:
+        """Build the serialized context for a question.
+
+        Args:
+            question: The user question
+            project_id: Optional project the question is scoped to
+
+        Returns:
+            The context text, empty if no known entity is mentioned.
+
+        """
+        seeds = frozenset(self.find_mentions(question, project_id))
+        if not seeds:
+            return ""
+
+        key: CacheKey = (project_id, seeds, self._store.version)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        context = self._serialize(self._rank(self._neighbourhood(seeds)))
+        self._cache[key] = context
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return context
+
+    def _neighbourhood(self, seeds: frozenset[str]) -> dict[str, int]:
+        """Return the nodes within ``hops`` of the seeds with their distance."""
+        distances = dict.fromkeys(seeds, 0)
+        frontier = deque(sorted(seeds))
+        while frontier:
+            node_id = frontier.popleft()
+            distance = distances[node_id]
+            if distance >= self._hops:
+                continue
+            for neighbour in sorted(self._store.neighbors(node_id)):
+                if neighbour not in distances:
+                    distances[neighbour] = distance + 1
+                    frontier.append(neighbour)
+        return distances
+
+    def _rank(self, distances: dict[str, int]) -> list[Node]:
+        """Order nodes by relevance (graph distance) and recency."""
+        version = max(self._store.version, 1)
+
+        def score(node_id: str) -> float:
+            relevance = 1.0 / (1 + distances[node_id])
+            recency = self._store.node_version(node_id) / version
+            return relevance + self._recency_weight * recency
+
+        ranked = sorted(distances, key=lambda node_id: (-score(node_id), node_id))
+        nodes = (self._store.get_node(node_id) for node_id in ranked)
+        return [node for node in nodes if node is not None]
+
+    def _serialize(self, nodes: list[Node]) -> str:
+        """Serialize ranked nodes, then the edges between them, within budget."""
+        lines: list[str] = []
+        used = 0
+        included: set[str] = set()
+
+        for node in nodes:
+            line = format_node(node)
+            cost = estimate_tokens(line + "\n", self._chars_per_token)
+            if used + cost > self._token_budget:
+                break
+            lines.append(line)
+            included.add(node.id)
+            used += cost
+
+        edges = {
+            (edge.source, edge.type, edge.target): edge
+            for node_id in included
+            for edge in self._store.incident_edges(node_id)
+            if edge.source in included and edge.target in included
+        }
+        for key in sorted(edges):
+            line = format_edge(edges[key])
+            cost = estimate_tokens(line + "\n", self._chars_per_token)
+            if used + cost > self._token_budget:
+                break
+            lines.append(line)
+            used += cost
+
+        return "\n".join(lines)
+
+
+# Global context builder instance
+_context_builder: GraphContextBuilder | None = None
+
+
+def get_context_builder() -> GraphContextBuilder:
+    """Get the global context builder instance."""
+    global _context_builder  # noqa: PLW0603
+    if _context_builder is None:
+        runtime = get_settings().runtime
+        _context_builder = GraphContextBuilder(
+            get_graph_store(),
+            token_budget=runtime.rag_token_budget,
+            hops=runtime.rag_hops,
+        )
+    return _context_builder
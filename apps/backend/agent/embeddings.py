@@ -0,0 +1,70 @@
+"""Text embedders for semantic retrieval over graph entities."""
+
+import hashlib
+import itertools
+import re
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from .resolver import normalize_name
+
+_WORD = re.compile(r"\w+")
+
+
+class Embedder(ABC):
+    """Abstract interface for a text embedding model."""
+
+    def __init__(self, name: str, dimension: int):
+        """Initialize the embedder with its name and vector size."""
+        self.name = name
+        self.dimension = dimension
+
+    @abstractmethod
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed a batch of texts.
+
+        Args:
+            texts: The texts to embed.
+
+        Returns:
+            A ``float32`` matrix of shape ``(len(texts), dimension)`` whose
+            rows have unit length, or are zero for texts with no features.
+
+        """
+        pass
+
+
+class HashingEmbedder(Embedder):
+    """Deterministic local embedder based on the hashing trick.
+
+    Words and adjacent word pairs of the normalized text are hashed into
+    signed buckets. Texts sharing vocabulary get similar vectors, which is
+    enough for tests and for offline use without an embedding service.
+    Hashing uses BLAKE2 rather than ``hash()``, so vectors are stable across
+    processes and can be persisted.
+    """
+
+    def __init__(self, dimension: int = 256):
+        """Initialize the embedder.
+
+        Args:
+            dimension: Number of hash buckets
+
+        """
+        super().__init__(f"hashing-{dimension}", dimension)
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed a batch of texts."""
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = _WORD.findall(normalize_name(text))
+            for feature in words + [f"{a} {b}" for a, b in itertools.pairwise(words)]:
+                digest = int.from_bytes(
+                    hashlib.blake2b(feature.encode(), digest_size=8).digest()
+                )
+                sign = 1.0 if digest >> 63 else -1.0
+                vectors[row, digest % self.dimension] += sign
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
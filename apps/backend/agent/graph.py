@@ -1,63 +1,210 @@
-"""Defines the agent graph for the Puntini backend."""
+"""Defines the agent graph for the Puntini backend.
 
-from typing import TypedDict
+LangGraph is slow to import, so the workflow is built and compiled on first
+use by :func:`get_agent_app` rather than when this module is imported; the
+application warms it up in the background at startup.
+"""
 
-from langgraph.graph import END, StateGraph
+import asyncio
+from typing import TYPE_CHECKING, Any, TypedDict
+
+from agent.context import get_context_builder
+from agent.resolver import EntityResolver
+from agent.scheduler import get_admission_scheduler
+from config.tracing import traced
+from graphstore.memory import InMemoryGraphStore, get_graph_store
+from graphstore.partitions import get_project_partitions
+from models.graph import ExtractedEntity, Node
+
+if TYPE_CHECKING:
+    from langgraph.graph.state import CompiledStateGraph
 
 
 class AgentState(TypedDict):
     """Represents the state of our graph."""
 
     input: str
+    project_id: str | None
     extracted_entities: list
     validated_entities: list
+    patches: list
+    resolved_versions: dict[str | None, int]
     upsert_results: dict
+    context: str
     response: str
 
 
+@traced("agent.extract")
 def extract(_state: AgentState):
     """Extract entities from the input."""
-    print("---EXTRACT---")
     # In a real implementation, this would call an LLM to extract entities.
-    return {"extracted_entities": ["entity1", "entity2"]}
+    return {
+        "extracted_entities": [
+            {"type": "Issue", "name": "entity1"},
+            {"type": "Issue", "name": "entity2"},
+        ]
+    }
 
 
+@traced("agent.validate")
 def validate(state: AgentState):
     """Validate the extracted entities."""
-    print("---VALIDATE---")
-    # In a real implementation, this would use Pydantic models to validate.
-    return {"validated_entities": state["extracted_entities"]}
-
-
-def upsert(_state: AgentState):
-    """Upsert the validated entities into the graph."""
-    print("---UPSERT---")
-    # In a real implementation, this would call the GraphStore.
-    return {"upsert_results": {"success": True}}
-
-
-def answer(_state: AgentState):
+    return {
+        "validated_entities": [
+            ExtractedEntity.model_validate(entity)
+            for entity in state["extracted_entities"]
+        ]
+    }
+
+
+def _resolve_patches(
+    store: InMemoryGraphStore, entities: list[ExtractedEntity]
+) -> tuple[list, dict[str | None, int]]:
+    """Diff entities against the nodes of the store they could match.
+
+    Returns:
+        tuple: The patches and the version of every project the diff read,
+            taken before reading it
+
+    """
+    versions = store.project_versions()
+    # Only the projects, unscoped types and ids the entities refer to can match.
+    candidates: dict[str, Node] = {}
+    for progetto_id in {e.progetto_id for e in entities} - {None}:
+        for node in store.nodes(progetto_id=progetto_id):
+            candidates[node.id] = node
+    for node_type in {e.type for e in entities if e.progetto_id is None}:
+        for node in store.nodes(node_type=node_type):
+            if "progetto_id" not in node.properties:
+                candidates[node.id] = node
+    for entity in entities:
+        if entity.id is not None and (node := store.get_node(entity.id)):
+            candidates[node.id] = node
+
+    projects = {e.progetto_id for e in entities} | {
+        node.properties.get("progetto_id") for node in candidates.values()
+    }
+    return EntityResolver(candidates.values()).diff(entities), {
+        project: versions.get(project, 0) for project in projects
+    }
+
+
+@traced("agent.resolve")
+def resolve(state: AgentState):
+    """Resolve the validated entities against the graph and keep only the delta.
+
+    LangGraph runs this node in a worker thread without the store lock; the
+    versions of the projects read are kept so ``upsert`` can tell whether
+    the diff went stale.
+    """
+    patches, versions = _resolve_patches(get_graph_store(), state["validated_entities"])
+    return {"patches": patches, "resolved_versions": versions}
+
+
+@traced("agent.upsert")
+async def upsert(state: AgentState):
+    """Upsert the resolved patches under the write lock of the project.
+
+    The patches are applied only if none of the projects they were resolved
+    against changed since; otherwise they are diffed again in a worker
+    thread while the project lock is held, so writers of the same project
+    wait for each other and writers of other projects never do.
+    """
+    entities = state["validated_entities"]
+    patches, versions = state["patches"], state["resolved_versions"]
+    async with get_project_partitions().write(state.get("project_id")) as store:
+        while True:
+            with store.lock:
+                if all(
+                    store.project_version(project) == version
+                    for project, version in versions.items()
+                ):
+                    results = (
+                        store.upsert(patches)
+                        if patches
+                        else {"success": True, "applied": 0, "errors": []}
+                    )
+                    return {"patches": patches, "upsert_results": results}
+            # Another writer changed these projects since the diff.
+            patches, versions = await asyncio.to_thread(
+                _resolve_patches, store, entities
+            )
+
+
+@traced("agent.answer")
+def answer(state: AgentState):
     """Generate a final response."""
-    print("---ANSWER---")
-    # In a real implementation, this would generate a natural language response.
-    return {"response": "Graph has been updated successfully."}
-
-
-# Define the workflow
-workflow = StateGraph(AgentState)
-
-# Add the nodes
-workflow.add_node("extract", extract)
-workflow.add_node("validate", validate)
-workflow.add_node("upsert", upsert)
-workflow.add_node("answer", answer)
-
-# Build the graph
-workflow.set_entry_point("extract")
-workflow.add_edge("extract", "validate")
-workflow.add_edge("validate", "upsert")
-workflow.add_edge("upsert", "answer")
-workflow.add_edge("answer", END)
-
-# Compile the app
-app = workflow.compile()
+    context = get_context_builder().build(state["input"], state.get("project_id"))
+    # In a real implementation, an LLM would answer from the graph context.
+    return {"context": context, "response": "Graph has been updated successfully."}
+
+
+def build_workflow() -> Any:
+    """Build the agent workflow: extract, validate, resolve, upsert, answer."""
+    from langgraph.graph import END, StateGraph  # noqa: PLC0415
+
+    workflow = StateGraph(AgentState)
+
+    # Add the nodes
+    workflow.add_node("extract", extract)
+    workflow.add_node("validate", validate)
+    workflow.add_node("resolve", resolve)
+    workflow.add_node("upsert", upsert)
+    workflow.add_node("answer", answer)
+
+    # Build the graph
+    workflow.set_entry_point("extract")
+    workflow.add_edge("extract", "validate")
+    workflow.add_edge("validate", "resolve")
+    workflow.add_edge("resolve", "upsert")
+    workflow.add_edge("upsert", "answer")
+    workflow.add_edge("answer", END)
+    return workflow
+
+
+# Compiled agent graph, built on first use
+_agent_app: "CompiledStateGraph | None" = None
+
+
+def get_agent_app() -> "CompiledStateGraph":
+    """Get the compiled agent graph, compiling it on first use."""
+    global _agent_app  # noqa: PLW0603
+    if _agent_app is None:
+        _agent_app = build_workflow().compile()
+    return _agent_app
+
+
+def __getattr__(name: str) -> Any:
+    """Compile the graph when the former module-level ``app`` is accessed."""
+    if name == "app":
+        return get_agent_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def run_agent(
+    text: str,
+    user_id: str,
+    project_id: str | None = None,
+    timeout: float | None = None,
+) -> AgentState:
+    """Run the agent graph on a prompt once the admission scheduler allows it.
+
+    Args:
+        text: The user prompt
+        user_id: The user the run is queued under
+        project_id: The project the run is scoped to
+        timeout: Seconds to wait for admission before the run is shed
+
+    Returns:
+        AgentState: The final state of the graph
+
+    Raises:
+        AdmissionRejectedError: If the run was shed while queued
+
+    """
+    return await get_admission_scheduler().run(
+        user_id,
+        project_id,
+        lambda: get_agent_app().ainvoke({"input": text, "project_id": project_id}),
+        timeout=timeout,
+    )
@@ -0,0 +1,394 @@
+"""LLM dispatch layer with hedged requests across providers.
+
+Agent nodes call :meth:`LLMDispatcher.complete` instead of a provider
+directly. The dispatcher sends the prompt to the provider with the best
+observed latency and, if no answer arrives within that provider's p95
+latency, hedges by starting the next provider. The first successful answer
+wins and the losing call is cancelled.
+
+The HTTP client library is imported when the first provider is created, so
+modules that only need :class:`LatencyTracker` do not pay for it. Provider
+clients belong to the event loop that created them: the application closes
+the global dispatcher with :func:`close_llm_dispatcher` when it shuts down,
+and the next lifespan creates a new one.
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from opentelemetry import trace
+
+from agent.context import estimate_tokens
+from config.config import get_settings
+from config.settings import Settings
+
+tracer = trace.get_tracer(__name__)
+
+
+class LLMError(Exception):
+    """Raised when no provider could complete a prompt."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class LLMResult:
+    """The winning completion of a dispatched prompt."""
+
+    provider: str
+    text: str
+    latency: float
+    hedged: bool
+
+
+class LLMProvider(ABC):
+    """Abstract interface for an LLM provider."""
+
+    def __init__(self, name: str):
+        """Initialize the provider with its name in ``llm_config``."""
+        self.name = name
+
+    @abstractmethod
+    async def complete(self, prompt: str) -> str:
+        """Return the completion of a prompt.
+
+        Args:
+            prompt: The prompt to complete.
+
+        Returns:
+            The generated text.
+
+        """
+        pass
+
+    @abstractmethod
+    async def ping(self):
+        """Check that the provider is reachable, without generating text.
+
+        Raises:
+            Exception: If the provider could not be reached
+
+        """
+        pass
+
+    async def aclose(self):  # noqa: B027
+        """Release the connections held by the provider, if any."""
+        pass
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Provider for OpenAI-compatible chat completion APIs such as DeepSeek."""
+
+    def __init__(
+        self, name: str, api_url: str, api_key: str, model: str, timeout: float = 60.0
+    ):
+        """Initialize the provider."""
+        super().__init__(name)
+        import httpx  # noqa: PLC0415
+
+        self._client = httpx.AsyncClient(
+            base_url=api_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout,
+        )
+        self._model = model
+
+    async def complete(self, prompt: str) -> str:
+        """Return the completion of a prompt."""
+        response = await self._client.post(
+            "/chat/completions",
+            json={
+                "model": self._model,
+                "messages": [{"role": "user", "content": prompt}],
+            },
+        )
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+
+    async def ping(self):
+        """Check that the API is reachable by listing its models."""
+        response = await self._client.get("/models")
+        response.raise_for_status()
+
+    async def aclose(self):
+        """Close the HTTP client."""
+        await self._client.aclose()
+
+
+class OllamaProvider(LLMProvider):
+    """Provider for a local Ollama server."""
+
+    def __init__(self, name: str, base_url: str, model: str, timeout: float = 120.0):
+        """Initialize the provider."""
+        super().__init__(name)
+        import httpx  # noqa: PLC0415
+
+        self._client = httpx.AsyncClient(base_url=base_url, timeout=timeout)
+        self._model = model
+
+    async def complete(self, prompt: str) -> str:
+        """Return the completion of a prompt."""
+        response = await self._client.post(
+            "/api/chat",
+            json={
+                "model": self._model,
+                "messages": [{"role": "user", "content": prompt}],
+                "stream": False,
+            },
+        )
+        response.raise_for_status()
+        return response.json()["message"]["content"]
+
+    async def ping(self):
+        """Check that the server is reachable by listing its local models."""
+        response = await self._client.get("/api/tags")
+        response.raise_for_status()
+
+    async def aclose(self):
+        """Close the HTTP client."""
+        await self._client.aclose()
+
+
+class LatencyTracker:
+    """Sliding window of successful call latencies for one provider."""
+
+    def __init__(self, window: int = 200):
+        """Initialize the tracker with the given window size."""
+        self._samples: deque[float] = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.wins = 0
+
+    def record(self, latency: float):
+        """Record the latency of a successful call."""
+        self._samples.append(latency)
+
+    def quantile(self, q: float, default: float, min_samples: int = 5) -> float:
+        """Return the ``q`` quantile, or ``default`` until enough samples exist."""
+        if len(self._samples) < min_samples:
+            return default
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def stats(self) -> dict[str, Any]:
+        """Return the tracked statistics."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "wins": self.wins,
+            "p50": self.quantile(0.5, default=0.0, min_samples=1),
+            "p95": self.quantile(0.95, default=0.0, min_samples=1),
+        }
+
+
+class LLMDispatcher:
+    """Dispatches prompts to providers with hedging and concurrency limits."""
+
+    def __init__(
+        self,
+        providers: list[LLMProvider],
+        *,
+        max_concurrency: int = 10,
+        hedge_quantile: float = 0.95,
+        default_hedge_delay: float = 2.0,
+        window: int = 200,
+    ):
+        """Initialize the dispatcher.
+
+        Args:
+            providers: Providers in order of preference
+            max_concurrency: Maximum in-flight calls per provider
+            hedge_quantile: Latency quantile after which a hedge is started
+            default_hedge_delay: Hedge delay used until latencies are known
+            window: Number of latency samples kept per provider
+
+        """
+        if not providers:
+            raise ValueError("At least one LLM provider is required")
+        self._providers = providers
+        self._hedge_quantile = hedge_quantile
+        self._default_hedge_delay = default_hedge_delay
+        self._limits = {p.name: asyncio.Semaphore(max_concurrency) for p in providers}
+        self._trackers = {p.name: LatencyTracker(window) for p in providers}
+        self._logger = logging.getLogger(__name__)
+
+    async def complete(self, prompt: str) -> LLMResult:
+        """Complete a prompt with the fastest responding provider.
+
+        Args:
+            prompt: The prompt to complete
+
+        Returns:
+            LLMResult: The first successful completion
+
+        Raises:
+            LLMError: If every provider failed
+
+        """
+        with tracer.start_as_current_span("llm.dispatch") as span:
+            result = await self._dispatch(prompt)
+            span.set_attribute("llm.provider", result.provider)
+            span.set_attribute("llm.hedged", result.hedged)
+            return result
+
+    async def _dispatch(self, prompt: str) -> LLMResult:
+        """Race providers for a prompt, hedging after the primary's p95."""
+        candidates = self._ranked()
+        running: dict[asyncio.Task, LLMProvider] = {}
+        started = time.perf_counter()
+        last_error: BaseException | None = None
+
+        def launch():
+            provider = candidates.pop(0)
+            running[asyncio.create_task(self._call(provider, prompt))] = provider
+            return provider
+
+        try:
+            primary = launch()
+            hedge_delay = self._trackers[primary.name].quantile(
+                self._hedge_quantile, self._default_hedge_delay
+            )
+
+            while running:
+                timeout = None
+                if candidates and len(running) == 1:
+                    timeout = max(0.0, hedge_delay - (time.perf_counter() - started))
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    hedge = launch()
+                    self._logger.debug(
+                        "Hedging LLM call to %s after %.3fs", hedge.name, hedge_delay
+                    )
+                    continue
+
+                for task in done:
+                    provider = running.pop(task)
+                    if task.exception() is None:
+                        self._trackers[provider.name].wins += 1
+                        return LLMResult(
+                            provider=provider.name,
+                            text=task.result(),
+                            latency=time.perf_counter() - started,
+                            hedged=provider is not primary,
+                        )
+                    last_error = task.exception()
+                    self._logger.warning(
+                        "LLM provider %s failed: %s", provider.name, last_error
+                    )
+
+                # Replace failed calls right away instead of waiting to hedge.
+                if not running and candidates:
+                    launch()
+        finally:
+            for task in running:
+                task.cancel()
+
+        raise LLMError(f"All LLM providers failed: {last_error}") from last_error
+
+    async def ping(self) -> dict[str, str | None]:
+        """Check every provider concurrently.
+
+        Returns:
+            dict[str, str | None]: The error per provider, None if reachable
+
+        """
+        results = await asyncio.gather(
+            *(provider.ping() for provider in self._providers),
+            return_exceptions=True,
+        )
+        return {
+            provider.name: (
+                f"{type(result).__name__}: {result}"
+                if isinstance(result, BaseException)
+                else None
+            )
+            for provider, result in zip(self._providers, results, strict=True)
+        }
+
+    async def aclose(self):
+        """Close every provider."""
+        await asyncio.gather(*(provider.aclose() for provider in self._providers))
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return latency statistics per provider."""
+        return {name: tracker.stats() for name, tracker in self._trackers.items()}
+
+    def _ranked(self) -> list[LLMProvider]:
+        """Return providers ordered by observed median latency, then preference."""
+        default = float("inf")
+        return sorted(
+            self._providers,
+            key=lambda p: self._trackers[p.name].quantile(0.5, default),
+        )
+
+    async def _call(self, provider: LLMProvider, prompt: str) -> str:
+        """Call a provider within its concurrency limit and record its latency."""
+        tracker = self._trackers[provider.name]
+        async with self._limits[provider.name]:
+            tracker.calls += 1
+            with tracer.start_as_current_span("llm.complete") as span:
+                span.set_attribute("llm.provider", provider.name)
+                span.set_attribute("llm.prompt_tokens", estimate_tokens(prompt))
+                started = time.perf_counter()
+                try:
+                    text = await provider.complete(prompt)
+                except asyncio.CancelledError:
+                    span.set_attribute("llm.cancelled", True)
+                    raise
+                except Exception:
+                    tracker.errors += 1
+                    raise
+                tracker.record(time.perf_counter() - started)
+                span.set_attribute("llm.completion_tokens", estimate_tokens(text))
+                return text
+
+
+def create_provider(name: str, settings: dict[str, Any]) -> LLMProvider:
+    """Create a provider from its ``llm_config`` entry."""
+    if "base_url" in settings:
+        return OllamaProvider(name, settings["base_url"], settings["model"])
+    return OpenAICompatibleProvider(
+        name, settings["api_url"], settings["api_key"], settings["model"]
+    )
+
+
+def create_dispatcher(settings: Settings) -> LLMDispatcher:
+    """Create a dispatcher for every provider in ``llm_config``.
+
+    The configured ``llm_provider`` is preferred until latencies are known,
+    and each provider may run ``runtime.max_concurrent_agents`` calls at once.
+    """
+    preferred = settings.llm_provider
+    names = sorted(settings.llm_config, key=lambda name: name != preferred)
+    return LLMDispatcher(
+        [create_provider(name, settings.llm_config[name]) for name in names],
+        max_concurrency=settings.runtime.max_concurrent_agents,
+    )
+
+
+# Global dispatcher instance
+_llm_dispatcher: LLMDispatcher | None = None
+
+
+def get_llm_dispatcher() -> LLMDispatcher:
+    """Get the global LLM dispatcher instance."""
+    global _llm_dispatcher  # noqa: PLW0603
+    if _llm_dispatcher is None:
+        _llm_dispatcher = create_dispatcher(get_settings())
+    return _llm_dispatcher
+
+
+async def close_llm_dispatcher():
+    """Close the global dispatcher; the next call to get it creates a new one."""
+    global _llm_dispatcher
+    dispatcher, _llm_dispatcher = _llm_dispatcher, None
+    if dispatcher is not None:
+        await dispatcher.aclose()
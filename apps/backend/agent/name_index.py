@@ -0,0 +1,262 @@
+"""Fuzzy name and full-text index over project entities.
+
+Entity names are indexed by character trigrams for typo-tolerant matching,
+and names and descriptions by word for full-text lookup. Both use the
+normalization of the entity resolver, so "Perù" finds "Peru".
+
+A query never scans whole postings of common trigrams. Its candidates are
+the entities sharing at least two of its ``PAIR_GRAMS`` rarest trigrams,
+found by intersecting those postings pairwise; a misspelled name still
+shares most of its trigrams with the query, so it survives a typo or two.
+Postings of the query words are then merged rarest first until
+``max_candidates`` is reached, so rare words also find entities by their
+description. Only the candidates are scored.
+"""
+
+import heapq
+import itertools
+import re
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+from graphstore.memory import InMemoryGraphStore, get_graph_store
+from models.graph import (
+    AddNode,
+    Delete,
+    GraphPatch,
+    Node,
+    Patch,
+    UpdateProps,
+    as_graph_patch,
+)
+
+from .resolver import normalize_name
+
+# Node types whose names are indexed.
+INDEXED_TYPES = frozenset({"Epic", "Issue", "Utente", "Task"})
+
+# Number of rarest query trigrams intersected pairwise to find candidates.
+PAIR_GRAMS = 5
+
+# Score of a match on every query word, in the name or only the description.
+NAME_WORD_WEIGHT = 0.9
+TEXT_WORD_WEIGHT = 0.6
+
+_WORD = re.compile(r"\w{2,}")
+
+
+class NameMatch(NamedTuple):
+    """An entity matching a name query."""
+
+    id: str
+    type: str
+    name: str
+    score: float
+
+
+class _Entry(NamedTuple):
+    """The indexed fields of an entity."""
+
+    type: str
+    progetto_id: str | None
+    name: str
+    grams: frozenset[str]
+    name_words: frozenset[str]
+    text_words: frozenset[str]
+
+
+def trigrams(text: str) -> frozenset[str]:
+    """Return the padded character trigrams of normalized text."""
+    padded = f"  {text} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def _words(text: str) -> frozenset[str]:
+    return frozenset(_WORD.findall(text))
+
+
+class NameIndex:
+    """In-process trigram and word index over entity names and descriptions."""
+
+    def __init__(
+        self,
+        node_types: Iterable[str] = INDEXED_TYPES,
+        max_candidates: int = 128,
+    ):
+        """Initialize an empty index.
+
+        Args:
+            node_types: The node types to index
+            max_candidates: Number of candidates after which word postings
+                are no longer merged
+
+        """
+        self._node_types = frozenset(node_types)
+        self._max_candidates = max_candidates
+        self._entries: dict[str, _Entry] = {}
+        # Type and indexed properties per node, to re-index partial updates.
+        self._types: dict[str, str] = {}
+        self._fields: dict[str, dict[str, Any]] = {}
+        self._grams: dict[str, set[str]] = {}
+        self._name_words: dict[str, set[str]] = {}
+        self._text_words: dict[str, set[str]] = {}
+
+    @classmethod
+    def from_nodes(cls, nodes: Iterable[Node]) -> "NameIndex":
+        """Build the index for an existing set of nodes."""
+        index = cls()
+        for node in nodes:
+            index._set_node(node.id, node.type, node.properties)
+        return index
+
+    def __len__(self) -> int:
+        """Return the number of indexed entities."""
+        return len(self._entries)
+
+    def apply(self, patches: Iterable[Patch | GraphPatch]):
+        """Update the index with an applied batch of patches."""
+        for patch in patches:
+            match as_graph_patch(patch):
+                case AddNode(id=node_id, type=node_type, properties=properties):
+                    fields = {**self._fields.get(node_id, {}), **properties}
+                    self._set_node(node_id, node_type, fields)
+                case UpdateProps(entity="node", id=node_id, properties=properties) if (
+                    node_id in self._types
+                ):
+                    fields = {**self._fields[node_id], **properties}
+                    self._set_node(node_id, self._types[node_id], fields)
+                case Delete(entity="node", id=node_id):
+                    self._drop_node(node_id)
+
+    def search(
+        self,
+        query: str,
+        *,
+        node_type: str | None = None,
+        progetto_id: str | None = None,
+        limit: int = 10,
+        min_score: float = 0.3,
+    ) -> list[NameMatch]:
+        """Return the entities best matching a query, best first.
+
+        Args:
+            query: Approximate name or words from the description
+            node_type: Only return entities of this type
+            progetto_id: Only return entities of this project
+            limit: Maximum number of matches
+            min_score: Minimum score, between 0 and 1
+
+        Returns:
+            list[NameMatch]: The matches, sorted by decreasing score
+
+        """
+        text = normalize_name(query)
+        if not text:
+            return []
+        query_grams = trigrams(text)
+        query_words = _words(text)
+
+        # Trigrams no entity has, typically the misspelled ones, cannot help.
+        ranked = sorted(
+            (postings for g in query_grams if (postings := self._grams.get(g))),
+            key=len,
+        )
+        candidates: set[str] = set()
+        for first, second in itertools.combinations(ranked[:PAIR_GRAMS], 2):
+            candidates |= first & second
+        word_postings = [
+            postings.get(word, set())
+            for word in query_words
+            for postings in (self._name_words, self._text_words)
+        ]
+        # A query too short for two known trigrams matches on its only one.
+        fallback = ranked if len(ranked) == 1 else []
+        for postings in sorted(fallback + word_postings, key=len):
+            if len(candidates) + len(postings) > self._max_candidates:
+                break
+            candidates |= postings
+
+        scored = []
+        query_size = len(query_grams)
+        word_count = len(query_words)
+        for node_id in candidates:
+            entry = self._entries[node_id]
+            if node_type is not None and entry.type != node_type:
+                continue
+            if progetto_id is not None and entry.progetto_id != progetto_id:
+                continue
+            score = 2 * len(query_grams & entry.grams) / (query_size + len(entry.grams))
+            if word_count and score < NAME_WORD_WEIGHT:
+                score = max(
+                    score,
+                    NAME_WORD_WEIGHT * len(query_words & entry.name_words) / word_count,
+                    TEXT_WORD_WEIGHT * len(query_words & entry.text_words) / word_count,
+                )
+            if score >= min_score:
+                scored.append(NameMatch(node_id, entry.type, entry.name, score))
+        return heapq.nlargest(limit, scored, key=lambda m: (m.score, m.id))
+
+    def _set_node(self, node_id: str, node_type: str, properties: dict[str, Any]):
+        self._drop_node(node_id)
+        self._types[node_id] = node_type
+        self._fields[node_id] = {
+            key: properties[key]
+            for key in ("name", "description", "progetto_id")
+            if key in properties
+        }
+        name = properties.get("name")
+        if node_type not in self._node_types or not isinstance(name, str):
+            return
+        description = properties.get("description")
+        normalized = normalize_name(name)
+        entry = _Entry(
+            type=node_type,
+            progetto_id=properties.get("progetto_id"),
+            name=name,
+            grams=trigrams(normalized),
+            name_words=_words(normalized),
+            text_words=(
+                _words(normalize_name(description))
+                if isinstance(description, str)
+                else frozenset()
+            ),
+        )
+        self._entries[node_id] = entry
+        for postings, keys in (
+            (self._grams, entry.grams),
+            (self._name_words, entry.name_words),
+            (self._text_words, entry.text_words),
+        ):
+            for key in keys:
+                postings.setdefault(key, set()).add(node_id)
+
+    def _drop_node(self, node_id: str):
+        self._types.pop(node_id, None)
+        self._fields.pop(node_id, None)
+        entry = self._entries.pop(node_id, None)
+        if entry is None:
+            return
+        for postings, keys in (
+            (self._grams, entry.grams),
+            (self._name_words, entry.name_words),
+            (self._text_words, entry.text_words),
+        ):
+            for key in keys:
+                ids = postings[key]
+                ids.discard(node_id)
+                if not ids:
+                    del postings[key]
+
+
+# Global name index instance
+_name_index: NameIndex | None = None
+
+
+def get_name_index(store: InMemoryGraphStore | None = None) -> NameIndex:
+    """Get the global name index, kept in sync with the graph store."""
+    global _name_index  # noqa: PLW0603
+    if _name_index is None:
+        store = store or get_graph_store()
+        _name_index = NameIndex.from_nodes(store.nodes())
+        store.subscribe(_name_index.apply)
+    return _name_index
@@ -0,0 +1,121 @@
+"""Entity resolution against the current graph.
+
+Extracted entities are matched to existing nodes by id first and then by
+normalized name within their ``Progetto``, so that a follow-up prompt only
+produces the patches needed to bring the graph up to date.
+"""
+
+import unicodedata
+from collections.abc import Iterable
+from uuid import uuid4
+
+from models.graph import AddNode, ExtractedEntity, GraphPatch, Node, UpdateProps
+
+NameKey = tuple[str | None, str, str]
+
+
+def normalize_name(name: str) -> str:
+    """Return the canonical form of an entity name used for matching.
+
+    Accents are stripped, case is folded and whitespace is collapsed, so
+    "  Payment  Gateway " and "payment gateway" resolve to the same entity.
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def _name_key(node_type: str, name: str, progetto_id: str | None) -> NameKey:
+    """Build the lookup key for a name within a project."""
+    return (progetto_id, node_type, normalize_name(name))
+
+
+class EntityResolver:
+    """Resolves extracted entities against a snapshot of existing nodes."""
+
+    def __init__(self, nodes: Iterable[Node]):
+        """Index the given nodes by id and by normalized name.
+
+        Args:
+            nodes: The existing nodes entities may resolve to.
+
+        """
+        self._by_id: dict[str, Node] = {}
+        self._by_name: dict[NameKey, Node] = {}
+        for node in nodes:
+            self._index(node)
+
+    def match(self, entity: ExtractedEntity) -> Node | None:
+        """Return the existing node an entity refers to, if any."""
+        if entity.id is not None and entity.id in self._by_id:
+            return self._by_id[entity.id]
+        return self._by_name.get(
+            _name_key(entity.type, entity.name, entity.progetto_id)
+        )
+
+    def diff(self, entities: Iterable[ExtractedEntity]) -> list[GraphPatch]:
+        """Compute the patches needed to write the entities into the graph.
+
+        New entities become ``AddNode`` patches, entities whose properties
+        changed become ``UpdateProps`` patches carrying only those properties, and
+        unchanged entities produce nothing. Entities repeated within the same
+        batch resolve to the node created for their first occurrence.
+
+        Args:
+            entities: The validated entities extracted from a prompt.
+
+        Returns:
+            The delta as a list of patches, in input order.
+
+        """
+        patches: list[GraphPatch] = []
+        for entity in entities:
+            properties = entity.node_properties()
+            existing = self.match(entity)
+
+            if existing is None:
+                node = Node(
+                    id=entity.id or str(uuid4()),
+                    type=entity.type,
+                    properties=properties,
+                )
+                patches.append(
+                    AddNode.trusted(
+                        op="add_node",
+                        id=node.id,
+                        type=node.type,
+                        properties=node.properties,
+                    )
+                )
+                self._index(node)
+                continue
+
+            changed = {
+                key: value
+                for key, value in properties.items()
+                if existing.properties.get(key) != value
+            }
+            # A respelling of the name that resolves to the same node keeps
+            # the stored spelling.
+            if normalize_name(changed.get("name", "")) == normalize_name(
+                existing.properties.get("name", "")
+            ):
+                changed.pop("name", None)
+            if changed:
+                patches.append(UpdateProps.trusted(id=existing.id, properties=changed))
+                self._index(
+                    Node(
+                        id=existing.id,
+                        type=existing.type,
+                        properties={**existing.properties, **changed},
+                    )
+                )
+        return patches
+
+    def _index(self, node: Node):
+        """Add or refresh a node in the lookup tables."""
+        self._by_id[node.id] = node
+        name = node.properties.get("name")
+        if isinstance(name, str):
+            key = _name_key(node.type, name, node.properties.get("progetto_id"))
+            self._by_name[key] = node
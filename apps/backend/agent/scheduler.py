@@ -0,0 +1,228 @@
+"""Admission scheduler for agent graph execution.
+
+Agent runs are admitted under a global concurrency cap. When the cap is
+reached, callers wait in per-user queues that are served round-robin, and
+within a user, round-robin across projects, so a burst from one user or
+project cannot starve the others. Callers that are still queued when their
+deadline passes are shed instead of piling up behind the burst.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any, TypeVar
+
+from agent.llm import LatencyTracker
+from config.config import get_config
+from config.settings import Settings
+
+T = TypeVar("T")
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when an agent run is shed before it could be admitted."""
+
+    pass
+
+
+class _Waiter:
+    """A queued admission request."""
+
+    __slots__ = ("deadline", "enqueued_at", "future")
+
+    def __init__(self, future: asyncio.Future, deadline: float | None):
+        self.future = future
+        self.deadline = deadline
+        self.enqueued_at = time.monotonic()
+
+
+class AdmissionScheduler:
+    """Admits agent runs under a global cap with per-user/project fairness."""
+
+    def __init__(self, max_concurrent: int = 10, default_timeout: float | None = 30.0):
+        """Initialize the scheduler.
+
+        Args:
+            max_concurrent: Maximum number of agent runs executing at once
+            default_timeout: Seconds a run may wait for admission before it is
+                shed, or None to wait indefinitely
+
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self._max_concurrent = max_concurrent
+        self._default_timeout = default_timeout
+        self._queues: OrderedDict[str, OrderedDict[str | None, deque[_Waiter]]] = (
+            OrderedDict()
+        )
+        self._active = 0
+        self._queued = 0
+        self._admitted = 0
+        self._shed = 0
+        self._queue_times = LatencyTracker(window=1000)
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        user_id: str,
+        project_id: str | None = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator[None]:
+        """Hold an execution slot for the duration of the context.
+
+        Args:
+            user_id: The user the run belongs to
+            project_id: The project the run belongs to
+            timeout: Seconds to wait for admission, defaults to the scheduler's
+
+        Raises:
+            AdmissionRejectedError: If the deadline passed while queued
+
+        """
+        await self._acquire(user_id, project_id, timeout)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def run(
+        self,
+        user_id: str,
+        project_id: str | None,
+        func: Callable[[], Awaitable[T]],
+        timeout: float | None = None,
+    ) -> T:
+        """Run ``func`` once admitted and return its result."""
+        async with self.slot(user_id, project_id, timeout):
+            return await func()
+
+    def set_max_concurrent(self, max_concurrent: int):
+        """Change the concurrency cap, admitting waiters if it was raised.
+
+        Runs already admitted past a lowered cap finish normally.
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self._max_concurrent = max_concurrent
+        self._dispatch()
+
+    def apply_settings(self, settings: Settings):
+        """Take the cap and queue timeout from a configuration snapshot."""
+        self._default_timeout = settings.runtime.agent_queue_timeout
+        self.set_max_concurrent(settings.runtime.max_concurrent_agents)
+
+    def stats(self) -> dict[str, Any]:
+        """Return admission and queue-time metrics."""
+        return {
+            "max_concurrent": self._max_concurrent,
+            "active": self._active,
+            "queued": self._queued,
+            "admitted": self._admitted,
+            "shed": self._shed,
+            "queue_time_p50": self._queue_times.quantile(0.5, 0.0, min_samples=1),
+            "queue_time_p95": self._queue_times.quantile(0.95, 0.0, min_samples=1),
+        }
+
+    async def _acquire(
+        self, user_id: str, project_id: str | None, timeout: float | None
+    ):
+        """Wait until the caller is admitted or its deadline passes."""
+        if self._active < self._max_concurrent and not self._queued:
+            self._active += 1
+            self._admitted += 1
+            self._queue_times.record(0.0)
+            return
+
+        timeout = self._default_timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), deadline)
+        projects = self._queues.setdefault(user_id, OrderedDict())
+        projects.setdefault(project_id, deque()).append(waiter)
+        self._queued += 1
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except TimeoutError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted or shed at the same moment the deadline passed.
+                waiter.future.result()
+                return
+            waiter.future.cancel()
+            self._queued -= 1
+            self._shed += 1
+            raise AdmissionRejectedError(
+                f"Agent run for user {user_id} shed after waiting {timeout}s"
+            ) from None
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release()
+            else:
+                waiter.future.cancel()
+                self._queued -= 1
+            raise
+
+    def _release(self):
+        """Free a slot and admit the next waiters."""
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """Admit queued waiters round-robin while slots are free."""
+        now = time.monotonic()
+        while self._active < self._max_concurrent:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            if waiter.future.done():
+                continue
+            self._queued -= 1
+            if waiter.deadline is not None and waiter.deadline < now:
+                self._shed += 1
+                waiter.future.set_exception(
+                    AdmissionRejectedError("Agent run shed after its deadline")
+                )
+                continue
+            self._active += 1
+            self._admitted += 1
+            self._queue_times.record(now - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+    def _next_waiter(self) -> _Waiter | None:
+        """Pop the next waiter, rotating users and then their projects."""
+        while self._queues:
+            user_id, projects = next(iter(self._queues.items()))
+            project_id, waiters = next(iter(projects.items()))
+            waiter = waiters.popleft() if waiters else None
+
+            if waiters:
+                projects.move_to_end(project_id)
+            else:
+                del projects[project_id]
+            if projects:
+                self._queues.move_to_end(user_id)
+            else:
+                del self._queues[user_id]
+
+            if waiter is not None:
+                return waiter
+        return None
+
+
+# Global admission scheduler instance
+_admission_scheduler: AdmissionScheduler | None = None
+
+
+def get_admission_scheduler() -> AdmissionScheduler:
+    """Get the global admission scheduler instance."""
+    global _admission_scheduler  # noqa: PLW0603
+    if _admission_scheduler is None:
+        config = get_config()
+        runtime = config.settings.runtime
+        _admission_scheduler = AdmissionScheduler(
+            max_concurrent=runtime.max_concurrent_agents,
+            default_timeout=runtime.agent_queue_timeout,
+        )
+        config.on_reload(_admission_scheduler.apply_settings)
+    return _admission_scheduler
@@ -0,0 +1,443 @@
+"""In-process vector index for semantic retrieval over graph entities.
+
+Entity texts (name and description) are embedded into the rows of a NumPy
+matrix. A query is a matrix-vector product over the candidate rows followed
+by a partial sort. Once trained, an IVF layer clusters the rows with k-means
+and a query only scores the rows of the ``nprobe`` clusters closest to it;
+rows added later are assigned to their nearest centroid.
+
+The index is saved as ``.npy`` files and loaded with ``mmap_mode="c"``: the
+vectors are mapped instead of read, so startup does not depend on the index
+size, and updates stay private to the process until the next save.
+"""
+
+import json
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from config.config import get_config
+from graphstore.memory import InMemoryGraphStore, get_graph_store
+from models.graph import (
+    AddNode,
+    Delete,
+    GraphPatch,
+    Node,
+    Patch,
+    UpdateProps,
+    as_graph_patch,
+)
+
+from .embeddings import Embedder, HashingEmbedder
+
+# Node types whose texts are embedded.
+INDEXED_TYPES = frozenset({"Epic", "Issue"})
+
+# Properties embedded, in order, and kept to re-embed partial updates.
+TEXT_PROPERTIES = ("name", "description")
+
+logger = logging.getLogger(__name__)
+
+# Code of rows that hold no entity.
+_FREE = -1
+# Code of entities without a project.
+_NO_PROJECT = -2
+
+
+class VectorMatch(NamedTuple):
+    """An entity semantically close to a query."""
+
+    id: str
+    type: str
+    score: float
+
+
+class VectorIndex:
+    """NumPy-backed nearest-neighbour index with optional IVF partitioning."""
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        node_types: Iterable[str] = INDEXED_TYPES,
+        *,
+        nprobe: int = 4,
+    ):
+        """Initialize an empty index.
+
+        Args:
+            embedder: Embeds entity texts and queries
+            node_types: The node types to index
+            nprobe: Number of IVF clusters scored per query
+
+        """
+        self._embedder = embedder
+        self._node_types = frozenset(node_types)
+        self.nprobe = nprobe
+
+        dimension = embedder.dimension
+        self._vectors = np.zeros((0, dimension), dtype=np.float32)
+        self._type_codes = np.zeros(0, dtype=np.int32)
+        self._project_codes = np.zeros(0, dtype=np.int32)
+        self._assignment = np.zeros(0, dtype=np.int32)
+        self._centroids: np.ndarray | None = None
+        self._size = 0
+
+        self._ids: list[str | None] = []
+        self._rows: dict[str, int] = {}
+        self._free: list[int] = []
+        self._codes: dict[str, int] = {}
+        # Type and text properties per node, to re-embed partial updates.
+        self._node_types_by_id: dict[str, str] = {}
+        self._fields: dict[str, dict[str, Any]] = {}
+        # Graph store version the index was saved at, if it was loaded.
+        self.graph_version: int | None = None
+
+    @classmethod
+    def from_nodes(cls, nodes: Iterable[Node], embedder: Embedder) -> "VectorIndex":
+        """Build the index for an existing set of nodes."""
+        index = cls(embedder)
+        index.apply(
+            AddNode(id=n.id, type=n.type, properties=n.properties) for n in nodes
+        )
+        return index
+
+    def __len__(self) -> int:
+        """Return the number of indexed entities."""
+        return len(self._rows)
+
+    @property
+    def trained(self) -> bool:
+        """Return whether the IVF partitioning is in use."""
+        return self._centroids is not None
+
+    def apply(self, patches: Iterable[Patch | GraphPatch]):
+        """Update the index with an applied batch of patches.
+
+        The texts changed by the batch are embedded together.
+        """
+        dirty: dict[str, None] = {}
+        for patch in patches:
+            match as_graph_patch(patch):
+                case AddNode(id=node_id, type=node_type, properties=properties):
+                    self._set_fields(node_id, node_type, properties)
+                    dirty[node_id] = None
+                case UpdateProps(
+                    entity="node", id=node_id, properties=properties
+                ) if node_id in self._node_types_by_id and any(
+                    key in properties for key in (*TEXT_PROPERTIES, "progetto_id")
+                ):
+                    self._set_fields(
+                        node_id, self._node_types_by_id[node_id], properties
+                    )
+                    dirty[node_id] = None
+                case Delete(entity="node", id=node_id):
+                    self._node_types_by_id.pop(node_id, None)
+                    self._fields.pop(node_id, None)
+                    dirty[node_id] = None
+
+        embed: list[str] = []
+        for node_id in dirty:
+            text = self._text(node_id)
+            if text:
+                embed.append(node_id)
+            else:
+                self._remove_row(node_id)
+        if embed:
+            vectors = self._embedder.embed([self._text(i) for i in embed])
+            for node_id, vector in zip(embed, vectors, strict=True):
+                self._put_row(node_id, vector)
+
+    def search(
+        self,
+        query: str,
+        *,
+        k: int = 10,
+        node_type: str | None = None,
+        progetto_id: str | None = None,
+    ) -> list[VectorMatch]:
+        """Return the entities whose texts are closest to a query.
+
+        Args:
+            query: Free text to search for
+            k: Maximum number of matches
+            node_type: Only return entities of this type
+            progetto_id: Only return entities of this project
+
+        Returns:
+            list[VectorMatch]: The matches by decreasing cosine similarity
+
+        """
+        if k <= 0 or not self._rows:
+            return []
+        vector = self._embedder.embed([query])[0]
+        if not vector.any():
+            return []
+
+        size = self._size
+        mask = self._type_codes[:size] != _FREE
+        if node_type is not None:
+            mask &= self._type_codes[:size] == self._codes.get(node_type, _FREE)
+        if progetto_id is not None:
+            mask &= self._project_codes[:size] == self._codes.get(progetto_id, _FREE)
+        if self._centroids is not None:
+            probe = np.argsort(self._centroids @ vector)[-self.nprobe :]
+            mask &= np.isin(self._assignment[:size], probe)
+
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return []
+        scores = self._vectors[rows] @ vector
+        if len(rows) > k:
+            top = np.argpartition(scores, -k)[-k:]
+            rows, scores = rows[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        return [
+            VectorMatch(
+                self._ids[row], self._node_types_by_id[self._ids[row]], float(score)
+            )
+            for row, score in zip(rows[order], scores[order], strict=True)
+        ]
+
+    def train(self, nlist: int, iterations: int = 10, seed: int = 0):
+        """Partition the rows into ``nlist`` clusters with spherical k-means.
+
+        Args:
+            nlist: Number of IVF clusters
+            iterations: Number of k-means iterations
+            seed: Seed of the initial centroid sample
+
+        """
+        rows = np.flatnonzero(self._type_codes[: self._size] != _FREE)
+        if len(rows) < nlist:
+            raise ValueError(f"cannot train {nlist} clusters on {len(rows)} rows")
+        data = np.asarray(self._vectors[rows])
+        rng = np.random.default_rng(seed)
+        centroids = data[rng.choice(len(rows), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            for cluster in range(nlist):
+                members = data[labels == cluster]
+                if len(members):
+                    centroids[cluster] = members.sum(axis=0)
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            np.divide(centroids, norms, out=centroids, where=norms > 0)
+        self._centroids = centroids
+        self._assignment[: self._size] = np.argmax(
+            self._vectors[: self._size] @ centroids.T, axis=1
+        )
+
+    def save(self, directory: str | Path, *, graph_version: int | None = None):
+        """Write the index to a directory of ``.npy`` files and metadata.
+
+        Args:
+            directory: Where the index is written
+            graph_version: Version of the graph store the index reflects,
+                checked when the index is opened again
+
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        size = self._size
+        arrays = {
+            "vectors": self._vectors[:size],
+            "type_codes": self._type_codes[:size],
+            "project_codes": self._project_codes[:size],
+            "assignment": self._assignment[:size],
+        }
+        if self._centroids is not None:
+            arrays["centroids"] = self._centroids
+        for name, array in arrays.items():
+            tmp = directory / f"{name}.tmp.npy"
+            np.save(tmp, array)
+            tmp.replace(directory / f"{name}.npy")
+        if self._centroids is None:
+            (directory / "centroids.npy").unlink(missing_ok=True)
+
+        meta = {
+            "embedder": self._embedder.name,
+            "dimension": self._embedder.dimension,
+            "ids": self._ids[:size],
+            "codes": self._codes,
+            "types": self._node_types_by_id,
+            "fields": self._fields,
+            "graph_version": graph_version,
+        }
+        tmp = directory / "meta.tmp.json"
+        tmp.write_text(json.dumps(meta, separators=(",", ":")))
+        tmp.replace(directory / "meta.json")
+
+    @classmethod
+    def load(
+        cls, directory: str | Path, embedder: Embedder, *, nprobe: int = 4
+    ) -> "VectorIndex":
+        """Map a saved index into memory.
+
+        Raises:
+            ValueError: If the index was built with a different embedder
+
+        """
+        directory = Path(directory)
+        meta = json.loads((directory / "meta.json").read_text())
+        if (meta["embedder"], meta["dimension"]) != (
+            embedder.name,
+            embedder.dimension,
+        ):
+            raise ValueError(
+                f"index at {directory} was built with {meta['embedder']}, "
+                f"not {embedder.name}"
+            )
+        index = cls(embedder, nprobe=nprobe)
+        index._vectors = np.load(directory / "vectors.npy", mmap_mode="c")
+        index._type_codes = np.load(directory / "type_codes.npy", mmap_mode="c")
+        index._project_codes = np.load(directory / "project_codes.npy", mmap_mode="c")
+        index._assignment = np.load(directory / "assignment.npy", mmap_mode="c")
+        centroids = directory / "centroids.npy"
+        if centroids.exists():
+            index._centroids = np.load(centroids)
+        index._size = len(index._vectors)
+        index._ids = meta["ids"]
+        index._codes = meta["codes"]
+        index._node_types_by_id = meta["types"]
+        index._fields = meta["fields"]
+        index.graph_version = meta.get("graph_version")
+        for row, node_id in enumerate(index._ids):
+            if node_id is None:
+                index._free.append(row)
+            else:
+                index._rows[node_id] = row
+        return index
+
+    def _set_fields(self, node_id: str, node_type: str, properties: dict[str, Any]):
+        self._node_types_by_id[node_id] = node_type
+        fields = self._fields.setdefault(node_id, {})
+        for key in (*TEXT_PROPERTIES, "progetto_id"):
+            if key in properties:
+                fields[key] = properties[key]
+
+    def _text(self, node_id: str) -> str:
+        if self._node_types_by_id.get(node_id) not in self._node_types:
+            return ""
+        fields = self._fields[node_id]
+        return " ".join(
+            fields[key] for key in TEXT_PROPERTIES if isinstance(fields.get(key), str)
+        )
+
+    def _code(self, value: str) -> int:
+        return self._codes.setdefault(value, len(self._codes))
+
+    def _put_row(self, node_id: str, vector: np.ndarray):
+        row = self._rows.get(node_id)
+        if row is None:
+            row = self._free.pop() if self._free else self._append_row()
+            self._rows[node_id] = row
+            self._ids[row] = node_id
+        progetto_id = self._fields[node_id].get("progetto_id")
+        self._vectors[row] = vector
+        self._type_codes[row] = self._code(self._node_types_by_id[node_id])
+        self._project_codes[row] = (
+            _NO_PROJECT if progetto_id is None else self._code(progetto_id)
+        )
+        self._assignment[row] = (
+            int(np.argmax(self._centroids @ vector))
+            if self._centroids is not None
+            else 0
+        )
+
+    def _append_row(self) -> int:
+        if self._size == len(self._vectors):
+            capacity = max(2 * self._size, 64)
+            self._vectors = _grow(self._vectors, capacity)
+            self._type_codes = _grow(self._type_codes, capacity)
+            self._project_codes = _grow(self._project_codes, capacity)
+            self._assignment = _grow(self._assignment, capacity)
+        self._ids.append(None)
+        self._size += 1
+        return self._size - 1
+
+    def _remove_row(self, node_id: str):
+        row = self._rows.pop(node_id, None)
+        if row is None:
+            return
+        self._ids[row] = None
+        self._vectors[row] = 0
+        self._type_codes[row] = _FREE
+        self._free.append(row)
+
+
+def _grow(array: np.ndarray, capacity: int) -> np.ndarray:
+    """Copy an array into a larger one, zero-filled past its current rows."""
+    grown = np.zeros((capacity, *array.shape[1:]), dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+def open_vector_index(
+    directory: str | Path,
+    store: InMemoryGraphStore,
+    embedder: Embedder,
+    *,
+    nlist: int = 0,
+) -> VectorIndex:
+    """Map the index saved for the store's current version, or rebuild it.
+
+    A saved index is only used when it was built with the same embedder and
+    saved at the store's current version; otherwise it is stale and the
+    index is built from the store and, once it holds enough rows,
+    partitioned into ``nlist`` clusters.
+
+    Args:
+        directory: Where the index was saved
+        store: The graph store the index must reflect
+        embedder: Embeds entity texts and queries
+        nlist: Number of IVF clusters of a rebuilt index, 0 for none
+
+    Returns:
+        VectorIndex: An index in sync with the store
+
+    """
+    directory = Path(directory)
+    if (directory / "meta.json").exists():
+        try:
+            index = VectorIndex.load(directory, embedder)
+        except ValueError as e:
+            logger.warning("Rebuilding the vector index: %s", e)
+        else:
+            if index.graph_version == store.version:
+                return index
+            logger.warning(
+                "Rebuilding the vector index: saved at graph version %s, "
+                "the store is at %s",
+                index.graph_version,
+                store.version,
+            )
+    index = VectorIndex.from_nodes(store.nodes(), embedder)
+    if nlist and len(index) >= 32 * nlist:
+        index.train(nlist)
+    return index
+
+
+# Global vector index instance
+_vector_index: VectorIndex | None = None
+
+
+def get_vector_index(store: InMemoryGraphStore | None = None) -> VectorIndex:
+    """Get the global vector index, kept in sync with the graph store.
+
+    The index saved at ``system.vector_index_path`` is reused when it matches
+    the store, see ``open_vector_index``.
+    """
+    global _vector_index  # noqa: PLW0603
+    if _vector_index is None:
+        store = store or get_graph_store()
+        settings = get_config().settings
+        _vector_index = open_vector_index(
+            settings.system.vector_index_path,
+            store,
+            HashingEmbedder(settings.runtime.embedding_dimension),
+            nlist=settings.runtime.vector_ivf_lists,
+        )
+        store.subscribe(_vector_index.apply)
+    return _vector_index
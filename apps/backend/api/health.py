@@ -0,0 +1,174 @@
+"""Background health probes for the liveness and readiness endpoints.
+
+``HealthMonitor`` runs its probes every ``runtime.health_check_interval``
+seconds and keeps the last results, already encoded as JSON. Health
+endpoints only read that cache, so orchestrators polling them at any rate
+never cause a round trip to the graph store or an LLM provider.
+
+A probe returns a dict with a ``status`` of ``healthy``, ``degraded`` or
+``unhealthy`` plus any details; a probe that raises or exceeds
+``runtime.health_check_timeout`` counts as unhealthy. The application is
+ready once every critical probe has passed at least once and none of them
+is unhealthy.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import UTC, datetime
+from typing import Any
+
+import orjson
+
+HEALTHY = "healthy"
+DEGRADED = "degraded"
+UNHEALTHY = "unhealthy"
+UNKNOWN = "unknown"
+
+Probe = Callable[[], Awaitable[dict[str, Any]]]
+
+
+class HealthMonitor:
+    """Runs health probes on an interval and caches their results."""
+
+    def __init__(
+        self,
+        probes: dict[str, Probe],
+        *,
+        critical: Iterable[str] = (),
+        interval: float = 15.0,
+        timeout: float = 5.0,
+    ):
+        """Initialize the monitor.
+
+        Args:
+            probes: Probes by name
+            critical: Names of the probes readiness depends on
+            interval: Seconds between two probe passes
+            timeout: Seconds a probe may take before it counts as unhealthy
+
+        """
+        self._probes = probes
+        self._critical = frozenset(critical)
+        self._interval = interval
+        self._timeout = timeout
+        self._task: asyncio.Task | None = None
+        self._logger = logging.getLogger(__name__)
+        self._publish({name: {"status": UNKNOWN} for name in probes}, passed=False)
+
+    def _publish(self, checks: dict[str, dict[str, Any]], *, passed: bool):
+        """Swap in the results of a probe pass and encode them."""
+        critical = [checks[name]["status"] for name in self._critical]
+        statuses = [check["status"] for check in checks.values()]
+        if UNHEALTHY in critical:
+            status = UNHEALTHY
+        elif UNHEALTHY in statuses or DEGRADED in statuses:
+            status = DEGRADED
+        else:
+            status = HEALTHY
+        self.ready = passed and UNKNOWN not in critical and UNHEALTHY not in critical
+        self.status = status
+        self.checks = checks
+        self.report_json = orjson.dumps(
+            {"status": status, "ready": self.ready, "checks": checks}
+        )
+
+    async def _run_probe(self, probe: Probe) -> dict[str, Any]:
+        """Run one probe, turning errors and timeouts into unhealthy results."""
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(probe(), self._timeout)
+        except TimeoutError:
+            result = {"status": UNHEALTHY, "error": f"timed out after {self._timeout}s"}
+        except Exception as e:
+            result = {"status": UNHEALTHY, "error": f"{type(e).__name__}: {e}"}
+        result["duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        result["checked_at"] = datetime.now(UTC).isoformat()
+        return result
+
+    async def check(self):
+        """Run every probe concurrently and publish the results."""
+        names = list(self._probes)
+        results = await asyncio.gather(
+            *(self._run_probe(self._probes[name]) for name in names)
+        )
+        self._publish(dict(zip(names, results, strict=True)), passed=True)
+
+    async def _loop(self):
+        """Probe until cancelled."""
+        while True:
+            try:
+                await self.check()
+            except Exception as e:
+                self._logger.error("Error in health check loop: %s", e)
+            await asyncio.sleep(self._interval)
+
+    def start(self):
+        """Start probing in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        """Stop probing."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+async def probe_graph_store() -> dict[str, Any]:
+    """Report the graph store's own health check, run off the event loop."""
+    from graphstore.memory import get_graph_store  # noqa: PLC0415
+
+    health = await asyncio.to_thread(get_graph_store().health)
+    return {"status": health.get("status", UNHEALTHY), **health}
+
+
+async def probe_sessions() -> dict[str, Any]:
+    """Report session capacity; degraded once the live sessions are at the cap."""
+    from api.session_manager import get_session_manager  # noqa: PLC0415
+
+    manager = get_session_manager()
+    live, limit = manager.session_count, manager.max_sessions
+    if not manager.is_running:
+        status = UNHEALTHY
+    elif live >= limit:
+        status = DEGRADED
+    else:
+        status = HEALTHY
+    return {
+        "status": status,
+        "sessions": live,
+        "max_sessions": limit,
+        "utilization": round(live / limit, 4),
+    }
+
+
+async def probe_llm() -> dict[str, Any]:
+    """Report which LLM providers are reachable; degraded unless all are."""
+    from agent.llm import get_llm_dispatcher  # noqa: PLC0415
+
+    errors = await get_llm_dispatcher().ping()
+    reachable = [name for name, error in errors.items() if error is None]
+    if len(reachable) == len(errors):
+        status = HEALTHY
+    elif reachable:
+        status = DEGRADED
+    else:
+        status = UNHEALTHY
+    return {
+        "status": status,
+        "providers": {
+            name: error or "reachable" for name, error in sorted(errors.items())
+        },
+    }
+
+
+def probe_event(event: asyncio.Event) -> Probe:
+    """Return a probe that is healthy once ``event`` is set."""
+
+    async def probe() -> dict[str, Any]:
+        return {"status": HEALTHY if event.is_set() else UNHEALTHY}
+
+    return probe
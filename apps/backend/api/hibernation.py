@@ -0,0 +1,69 @@
+"""On-disk storage for hibernated sessions.
+
+A session idle for longer than ``runtime.session_hibernate_after`` seconds
+is torn down by the session manager: its runtime loop and agents stop and
+its state, including queued messages, is written here as zlib-compressed
+JSON. The next ``get_session`` reads the file back and runs the session
+again, so the number of logical sessions is bounded by disk rather than by
+``max_sessions``.
+"""
+
+import json
+import zlib
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+
+class SessionHibernator:
+    """Hibernated session states, one compressed file per session."""
+
+    def __init__(self, directory: str | Path):
+        """Initialize the store; its directory is created on first write.
+
+        Args:
+            directory: Where hibernated sessions are written
+
+        """
+        self.directory = Path(directory)
+
+    def _path(self, session_id: UUID) -> Path:
+        return self.directory / f"{session_id}.json.z"
+
+    def __contains__(self, session_id: UUID) -> bool:
+        """Return whether a session is hibernated."""
+        return self._path(session_id).exists()
+
+    def __len__(self) -> int:
+        """Return the number of hibernated sessions."""
+        return sum(1 for _ in self.directory.glob("*.json.z"))
+
+    def ids(self) -> list[UUID]:
+        """Return the ids of the hibernated sessions."""
+        return [
+            UUID(path.name.split(".")[0]) for path in self.directory.glob("*.json.z")
+        ]
+
+    def save(self, state: dict[str, Any]):
+        """Write the state of a session, replacing any earlier one."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(UUID(state["session_id"]))
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(
+            zlib.compress(json.dumps(state, separators=(",", ":")).encode())
+        )
+        tmp.replace(path)
+
+    def pop(self, session_id: UUID) -> dict[str, Any] | None:
+        """Read and remove the state of a session, or return None if absent."""
+        path = self._path(session_id)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        path.unlink()
+        return json.loads(zlib.decompress(data))
+
+    def discard(self, session_id: UUID):
+        """Remove the state of a session if present."""
+        self._path(session_id).unlink(missing_ok=True)
@@ -0,0 +1,299 @@
+"""Prometheus metrics for the API.
+
+Metrics are recorded into plain dicts and lists without locks: requests are
+observed from the event loop thread, where updates cannot interleave, so
+the hot path costs a bisect and a few integer increments. Gauges backed by
+a callback are only evaluated when ``/metrics`` is scraped.
+
+``render`` writes the registry in the Prometheus text exposition format
+(version 0.0.4).
+"""
+
+import bisect
+import math
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+EXPOSITION_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Request latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric(ABC):
+    """Base class of metrics with a name, help text and label names."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()):
+        """Initialize the metric."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    @abstractmethod
+    def samples(self) -> Iterable[tuple[str, str, float]]:
+        """Yield ``(suffix, labels, value)`` samples of the metric."""
+        pass
+
+    def render(self) -> str:
+        """Return the metric in the text exposition format."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(
+            f"{self.name}{suffix}{labels} {_format_value(value)}"
+            for suffix, labels, value in self.samples()
+        )
+        return "\n".join(lines)
+
+
+class Gauge(Metric):
+    """A value that goes up and down, set directly or read from a callback."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        callback: Callable[[], float | dict[Labels, float] | None] | None = None,
+    ):
+        """Initialize the gauge.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Label names
+            callback: Called on every scrape; returns the value, values by
+                label set, or None to emit no sample
+
+        """
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[Labels, float] = {}
+        self._callback = callback
+
+    def set(self, value: float, labels: Labels = ()):
+        """Set the value of a label set."""
+        self._values[labels] = value
+
+    def inc(self, labels: Labels = (), amount: float = 1.0):
+        """Increase the value of a label set."""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, labels: Labels = (), amount: float = 1.0):
+        """Decrease the value of a label set."""
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def samples(self) -> Iterable[tuple[str, str, float]]:
+        """Yield the current value of every label set."""
+        values = self._values
+        if self._callback is not None:
+            result = self._callback()
+            if result is None:
+                values = {}
+            elif isinstance(result, dict):
+                values = result
+            else:
+                values = {(): result}
+        for labels, value in sorted(values.items()):
+            yield "", _format_labels(self.labelnames, labels), value
+
+
+class Histogram(Metric):
+    """Observations counted into cumulative buckets per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        """Initialize the histogram with ascending finite bucket bounds."""
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+        # Per label set: counts per bucket (plus +Inf), then the sum
+        self._series: dict[Labels, list[float]] = {}
+
+    def observe(self, value: float, labels: Labels = ()):
+        """Record an observation."""
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, labels: Labels = ()) -> int:
+        """Return the number of observations of a label set."""
+        series = self._series.get(labels)
+        return int(sum(series[:-1])) if series else 0
+
+    def samples(self) -> Iterable[tuple[str, str, float]]:
+        """Yield cumulative buckets, the sum and the count per label set."""
+        bounds = [*map(_format_value, self.buckets), "+Inf"]
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, series[:-1], strict=True):
+                cumulative += count
+                yield "_bucket", _format_labels(
+                    (*self.labelnames, "le"), (*labels, bound)
+                ), cumulative
+            plain = _format_labels(self.labelnames, labels)
+            yield "_sum", plain, series[-1]
+            yield "_count", plain, cumulative
+
+
+class MetricsRegistry:
+    """The metrics exposed by the application."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Any:
+        """Add a metric, replacing one of the same name, and return it."""
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Metric | None:
+        """Return a registered metric by name."""
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Return all metrics in the text exposition format."""
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+class MetricsMiddleware:
+    """Records request latency, status codes and in-flight requests.
+
+    Requests are labelled with the route template (``/sessions/{session_id}``)
+    rather than the raw path, so label cardinality stays bounded; requests
+    that match no route are labelled ``unmatched``.
+    """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry):
+        """Initialize the middleware and register its metrics."""
+        self.app = app
+        self.latency = registry.register(
+            Histogram(
+                "http_request_duration_seconds",
+                "Request latency by route.",
+                ("method", "route", "status"),
+            )
+        )
+        self.in_flight = registry.register(
+            Gauge("http_requests_in_flight", "Requests being served.")
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Time the request and record its outcome."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        self.in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            self.latency.observe(
+                time.perf_counter() - start,
+                (
+                    scope["method"],
+                    getattr(route, "path", "unmatched"),
+                    status,
+                ),
+            )
+            self.in_flight.dec()
+
+
+def register_runtime_gauges(registry: MetricsRegistry):
+    """Register gauges reading the session manager and admission scheduler."""
+    # Imported here so the metric types stay importable without the runtime
+    from agent.scheduler import get_admission_scheduler  # noqa: PLC0415
+    from api.session_manager import get_session_manager  # noqa: PLC0415
+
+    registry.register(
+        Gauge(
+            "sessions_live",
+            "Sessions running in this worker.",
+            callback=lambda: get_session_manager().session_count,
+        )
+    )
+    registry.register(
+        Gauge(
+            "session_queue_depth",
+            "Messages queued in live sessions.",
+            ("direction",),
+            callback=lambda: {
+                (direction,): depth
+                for direction, depth in get_session_manager().queue_depths().items()
+            },
+        )
+    )
+    registry.register(
+        Gauge(
+            "session_cleanup_duration_seconds",
+            "Duration of the last session cleanup pass.",
+            callback=lambda: get_session_manager().last_cleanup_seconds,
+        )
+    )
+    registry.register(
+        Gauge(
+            "agent_admission_runs",
+            "Agent runs admitted and waiting for admission.",
+            ("state",),
+            callback=lambda: {
+                ("active",): get_admission_scheduler().stats()["active"],
+                ("queued",): get_admission_scheduler().stats()["queued"],
+            },
+        )
+    )
+
+
+# Global metrics registry instance
+_metrics_registry: MetricsRegistry | None = None
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the global metrics registry."""
+    global _metrics_registry  # noqa: PLW0603
+    if _metrics_registry is None:
+        _metrics_registry = MetricsRegistry()
+    return _metrics_registry
@@ -0,0 +1,273 @@
+"""Token-bucket rate limiting for API routes.
+
+A bucket per key holds up to ``burst`` tokens and refills at ``rate``
+tokens per second; a request spends one token or is rejected with the time
+until one is available. Buckets live in a pluggable store:
+
+- ``MemoryBucketStore`` keeps them in-process in an LRU of bounded size. An
+  evicted bucket is simply recreated full, which only ever errs towards
+  letting a request through.
+- ``SQLiteBucketStore`` keeps them in a SQLite file, so every uvicorn worker
+  on the host enforces the same limits. Buckets that have refilled are
+  pruned periodically, so the table stays bounded too. Its transactions may
+  wait on other workers' locks, so the limiter runs them in a thread.
+
+``RateLimitMiddleware`` applies per-client limits to route prefixes, and
+routes call ``RateLimiter.check`` directly for limits keyed on request
+content, such as session creation per user and project.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import NamedTuple
+
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from config.settings import RateLimitSettings, Settings
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A sustained rate with an allowed burst."""
+
+    rate: float
+    burst: int
+
+    def __post_init__(self):
+        """Validate the limit."""
+        if self.rate <= 0 or self.burst < 1:
+            raise ValueError(f"invalid rate limit {self.rate}/s burst {self.burst}")
+
+    @classmethod
+    def from_settings(cls, limit: RateLimitSettings) -> "RateLimit":
+        """Build a limit from a configured ``{"rate": ..., "burst": ...}`` entry."""
+        return cls(rate=limit.rate, burst=limit.burst)
+
+
+class Decision(NamedTuple):
+    """The outcome of taking a token from a bucket."""
+
+    allowed: bool
+    remaining: int
+    retry_after: float
+
+
+def _take(
+    tokens: float, updated: float, limit: RateLimit, now: float
+) -> tuple[float, Decision]:
+    """Refill a bucket up to ``now`` and try to spend one token."""
+    tokens = min(limit.burst, tokens + (now - updated) * limit.rate)
+    if tokens >= 1:
+        tokens -= 1
+        return tokens, Decision(True, int(tokens), 0.0)
+    return tokens, Decision(False, 0, (1 - tokens) / limit.rate)
+
+
+class BucketStore(ABC):
+    """Abstract interface for token bucket storage."""
+
+    # Whether ``take`` may block, and so must not run on the event loop
+    blocking = False
+
+    @abstractmethod
+    def take(self, key: str, limit: RateLimit, now: float) -> Decision:
+        """Atomically refill the bucket of ``key`` and spend a token."""
+        pass
+
+    def close(self):  # noqa: B027
+        """Release the resources held by the store."""
+
+
+class MemoryBucketStore(BucketStore):
+    """Per-process buckets in an LRU of at most ``max_keys`` entries."""
+
+    def __init__(self, max_keys: int = 10_000):
+        """Initialize an empty store.
+
+        Args:
+            max_keys: Number of buckets kept before the least recently used
+                one is dropped
+
+        """
+        self._max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of buckets held."""
+        return len(self._buckets)
+
+    def take(self, key: str, limit: RateLimit, now: float) -> Decision:
+        """Atomically refill the bucket of ``key`` and spend a token."""
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (limit.burst, now))
+            tokens, decision = _take(tokens, updated, limit, now)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+        return decision
+
+
+class SQLiteBucketStore(BucketStore):
+    """Buckets shared between processes through a SQLite file."""
+
+    blocking = True
+
+    def __init__(self, path: str | Path, prune_every: int = 1000):
+        """Open or create the bucket database.
+
+        Args:
+            path: The database file
+            prune_every: Number of takes between sweeps of refilled buckets
+
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, "
+            "full_at REAL NOT NULL)"
+        )
+        self._prune_every = prune_every
+        self._takes = 0
+        self._lock = threading.Lock()
+
+    def take(self, key: str, limit: RateLimit, now: float) -> Decision:
+        """Atomically refill the bucket of ``key`` and spend a token."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT tokens, updated FROM buckets WHERE key = ?", (key,)
+                ).fetchone()
+                tokens, updated = row if row else (limit.burst, now)
+                tokens, decision = _take(tokens, updated, limit, now)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?)",
+                    (key, tokens, now, now + (limit.burst - tokens) / limit.rate),
+                )
+                self._takes += 1
+                if self._takes % self._prune_every == 0:
+                    self._conn.execute("DELETE FROM buckets WHERE full_at <= ?", (now,))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return decision
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+
+class RateLimiter:
+    """Checks requests against token buckets held in a store."""
+
+    def __init__(self, store: BucketStore | None = None):
+        """Initialize the limiter.
+
+        Args:
+            store: Where buckets are kept, in memory by default
+
+        """
+        self.store = store or MemoryBucketStore()
+
+    async def take(self, key: str, limit: RateLimit) -> Decision:
+        """Spend a token from the bucket of ``key``."""
+        if self.store.blocking:
+            return await asyncio.to_thread(self.store.take, key, limit, time.time())
+        return self.store.take(key, limit, time.time())
+
+    async def check(
+        self, key: str, limit: RateLimit, detail: str = "Rate limit exceeded."
+    ):
+        """Spend a token from the bucket of ``key`` or reject the request.
+
+        Raises:
+            HTTPException: 429 with a ``Retry-After`` header if the bucket is
+                empty
+
+        """
+        decision = await self.take(key, limit)
+        if not decision.allowed:
+            raise HTTPException(
+                status_code=429,
+                detail=detail,
+                headers={"Retry-After": _retry_after(decision)},
+            )
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "RateLimiter":
+        """Build a limiter from a configuration snapshot.
+
+        ``runtime.rate_limit_backend`` selects "memory" (the default) or
+        "sqlite", which stores buckets at ``system.rate_limit_path``.
+        """
+        if settings.runtime.rate_limit_backend == "sqlite":
+            return cls(SQLiteBucketStore(settings.system.rate_limit_path))
+        return cls(MemoryBucketStore(settings.runtime.rate_limit_max_keys))
+
+
+def _retry_after(decision: Decision) -> str:
+    """Format the wait of a rejected request as whole seconds."""
+    return str(max(1, int(decision.retry_after + 0.999)))
+
+
+class RateLimitMiddleware:
+    """Limits requests per client on route prefixes.
+
+    Each request is charged to the longest configured prefix of its path,
+    in a bucket per client address and prefix. Prefixes match whole path
+    segments: "/graph" covers "/graph" and "/graph/export" but not "/graphs".
+    """
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter, rules: dict[str, RateLimit]):
+        """Initialize the middleware.
+
+        Args:
+            app: The application to wrap
+            limiter: The limiter holding the buckets
+            rules: Limits by path prefix
+
+        """
+        self.app = app
+        self.limiter = limiter
+        self.rules = sorted(
+            (
+                (prefix, prefix.rstrip("/") + "/", limit)
+                for prefix, limit in rules.items()
+            ),
+            key=lambda rule: -len(rule[0]),
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Reject the request with 429 if its bucket is empty."""
+        if scope["type"] == "http":
+            path = scope["path"]
+            for prefix, subtree, limit in self.rules:
+                if path == prefix or path.startswith(subtree):
+                    client = scope.get("client")
+                    host = client[0] if client else "unknown"
+                    decision = await self.limiter.take(f"{prefix}|{host}", limit)
+                    if not decision.allowed:
+                        response = JSONResponse(
+                            {"detail": "Rate limit exceeded."},
+                            status_code=429,
+                            headers={"Retry-After": _retry_after(decision)},
+                        )
+                        await response(scope, receive, send)
+                        return
+                    break
+        await self.app(scope, receive, send)
@@ -0,0 +1,39 @@
+"""Fast JSON responses for the API.
+
+``FastJSONResponse`` renders with orjson, which natively encodes datetimes,
+UUIDs, enums, dataclasses and NumPy arrays, and encodes Pydantic models
+with ``model_dump_json``. Routes can return it directly with models nested
+in plain containers, skipping FastAPI's ``jsonable_encoder`` pass.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    """Encode the values orjson does not know natively."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, set | frozenset):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Bytes are sent as is, so routes can pass JSON they encoded themselves.
+    """
+
+    def render(self, content: Any) -> bytes:
+        """Encode the content as JSON."""
+        if isinstance(content, bytes):
+            return content
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode()
+        return orjson.dumps(content, default=_default, option=_OPTIONS)
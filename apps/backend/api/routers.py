@@ -4,19 +4,37 @@ This module contains all API router definitions that will be used
 to organize endpoints by functionality.
 """
 
+import asyncio
 import logging
-import time
+from collections.abc import Iterator
+from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
+from agent.name_index import get_name_index
+from api.health import HealthMonitor
+from api.metrics import EXPOSITION_CONTENT_TYPE, get_metrics_registry
+from api.rate_limit import RateLimit, RateLimiter
+from api.responses import FastJSONResponse
 from api.session_manager import (
     SessionManager,
     SessionNotFoundError,
     get_session_manager,
 )
+from api.user_session import state_is_active, state_is_expired, state_response_json
+from config.config import get_settings
+from config.settings import Settings
+from graphstore.columnar import ColumnarGraph
+from graphstore.kpis import get_kpi_materializer
+from graphstore.memory import get_graph_store
+from graphstore.rollback import RollbackUnavailableError, get_rollback_manager
 from models.session import (
+    AgentActRequest,
+    AgentActResponse,
     MessageRequest,
     MessageResponse,
     SessionCreateRequest,
@@ -25,49 +43,114 @@ from models.session import (
     SessionStats,
 )
 
+# Largest number of matches a graph search may ask for
+MAX_SEARCH_RESULTS = 100
+
 # Create router instances for different functional areas
 health_router = APIRouter(prefix="/health", tags=["health"])
 agent_router = APIRouter(prefix="/agent", tags=["agent"])
 graph_router = APIRouter(prefix="/graph", tags=["graph"])
 todo_router = APIRouter(prefix="/todo", tags=["todo"])
+metrics_router = APIRouter(tags=["metrics"])
 session_router = APIRouter(
     prefix="/sessions", tags=["sessions"], redirect_slashes=False
 )
 
-# Simple rate limiting for session creation
-_session_creation_times = {}
+
+def get_health_monitor_dependency(http_request: Request) -> HealthMonitor:
+    """Dependency to get the health monitor of the application."""
+    return http_request.app.state.health_monitor
+
+
+def get_session_manager_dependency() -> SessionManager:
+    """Dependency to get the session manager instance."""
+    return get_session_manager()
 
 
 @health_router.get("/")
-async def health_status():
+async def health_status(
+    monitor: HealthMonitor = Depends(get_health_monitor_dependency),
+):
     """Detailed health status endpoint.
 
+    Served from the results of the last background probe pass.
+
     Returns:
         dict: Detailed health information
 
     """
+    checks = monitor.checks
     return {
-        "status": "healthy",
+        "status": monitor.status,
         "service": "business-improvement-api",
         "version": "0.1.0",
         "components": {
             "api": "operational",
-            "database": "not_configured",  # Will be updated when graph stores are implemented
-            "agent": "not_configured",  # Will be updated when LangGraph is implemented
+            "database": checks["graph_store"]["status"],
+            "agent": checks["agent"]["status"],
+            "sessions": checks["sessions"]["status"],
+            "llm": checks["llm"]["status"],
         },
     }
 
 
-@agent_router.post("/act")
-async def agent_action():
-    """Act on an agent.
+@health_router.get("/live")
+async def liveness():
+    """Liveness probe: the process is up and its event loop responsive."""
+    return FastJSONResponse(b'{"status":"alive"}')
+
+
+@health_router.get("/ready")
+async def readiness(
+    monitor: HealthMonitor = Depends(get_health_monitor_dependency),
+):
+    """Readiness probe with the cached results of every check.
+
+    Returns 503 until the critical checks have passed, and whenever one of
+    them is unhealthy.
+    """
+    return FastJSONResponse(
+        monitor.report_json, status_code=200 if monitor.ready else 503
+    )
+
+
+@agent_router.post("/act", response_model=AgentActResponse)
+async def agent_action(
+    request: AgentActRequest,
+    session_manager: SessionManager = Depends(get_session_manager_dependency),
+):
+    """Run the agent on a prompt in the context of a session.
+
+    The run goes through the admission scheduler under the session's user and
+    project, so concurrent runs are capped and shared fairly between users.
+
+    Raises:
+        HTTPException: 404 if the session is unknown, 503 if the run was shed
+            while waiting for admission
 
-    This will be implemented in Phase 1 for the Extract→Validate→Upsert→Answer flow.
     """
-    return {
-        "message": "Agent action endpoint - to be implemented in Phase 1",
-        "status": "placeholder",
-    }
+    from agent.graph import run_agent  # noqa: PLC0415
+    from agent.scheduler import AdmissionRejectedError  # noqa: PLC0415
+
+    try:
+        session = await session_manager.get_session(request.session_id)
+    except SessionNotFoundError as e:
+        raise HTTPException(status_code=404, detail="Session not found") from e
+
+    project_id = str(session.project_id) if session.project_id else None
+    try:
+        state = await run_agent(request.input, session.user_id, project_id)
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "1"}
+        ) from e
+
+    results = state["upsert_results"]
+    return AgentActResponse(
+        response=state["response"],
+        applied=results["applied"],
+        errors=results["errors"],
+    )
 
 
 @graph_router.post("/patch")
@@ -94,6 +177,149 @@ async def graph_query():
     }
 
 
+@graph_router.get("/export")
+async def export_graph(project_id: str | None = None):
+    """Stream the nodes and edges of a project as JSON lines.
+
+    The slice is copied into columnar form at one graph version, and each
+    line is materialized as it is sent.
+
+    Args:
+        project_id: The project to export, or every node if omitted
+
+    Returns:
+        StreamingResponse: One ``{"node": ...}`` or ``{"edge": ...}`` object
+            per line, with the graph version in ``X-Graph-Version``
+
+    """
+    graph, version = await asyncio.to_thread(
+        ColumnarGraph.from_store, get_graph_store(), project_id
+    )
+
+    def lines() -> Iterator[bytes]:
+        for node in graph.nodes():
+            yield orjson.dumps({"node": node.model_dump(mode="json")}) + b"\n"
+        for edge in graph.edges():
+            yield orjson.dumps({"edge": edge.model_dump(mode="json")}) + b"\n"
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"X-Graph-Version": str(version)},
+    )
+
+
+@graph_router.get("/kpis")
+async def graph_kpis(project_id: str, epic_id: str | None = None):
+    """Get the materialized KPIs of a project, or of one of its epics.
+
+    Args:
+        project_id: The project to report on
+        epic_id: Optional epic to narrow the report to
+
+    Returns:
+        dict: Work item totals, counts by status and priority, progress and
+        overdue count
+
+    """
+    kpis = get_kpi_materializer()
+    if epic_id is not None:
+        return kpis.epic(epic_id)
+    return kpis.project(project_id)
+
+
+@graph_router.post("/kpis/rebuild")
+async def rebuild_graph_kpis():
+    """Recompute the KPI aggregates from the graph store.
+
+    Returns:
+        dict: Whether the incremental aggregates matched the rebuilt ones
+
+    """
+    kpis = get_kpi_materializer()
+    nodes = get_graph_store().nodes()
+    consistent = kpis.verify(nodes)
+    if not consistent:
+        logging.getLogger(__name__).warning("KPI aggregates drifted; rebuilding")
+        kpis.rebuild(nodes)
+    return {"consistent": consistent, "projects": len(kpis.projects())}
+
+
+@graph_router.get("/search")
+async def search_entities(
+    q: str,
+    node_type: str | None = None,
+    project_id: str | None = None,
+    limit: int = Query(10, ge=1, le=MAX_SEARCH_RESULTS),
+):
+    """Find entities by approximate name or description words.
+
+    Args:
+        q: The text to look up
+        node_type: Only return entities of this type
+        project_id: Only return entities of this project
+        limit: Maximum number of matches
+
+    Returns:
+        dict: The matches, best first
+
+    """
+    matches = get_name_index().search(
+        q, node_type=node_type, progetto_id=project_id, limit=limit
+    )
+    return {"matches": [match._asdict() for match in matches]}
+
+
+@graph_router.get("/similar")
+async def similar_entities(
+    q: str,
+    node_type: str | None = None,
+    project_id: str | None = None,
+    limit: int = Query(10, ge=1, le=MAX_SEARCH_RESULTS),
+):
+    """Find the epics and issues whose texts are semantically closest to a query.
+
+    Args:
+        q: Free text to search for
+        node_type: Only return entities of this type
+        project_id: Only return entities of this project
+        limit: Maximum number of matches
+
+    Returns:
+        dict: The matches, most similar first
+
+    """
+    # Imported here so NumPy is not loaded with the routers
+    from agent.vector_index import get_vector_index  # noqa: PLC0415
+
+    matches = get_vector_index().search(
+        q, k=limit, node_type=node_type, progetto_id=project_id
+    )
+    return {"matches": [match._asdict() for match in matches]}
+
+
+@graph_router.post("/rollback")
+async def rollback_graph(version: int):
+    """Roll the graph back to an earlier version.
+
+    Args:
+        version: The graph version to return to
+
+    Returns:
+        dict: The result of the inverse batch and the resulting version
+
+    Raises:
+        HTTPException: If the version is unknown or its history was compacted
+
+    """
+    try:
+        return await asyncio.to_thread(get_rollback_manager().rollback, version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except RollbackUnavailableError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+
+
 @todo_router.get("/")
 async def get_todos():
     """Get the list of TODOs.
@@ -118,12 +344,20 @@ async def create_todo():
     }
 
 
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Expose request and runtime metrics in the Prometheus text format."""
+    return PlainTextResponse(
+        get_metrics_registry().render(), media_type=EXPOSITION_CONTENT_TYPE
+    )
+
+
 # Session Management Endpoints
 
 
-def get_session_manager_dependency() -> SessionManager:
-    """Dependency to get the session manager instance."""
-    return get_session_manager()
+def get_rate_limiter_dependency(http_request: Request) -> RateLimiter:
+    """Dependency to get the rate limiter of the application."""
+    return http_request.app.state.rate_limiter
 
 
 @session_router.post("", response_model=SessionResponse)
@@ -131,6 +365,8 @@ def get_session_manager_dependency() -> SessionManager:
 async def create_session(
     request: SessionCreateRequest,
     session_manager: SessionManager = Depends(get_session_manager_dependency),
+    rate_limiter: RateLimiter = Depends(get_rate_limiter_dependency),
+    settings: Settings = Depends(get_settings),
 ):
     """Create a new user session.
 
@@ -139,22 +375,18 @@ async def create_session(
     """
     logger = logging.getLogger(__name__)
 
-    # Simple rate limiting - prevent creation of multiple sessions within 1 second
-    current_time = time.time()
-    user_key = f"{request.user_id}_{request.project_id}"
-
-    if user_key in _session_creation_times:
-        time_since_last = current_time - _session_creation_times[user_key]
-        if time_since_last < 1.0:  # 1 second cooldown
-            logger.warning(
-                f"Rate limiting session creation for user {request.user_id} - too frequent"
-            )
-            raise HTTPException(
-                status_code=429,
-                detail="Session creation rate limited. Please wait before creating another session.",
-            )
-
-    _session_creation_times[user_key] = current_time
+    # Rate limit session creation per user and project
+    try:
+        await rate_limiter.check(
+            f"sessions|{request.user_id}|{request.project_id}",
+            RateLimit.from_settings(settings.runtime.session_create_limit),
+            detail="Session creation rate limited. Please wait before creating another session.",
+        )
+    except HTTPException:
+        logger.warning(
+            f"Rate limiting session creation for user {request.user_id} - too frequent"
+        )
+        raise
 
     try:
         logger.info(
@@ -165,22 +397,9 @@ async def create_session(
             project_id=request.project_id,
             metadata=request.metadata,
         )
-        session_info = session.session_info
-        logger.info(f"Session created successfully: {session_info.session_id}")
-        return SessionResponse(
-            session_id=session_info.session_id,
-            user_id=session_info.user_id,
-            project_id=session_info.project_id,
-            status=session_info.status.value,
-            created_at=session_info.created_at.isoformat(),
-            last_activity=session_info.last_activity.isoformat(),
-            expires_at=session_info.expires_at.isoformat(),
-            is_expired=session_info.is_expired,
-            is_active=session_info.is_active,
-            agent_count=session_info.agent_count,
-            task_count=session_info.task_count,
-            metadata=session_info.metadata,
-        )
+        logger.info(f"Session created successfully: {session.session_id}")
+        # Pre-encoded; response_model only documents the schema
+        return FastJSONResponse(session.response_json())
     except Exception as e:
         logger.error(f"Failed to create session: {e!s}")
         raise HTTPException(
@@ -197,27 +416,34 @@ async def get_session_stats(
     Retrieves comprehensive statistics about all sessions.
     """
     try:
-        sessions = await session_manager.list_sessions()
-        total_sessions = len(sessions)
-        active_sessions = sum(1 for s in sessions if s.is_active())
-        expired_sessions = sum(1 for s in sessions if s.is_expired())
-        error_sessions = sum(1 for s in sessions if s.status.value == "error")
-
-        # Calculate average session duration for completed sessions
-        completed_sessions = [
-            s for s in sessions if s.status.value in ["expired", "cleaning_up"]
-        ]
-        if completed_sessions:
-            durations = [
-                (s.last_activity - s.created_at).total_seconds()
-                for s in completed_sessions
-            ]
-            avg_duration = sum(durations) / len(durations)
-        else:
-            avg_duration = None
+        # Sessions run by other workers are counted from their stored state
+        states = await session_manager.session_states()
+        active_sessions = expired_sessions = error_sessions = 0
+        durations = []
+        for state, session in states:
+            if session is not None:
+                status = session.status.value
+                active_sessions += session.is_active()
+                expired_sessions += session.is_expired()
+            else:
+                status = state["status"]
+                active_sessions += state_is_active(state)
+                expired_sessions += state_is_expired(state)
+            error_sessions += status == "error"
+
+            # Average the duration of completed sessions
+            if status in ["expired", "cleaning_up"]:
+                if session is not None:
+                    created_at = session.created_at
+                    last_activity = session.last_activity
+                else:
+                    created_at = datetime.fromisoformat(state["created_at"])
+                    last_activity = datetime.fromisoformat(state["last_activity"])
+                durations.append((last_activity - created_at).total_seconds())
+        avg_duration = sum(durations) / len(durations) if durations else None
 
         return SessionStats(
-            total_sessions=total_sessions,
+            total_sessions=len(states),
             active_sessions=active_sessions,
             expired_sessions=expired_sessions,
             error_sessions=error_sessions,
@@ -242,21 +468,7 @@ async def get_session(
     """
     try:
         session = await session_manager.get_session(session_id)
-        session_info = session.session_info
-        return SessionResponse(
-            session_id=session_info.session_id,
-            user_id=session_info.user_id,
-            project_id=session_info.project_id,
-            status=session_info.status.value,
-            created_at=session_info.created_at.isoformat(),
-            last_activity=session_info.last_activity.isoformat(),
-            expires_at=session_info.expires_at.isoformat(),
-            is_expired=session_info.is_expired,
-            is_active=session_info.is_active,
-            agent_count=session_info.agent_count,
-            task_count=session_info.task_count,
-            metadata=session_info.metadata,
-        )
+        return FastJSONResponse(session.response_json())
     except SessionNotFoundError as e:
         raise HTTPException(status_code=404, detail="Session not found") from e
     except Exception as e:
@@ -279,6 +491,8 @@ async def destroy_session(
         if not success:
             raise HTTPException(status_code=404, detail="Session not found")
         return {"message": "Session destroyed successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to destroy session: {e!s}"
@@ -296,32 +510,23 @@ async def list_sessions(
     Lists all active sessions, optionally filtered by user ID.
     """
     try:
-        sessions = await session_manager.list_sessions(user_id=user_id)
-        session_responses = []
-        for session in sessions:
-            session_info = session.session_info
-            session_responses.append(
-                SessionResponse(
-                    session_id=session_info.session_id,
-                    user_id=session_info.user_id,
-                    project_id=session_info.project_id,
-                    status=session_info.status.value,
-                    created_at=session_info.created_at.isoformat(),
-                    last_activity=session_info.last_activity.isoformat(),
-                    expires_at=session_info.expires_at.isoformat(),
-                    is_expired=session_info.is_expired,
-                    is_active=session_info.is_active,
-                    agent_count=session_info.agent_count,
-                    task_count=session_info.task_count,
-                    metadata=session_info.metadata,
-                )
-            )
-        active_count = sum(1 for s in session_responses if s.is_active)
-
-        return SessionListResponse(
-            sessions=session_responses,
-            total_count=len(session_responses),
-            active_count=active_count,
+        # Live sessions reuse their cached encoding; the others are encoded
+        # from their stored state without rebuilding a session
+        encoded = []
+        active_count = 0
+        for state, session in await session_manager.session_states(user_id):
+            if session is not None:
+                encoded.append(session.response_json())
+                active_count += session.is_active()
+            else:
+                encoded.append(state_response_json(state))
+                active_count += state_is_active(state)
+
+        return FastJSONResponse(
+            b'{"sessions": ['
+            + b", ".join(encoded)
+            + b'], "total_count": %d, "active_count": %d}'
+            % (len(encoded), active_count)
         )
     except Exception as e:
         raise HTTPException(
@@ -380,12 +585,14 @@ async def receive_messages(
         if message is None:
             return {"message": "No messages available", "timeout": True}
 
-        return MessageResponse(
-            message_id=message.id,
-            content=message.content,
-            timestamp=message.timestamp.isoformat(),
-            message_type=message.message_type,
-            metadata=message.metadata,
+        return FastJSONResponse(
+            MessageResponse(
+                message_id=message.id,
+                content=message.content,
+                timestamp=message.timestamp.isoformat(),
+                message_type=message.message_type,
+                metadata=message.metadata,
+            )
         )
     except SessionNotFoundError as e:
         raise HTTPException(status_code=404, detail="Session not found") from e
@@ -409,7 +616,9 @@ async def get_project_context(
         context = await session.get_project_context()
         tasks = await session.get_tasks()
 
-        return {"project_context": context, "tasks": tasks, "task_count": len(tasks)}
+        return FastJSONResponse(
+            {"project_context": context, "tasks": tasks, "task_count": len(tasks)}
+        )
     except SessionNotFoundError as e:
         raise HTTPException(status_code=404, detail="Session not found") from e
     except Exception as e:
@@ -472,7 +681,7 @@ async def get_tasks(
     try:
         session = await session_manager.get_session(session_id)
         tasks = await session.get_tasks()
-        return {"tasks": tasks, "count": len(tasks)}
+        return FastJSONResponse({"tasks": tasks, "count": len(tasks)})
     except SessionNotFoundError as e:
         raise HTTPException(status_code=404, detail="Session not found") from e
     except Exception as e:
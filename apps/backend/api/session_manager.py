@@ -7,17 +7,24 @@ and resource management.
 
 import asyncio
 import logging
+import time
+from collections.abc import Callable
 from contextlib import asynccontextmanager, suppress
-from typing import TYPE_CHECKING, Any
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any, TypeVar
 from uuid import UUID, uuid4
 
 from config.config import get_config
+from config.settings import Settings
 
-from .user_session import UserSession
+from .hibernation import SessionHibernator
+from .session_store import WORKER_ID, SessionStateStore, create_session_state_store
 
 if TYPE_CHECKING:
     from .user_session import UserSession as Session
 
+T = TypeVar("T")
+
 
 class SessionError(Exception):
     """Base exception for session-related errors."""
@@ -50,10 +57,28 @@ class SessionManager:
     - Resource Cleanup: Ensures proper cleanup of queues and runtime resources
     - Error Handling: Robust error handling with timeouts and graceful degradation
     - Project Context: Maintains project-specific state and task management per session
+    - Shared State: Writes session state through a ``SessionStateStore`` so any
+      worker can take over a session another worker created
+    - Hibernation: Spills idle sessions to disk and rehydrates them on access
     """
 
-    def __init__(self):
-        """Initialize the session manager."""
+    def __init__(
+        self,
+        state_store: SessionStateStore | None = None,
+        worker_id: str | None = None,
+        hibernator: SessionHibernator | None = None,
+    ):
+        """Initialize the session manager.
+
+        Args:
+            state_store: Where session state is shared, built from the
+                configuration by default
+            worker_id: Identifies this manager as the owner of its sessions,
+                ``server.worker_id`` or the host and pid by default
+            hibernator: Where idle sessions are spilled, at
+                ``system.hibernation_path`` by default
+
+        """
         self._sessions: dict[UUID, Session] = {}
         self._session_locks: dict[UUID, asyncio.Lock] = {}
         self._cleanup_task: asyncio.Task | None = None
@@ -61,21 +86,45 @@ class SessionManager:
         self._config = get_config()
         self._logger = logging.getLogger(__name__)
 
-        # Session configuration
-        self._session_timeout = self._config.get(
-            "session_timeout", 3600
-        )  # 1 hour default
-        self._cleanup_interval = self._config.get(
-            "cleanup_interval", 300
-        )  # 5 minutes default
-        self._max_sessions = self._config.get("max_sessions", 1000)
+        # Session limits, updated when the configuration is reloaded
+        self._apply_settings(self._config.settings)
+        self._config.on_reload(self._apply_settings)
+
+        # Session state shared between workers
+        self._worker_id = (
+            worker_id or self._config.settings.server.worker_id or WORKER_ID
+        )
+        self._state_store = state_store or create_session_state_store(
+            self._config.settings
+        )
+
+        # Idle sessions are hibernated to disk
+        if hibernator is None:
+            hibernator = SessionHibernator(
+                self._config.settings.system.hibernation_path
+            )
+        self._hibernator = hibernator
+
+        # Duration of the last cleanup pass, for metrics
+        self.last_cleanup_seconds: float | None = None
 
         # Agent registry for automatic registration
         self._agent_registry: dict[str, Any] = {}
 
+    def _apply_settings(self, settings: Settings):
+        """Take the session limits from a configuration snapshot."""
+        runtime = settings.runtime
+        self._session_timeout = runtime.session_timeout
+        self._cleanup_interval = runtime.cleanup_interval
+        self._max_sessions = runtime.max_sessions
+        # 0 disables hibernation
+        self._hibernate_after = runtime.session_hibernate_after
+
     async def start(self):
         """Start the session manager and begin cleanup tasks."""
         if self._cleanup_task is None or self._cleanup_task.done():
+            # A manager stopped by a previous lifespan can be started again
+            self._shutdown_event.clear()
             self._cleanup_task = asyncio.create_task(self._cleanup_loop())
             self._logger.info("Session manager started")
 
@@ -116,8 +165,16 @@ class SessionManager:
 
         """
         if len(self._sessions) >= self._max_sessions:
-            # Remove oldest session if at capacity
-            await self._cleanup_oldest_session()
+            # Hibernate the least recently used session, or remove the oldest
+            if self._hibernate_after:
+                await self.hibernate_session(
+                    min(
+                        self._sessions,
+                        key=lambda sid: self._sessions[sid].last_activity,
+                    )
+                )
+            else:
+                await self._cleanup_oldest_session()
 
         session_id = uuid4()
 
@@ -126,6 +183,9 @@ class SessionManager:
             session_lock = asyncio.Lock()
             self._session_locks[session_id] = session_lock
 
+            # Imported here: user_session imports this module at load time.
+            from .user_session import UserSession  # noqa: PLC0415
+
             # Create session
             session = UserSession(
                 session_id=session_id,
@@ -133,6 +193,7 @@ class SessionManager:
                 project_id=project_id,
                 metadata=metadata or {},
                 manager=self,
+                timeout=self._session_timeout,
             )
 
             # Initialize session
@@ -140,8 +201,11 @@ class SessionManager:
 
             # Store session
             self._sessions[session_id] = session
+            await self._stored(
+                self._state_store.save, session.to_state(), self._worker_id
+            )
 
-            self._logger.info(f"Created session {session_id} for user {user_id}")
+            self._logger.info("Created session %s for user %s", session_id, user_id)
             return session
 
         except Exception as e:
@@ -163,8 +227,17 @@ class SessionManager:
             SessionNotFoundError: If session doesn't exist
 
         """
-        if session_id not in self._sessions:
+        owner = await self._stored(self._state_store.owner, session_id)
+        if owner is None:
+            if session_id in self._sessions:
+                # Destroyed by another worker
+                await self.destroy_session(session_id)
+            self._hibernator.discard(session_id)
             raise SessionNotFoundError(f"Session {session_id} not found")
+        if owner != self._worker_id or session_id not in self._sessions:
+            # Run by another worker or hibernated; a hibernated file in the
+            # shared directory is always the current owner's latest state.
+            await self._adopt_session(session_id)
 
         session = self._sessions[session_id]
 
@@ -186,7 +259,13 @@ class SessionManager:
 
         """
         if session_id not in self._sessions:
-            return False
+            self._hibernator.discard(session_id)
+            if await self._stored(self._state_store.owner, session_id) is None:
+                return False
+            # Owned by another worker; that worker drops it on next access
+            await self._stored(self._state_store.delete, session_id)
+            self._logger.info("Destroyed session %s", session_id)
+            return True
 
         session = self._sessions[session_id]
 
@@ -196,16 +275,17 @@ class SessionManager:
 
             # Remove from registry
             del self._sessions[session_id]
+            await self._stored(self._state_store.delete, session_id)
 
             # Remove session lock
             if session_id in self._session_locks:
                 del self._session_locks[session_id]
 
-            self._logger.info(f"Destroyed session {session_id}")
+            self._logger.info("Destroyed session %s", session_id)
             return True
 
         except Exception as e:
-            self._logger.error(f"Error destroying session {session_id}: {e}")
+            self._logger.error("Error destroying session %s: %s", session_id, e)
             return False
 
     async def list_sessions(self, user_id: str | None = None) -> list["Session"]:
@@ -215,15 +295,123 @@ class SessionManager:
             user_id: Optional user filter
 
         Returns:
-            List[Session]: List of active sessions
+            List[Session]: List of active sessions, including detached views
+                of sessions run by other workers
 
         """
-        sessions = list(self._sessions.values())
+        from .user_session import UserSession  # noqa: PLC0415
 
-        if user_id:
-            sessions = [s for s in sessions if s.user_id == user_id]
+        return [
+            session or UserSession.from_state(state)
+            for state, session in await self.session_states(user_id)
+        ]
+
+    async def session_states(
+        self, user_id: str | None = None
+    ) -> list[tuple[dict[str, Any], "Session | None"]]:
+        """List the stored state of every session, optionally filtered by user.
+
+        Args:
+            user_id: Optional user filter
+
+        Returns:
+            list: ``(state, session)`` pairs, where ``session`` is the live
+                session when this worker runs it and None otherwise
+
+        """
+        states = await self._stored(self._state_store.states, user_id or None)
+        return [
+            (
+                state,
+                (
+                    self._sessions.get(UUID(state["session_id"]))
+                    if owner == self._worker_id
+                    else None
+                ),
+            )
+            for state, owner in states
+        ]
 
-        return sessions
+    async def save_session(self, session: "Session"):
+        """Write the state of a session run by this worker to the state store."""
+        await self._stored(self._state_store.save, session.to_state(), self._worker_id)
+
+    async def hibernate_session(self, session_id: UUID) -> bool:
+        """Tear down a live session and write its state to disk.
+
+        The session stays listed and is rehydrated by the next
+        ``get_session``.
+
+        Args:
+            session_id: The session identifier
+
+        Returns:
+            bool: True if the session was hibernated, False if not live here
+
+        """
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        state = await session.hibernate()
+        await asyncio.to_thread(self._hibernator.save, state)
+        await self._stored(
+            self._state_store.save,
+            {k: v for k, v in state.items() if k != "messages"},
+            self._worker_id,
+        )
+        self._session_locks.pop(session_id, None)
+        self._logger.info("Hibernated session %s", session_id)
+        return True
+
+    async def _adopt_session(self, session_id: UUID):
+        """Run a hibernated session, or one from the state store, in this worker.
+
+        Rehydration holds the session lock, so concurrent requests for the
+        same session start a single runtime.
+
+        Raises:
+            SessionNotFoundError: If the state store does not know the session
+
+        """
+        from .user_session import UserSession  # noqa: PLC0415
+
+        async with self._session_locks.setdefault(session_id, asyncio.Lock()):
+            if (
+                session_id in self._sessions
+                and await self._stored(self._state_store.owner, session_id)
+                == self._worker_id
+            ):
+                # Rehydrated by a concurrent request while this one waited
+                return
+
+            local = self._sessions.pop(session_id, None)
+            if local is not None:
+                # Another worker took the session over; our copy is stale.
+                await local.cleanup()
+
+            state = await asyncio.to_thread(self._hibernator.pop, session_id)
+            if state is not None:
+                source = "hibernation"
+            else:
+                entry = await self._stored(self._state_store.load, session_id)
+                if entry is None:
+                    self._session_locks.pop(session_id, None)
+                    raise SessionNotFoundError(f"Session {session_id} not found")
+                state, source = entry[0], f"worker {entry[1]}"
+
+            session = UserSession.from_state(state, manager=self)
+            await session.initialize()
+            self._sessions[session_id] = session
+            await self._stored(
+                self._state_store.save, session.to_state(), self._worker_id
+            )
+            self._logger.info("Rehydrated session %s from %s", session_id, source)
+
+    async def _stored(self, method: Callable[..., T], *args: Any) -> T:
+        """Call a state store method, in a thread if the store may block."""
+        if self._state_store.blocking:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
 
     def register_agent(self, agent_name: str, agent_class: Any):
         """Register an agent class for automatic session initialization.
@@ -234,7 +422,7 @@ class SessionManager:
 
         """
         self._agent_registry[agent_name] = agent_class
-        self._logger.info(f"Registered agent: {agent_name}")
+        self._logger.info("Registered agent: %s", agent_name)
 
     def get_agent_registry(self) -> dict[str, Any]:
         """Get the current agent registry."""
@@ -245,14 +433,16 @@ class SessionManager:
         while not self._shutdown_event.is_set():
             try:
                 await asyncio.sleep(self._cleanup_interval)
+                start = time.perf_counter()
                 await self._cleanup_expired_sessions()
+                self.last_cleanup_seconds = time.perf_counter() - start
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                self._logger.error(f"Error in cleanup loop: {e}")
+                self._logger.error("Error in cleanup loop: %s", e)
 
     async def _cleanup_expired_sessions(self):
-        """Clean up expired sessions."""
+        """Clean up expired sessions and hibernate idle ones."""
         expired_sessions = []
 
         for session_id, session in self._sessions.items():
@@ -261,9 +451,24 @@ class SessionManager:
 
         for session_id in expired_sessions:
             await self.destroy_session(session_id)
+        await self._stored(self._state_store.purge_expired, datetime.now(UTC))
+        # The hibernation directory is shared by all workers: only drop files
+        # of sessions that were deleted or expired, whoever wrote them.
+        for session_id in await asyncio.to_thread(self._hibernator.ids):
+            if await self._stored(self._state_store.owner, session_id) is None:
+                await asyncio.to_thread(self._hibernator.discard, session_id)
+
+        if self._hibernate_after:
+            idle_before = datetime.now(UTC) - timedelta(seconds=self._hibernate_after)
+            for session_id in [
+                sid
+                for sid, session in self._sessions.items()
+                if session.last_activity < idle_before
+            ]:
+                await self.hibernate_session(session_id)
 
         if expired_sessions:
-            self._logger.info(f"Cleaned up {len(expired_sessions)} expired sessions")
+            self._logger.info("Cleaned up %s expired sessions", len(expired_sessions))
 
     async def _cleanup_oldest_session(self):
         """Remove the oldest session when at capacity."""
@@ -277,7 +482,7 @@ class SessionManager:
 
         await self.destroy_session(oldest_session_id)
         self._logger.info(
-            f"Removed oldest session {oldest_session_id} due to capacity limit"
+            "Removed oldest session %s due to capacity limit", oldest_session_id
         )
 
     @asynccontextmanager
@@ -289,6 +494,25 @@ class SessionManager:
         async with self._session_locks[session_id]:
             yield
 
+    def queue_depths(self) -> dict[str, int]:
+        """Get the number of messages queued in live sessions by direction."""
+        depths = {"input": 0, "output": 0}
+        for session in self._sessions.values():
+            inputs, outputs = session.queue_sizes
+            depths["input"] += inputs
+            depths["output"] += outputs
+        return depths
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the cleanup loop is running."""
+        return self._cleanup_task is not None and not self._cleanup_task.done()
+
+    @property
+    def worker_id(self) -> str:
+        """Get the identifier of the worker running this manager."""
+        return self._worker_id
+
     @property
     def session_count(self) -> int:
         """Get the current number of active sessions."""
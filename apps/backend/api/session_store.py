@@ -0,0 +1,222 @@
+"""Session state backends shared between server workers.
+
+A ``UserSession`` lives in the worker that runs it: its queues, agents and
+runtime loop are process-local. What outlives the worker is its state
+(``UserSession.to_state``): identity, lifetimes, metadata, project context
+and tasks. The session manager writes that state through a
+``SessionStateStore`` and records which worker owns the live session.
+
+- ``MemorySessionStateStore`` keeps states in-process, for a single worker.
+- ``SQLiteSessionStateStore`` keeps them in a SQLite file, so any worker on
+  the host can take over a session another worker created. Messages still
+  queued in the previous owner are not carried over and every takeover
+  re-initializes the session, so several workers need sticky routing: a
+  proxy must send a session's requests to the worker named in the
+  ``X-Session-Worker`` response header, falling back to any worker only
+  when that one is gone. ``run_server.py`` starts several workers as one
+  process per port, each named ``host:port`` in that header so the proxy
+  can target it, and refuses to unless ``server.sticky_sessions`` declares
+  such routing.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from config.settings import Settings
+
+# Identifies this process as the owner of the sessions it runs
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class SessionStateStore(ABC):
+    """Abstract interface for session state storage."""
+
+    # Whether calls may block, and so must not run on the event loop
+    blocking = False
+
+    @abstractmethod
+    def save(self, state: dict[str, Any], worker: str):
+        """Insert or replace the state of a session owned by ``worker``."""
+        pass
+
+    @abstractmethod
+    def load(self, session_id: UUID) -> tuple[dict[str, Any], str] | None:
+        """Return the state and owner of a session, or None if unknown."""
+        pass
+
+    @abstractmethod
+    def owner(self, session_id: UUID) -> str | None:
+        """Return the worker owning a session, or None if unknown."""
+        pass
+
+    @abstractmethod
+    def delete(self, session_id: UUID):
+        """Forget a session."""
+        pass
+
+    @abstractmethod
+    def states(self, user_id: str | None = None) -> list[tuple[dict[str, Any], str]]:
+        """Return the states and owners of all sessions, optionally of one user."""
+        pass
+
+    @abstractmethod
+    def purge_expired(self, now: datetime) -> int:
+        """Forget sessions that expired before ``now`` and return their count."""
+        pass
+
+    def close(self):  # noqa: B027
+        """Release the resources held by the store."""
+
+
+class MemorySessionStateStore(SessionStateStore):
+    """Session states kept in the memory of a single worker."""
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._states: dict[UUID, tuple[dict[str, Any], str]] = {}
+
+    def save(self, state: dict[str, Any], worker: str):
+        """Insert or replace the state of a session owned by ``worker``."""
+        self._states[UUID(state["session_id"])] = (state, worker)
+
+    def load(self, session_id: UUID) -> tuple[dict[str, Any], str] | None:
+        """Return the state and owner of a session, or None if unknown."""
+        return self._states.get(session_id)
+
+    def owner(self, session_id: UUID) -> str | None:
+        """Return the worker owning a session, or None if unknown."""
+        entry = self._states.get(session_id)
+        return entry[1] if entry else None
+
+    def delete(self, session_id: UUID):
+        """Forget a session."""
+        self._states.pop(session_id, None)
+
+    def states(self, user_id: str | None = None) -> list[tuple[dict[str, Any], str]]:
+        """Return the states and owners of all sessions, optionally of one user."""
+        return [
+            entry
+            for entry in self._states.values()
+            if user_id is None or entry[0]["user_id"] == user_id
+        ]
+
+    def purge_expired(self, now: datetime) -> int:
+        """Forget sessions that expired before ``now`` and return their count."""
+        expired = [
+            session_id
+            for session_id, (state, _) in self._states.items()
+            if datetime.fromisoformat(state["expires_at"]) < now
+        ]
+        for session_id in expired:
+            del self._states[session_id]
+        return len(expired)
+
+
+class SQLiteSessionStateStore(SessionStateStore):
+    """Session states shared between the workers of a host."""
+
+    blocking = True
+
+    def __init__(self, path: str | Path):
+        """Open or create the session database.
+
+        Args:
+            path: The database file
+
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, user_id TEXT NOT NULL, "
+            "worker TEXT NOT NULL, expires_at REAL NOT NULL, state TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS sessions_user ON sessions (user_id)"
+        )
+        self._lock = threading.Lock()
+
+    def save(self, state: dict[str, Any], worker: str):
+        """Insert or replace the state of a session owned by ``worker``."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)",
+                (
+                    state["session_id"],
+                    state["user_id"],
+                    worker,
+                    datetime.fromisoformat(state["expires_at"]).timestamp(),
+                    json.dumps(state),
+                ),
+            )
+
+    def load(self, session_id: UUID) -> tuple[dict[str, Any], str] | None:
+        """Return the state and owner of a session, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state, worker FROM sessions WHERE session_id = ?",
+                (str(session_id),),
+            ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def owner(self, session_id: UUID) -> str | None:
+        """Return the worker owning a session, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT worker FROM sessions WHERE session_id = ?",
+                (str(session_id),),
+            ).fetchone()
+        return row[0] if row else None
+
+    def delete(self, session_id: UUID):
+        """Forget a session."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM sessions WHERE session_id = ?", (str(session_id),)
+            )
+
+    def states(self, user_id: str | None = None) -> list[tuple[dict[str, Any], str]]:
+        """Return the states and owners of all sessions, optionally of one user."""
+        with self._lock:
+            if user_id is None:
+                rows = self._conn.execute("SELECT state, worker FROM sessions")
+            else:
+                rows = self._conn.execute(
+                    "SELECT state, worker FROM sessions WHERE user_id = ?",
+                    (user_id,),
+                )
+            return [(json.loads(state), worker) for state, worker in rows]
+
+    def purge_expired(self, now: datetime) -> int:
+        """Forget sessions that expired before ``now`` and return their count."""
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM sessions WHERE expires_at < ?", (now.timestamp(),)
+            ).rowcount
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+
+def create_session_state_store(settings: Settings) -> SessionStateStore:
+    """Build the store selected by ``runtime.session_state_backend``.
+
+    "memory" (the default) keeps states in this worker; "sqlite" shares them
+    through the file at ``system.session_state_path``.
+    """
+    if settings.runtime.session_state_backend == "sqlite":
+        return SQLiteSessionStateStore(settings.system.session_state_path)
+    return MemorySessionStateStore()
@@ -5,6 +5,7 @@ with runtime orchestration and message queuing capabilities.
 """
 
 import asyncio
+import json
 import logging
 from collections.abc import Awaitable, Callable
 from contextlib import suppress
@@ -32,8 +33,20 @@ class UserSession:
         project_id: UUID | None = None,
         metadata: dict[str, Any] | None = None,
         manager: SessionManager | None = None,
+        *,
+        timeout: float = 3600,
     ):
-        """Initialize the user session."""
+        """Initialize the user session.
+
+        Args:
+            session_id: Unique identifier of the session
+            user_id: The user owning the session
+            project_id: Optional project context of the session
+            metadata: Optional metadata of the session
+            manager: The session manager running the session
+            timeout: Seconds until the session expires
+
+        """
         self.session_id = session_id
         self.user_id = user_id
         self.project_id = project_id
@@ -44,7 +57,7 @@ class UserSession:
         self.status = SessionStatus.INITIALIZING
         self.created_at = datetime.now(UTC)
         self.last_activity = datetime.now(UTC)
-        self.expires_at = self.created_at + timedelta(seconds=3600)  # 1 hour default
+        self.expires_at = self.created_at + timedelta(seconds=timeout)
 
         # Message queues
         self._input_queue: asyncio.Queue = asyncio.Queue()
@@ -64,16 +77,21 @@ class UserSession:
         self._error_count = 0
         self._max_errors = 5
 
-        # Logging
-        self._logger = logging.getLogger(f"{__name__}.{session_id}")
+        # Logging; one shared logger, since loggers are never freed
+        self._logger = logging.LoggerAdapter(
+            logging.getLogger(__name__), {"session_id": str(session_id)}
+        )
 
         # Cleanup flag
         self._cleanup_complete = asyncio.Event()
 
+        # Encoded response fragments and the state they were encoded from
+        self._response_cache: tuple[tuple, bytes, bytes] | None = None
+
     async def initialize(self):
         """Initialize the session and start the agent runtime."""
         try:
-            self._logger.info(f"Initializing session {self.session_id}")
+            self._logger.info("Initializing session %s", self.session_id)
 
             # Register default message handlers
             self._register_default_handlers()
@@ -89,17 +107,19 @@ class UserSession:
             self.status = SessionStatus.ACTIVE
             self.last_activity = datetime.now(UTC)
 
-            self._logger.info(f"Session {self.session_id} initialized successfully")
+            self._logger.info("Session %s initialized successfully", self.session_id)
 
         except Exception as e:
             self.status = SessionStatus.ERROR
-            self._logger.error(f"Failed to initialize session {self.session_id}: {e}")
+            self._logger.error(
+                "Failed to initialize session %s: %s", self.session_id, e
+            )
             raise SessionError(f"Session initialization failed: {e}") from e
 
     async def cleanup(self):
         """Cleanup session resources and stop all tasks."""
         try:
-            self._logger.info(f"Cleaning up session {self.session_id}")
+            self._logger.info("Cleaning up session %s", self.session_id)
             self.status = SessionStatus.CLEANING_UP
 
             # Stop runtime task
@@ -125,10 +145,10 @@ class UserSession:
             self.status = SessionStatus.EXPIRED
             self._cleanup_complete.set()
 
-            self._logger.info(f"Session {self.session_id} cleaned up successfully")
+            self._logger.info("Session %s cleaned up successfully", self.session_id)
 
         except Exception as e:
-            self._logger.error(f"Error cleaning up session {self.session_id}: {e}")
+            self._logger.error("Error cleaning up session %s: %s", self.session_id, e)
             self.status = SessionStatus.ERROR
 
     async def send_message(
@@ -161,7 +181,7 @@ class UserSession:
         await self._input_queue.put(message)
         self.last_activity = datetime.now(UTC)
 
-        self._logger.debug(f"Sent message {message_id} to session {self.session_id}")
+        self._logger.debug("Sent message %s to session %s", message_id, self.session_id)
         return message_id
 
     async def receive_message(self, timeout: float | None = None) -> Message | None:
@@ -199,7 +219,9 @@ class UserSession:
 
         """
         self._message_handlers[message_type.value] = handler
-        self._logger.debug(f"Registered handler for message type: {message_type.value}")
+        self._logger.debug(
+            "Registered handler for message type: %s", message_type.value
+        )
 
     async def get_project_context(self) -> dict[str, Any]:
         """Get the current project context."""
@@ -209,7 +231,8 @@ class UserSession:
         """Update the project context."""
         self._project_context.update(context)
         self.last_activity = datetime.now(UTC)
-        self._logger.debug(f"Updated project context for session {self.session_id}")
+        await self._persist()
+        self._logger.debug("Updated project context for session %s", self.session_id)
 
     async def add_task(self, task_data: dict[str, Any]) -> TaskInfo:
         """Add a task to the session task queue."""
@@ -228,13 +251,92 @@ class UserSession:
 
         self._task_queue.append(task)
         self.last_activity = datetime.now(UTC)
-        self._logger.debug(f"Added task to session {self.session_id}")
+        await self._persist()
+        self._logger.debug("Added task to session %s", self.session_id)
         return task
 
     async def get_tasks(self) -> list[TaskInfo]:
         """Get all tasks for this session."""
         return self._task_queue.copy()
 
+    def to_state(self) -> dict[str, Any]:
+        """Return the state of the session that outlives its worker.
+
+        Returns:
+            dict: JSON-serializable identity, lifetimes, metadata, project
+                context and tasks. Queued messages and agents are runtime
+                state and are not included.
+
+        """
+        return {
+            "session_id": str(self.session_id),
+            "user_id": self.user_id,
+            "project_id": str(self.project_id) if self.project_id else None,
+            "metadata": self.metadata,
+            "status": self.status.value,
+            "created_at": self.created_at.isoformat(),
+            "last_activity": self.last_activity.isoformat(),
+            "expires_at": self.expires_at.isoformat(),
+            "project_context": self._project_context,
+            "tasks": [task.model_dump() for task in self._task_queue],
+        }
+
+    @classmethod
+    def from_state(
+        cls, state: dict[str, Any], manager: SessionManager | None = None
+    ) -> "UserSession":
+        """Rebuild a session from the output of ``to_state``.
+
+        The session is not initialized: call ``initialize`` to run it in this
+        worker.
+        """
+        session = cls(
+            session_id=UUID(state["session_id"]),
+            user_id=state["user_id"],
+            project_id=UUID(state["project_id"]) if state["project_id"] else None,
+            metadata=state["metadata"],
+            manager=manager,
+        )
+        session.status = SessionStatus(state["status"])
+        session.created_at = datetime.fromisoformat(state["created_at"])
+        session.last_activity = datetime.fromisoformat(state["last_activity"])
+        session.expires_at = datetime.fromisoformat(state["expires_at"])
+        session._project_context = state["project_context"]
+        session._task_queue = [TaskInfo(**task) for task in state["tasks"]]
+        for queue_name in ("input", "output"):
+            queue = getattr(session, f"_{queue_name}_queue")
+            for message in state.get("messages", {}).get(queue_name, []):
+                queue.put_nowait(Message.model_validate(message))
+        return session
+
+    async def hibernate(self) -> dict[str, Any]:
+        """Tear the session down and return its state with queued messages.
+
+        ``from_state`` on the result requeues the messages, so nothing sent
+        to or produced by the session is lost while it is hibernated.
+        """
+        # Stop the runtime loop first so no message moves while draining
+        if self._runtime_task and not self._runtime_task.done():
+            self._runtime_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._runtime_task
+
+        state = self.to_state()
+        state["messages"] = {}
+        for queue_name in ("input", "output"):
+            queue = getattr(self, f"_{queue_name}_queue")
+            messages = []
+            while not queue.empty():
+                messages.append(queue.get_nowait().model_dump(mode="json"))
+            state["messages"][queue_name] = messages
+        await self.cleanup()
+        return state
+
+    async def _persist(self):
+        """Write the state of the session through its manager."""
+        if self.manager:
+            await self.manager.save_session(self)
+
     def is_expired(self) -> bool:
         """Check if the session has expired."""
         return datetime.now(UTC) > self.expires_at
@@ -245,7 +347,7 @@ class UserSession:
 
     async def _runtime_loop(self):
         """Process messages and manage agents."""
-        self._logger.info(f"Starting runtime loop for session {self.session_id}")
+        self._logger.info("Starting runtime loop for session %s", self.session_id)
 
         while self.status in [SessionStatus.ACTIVE, SessionStatus.PAUSED]:
             try:
@@ -262,7 +364,7 @@ class UserSession:
                 break
             except Exception as e:
                 self._logger.error(
-                    f"Error in runtime loop for session {self.session_id}: {e}"
+                    "Error in runtime loop for session %s: %s", self.session_id, e
                 )
                 self._error_count += 1
 
@@ -273,7 +375,7 @@ class UserSession:
                 # Wait before retrying
                 await asyncio.sleep(1)
 
-        self._logger.info(f"Runtime loop ended for session {self.session_id}")
+        self._logger.info("Runtime loop ended for session %s", self.session_id)
 
     async def _process_input_messages(self):
         """Process messages from the input queue."""
@@ -284,7 +386,7 @@ class UserSession:
             except asyncio.QueueEmpty:
                 break
             except Exception as e:
-                self._logger.error(f"Error processing input message: {e}")
+                self._logger.error("Error processing input message: %s", e)
 
     async def _process_agent_outputs(self):
         """Process outputs from agents."""
@@ -296,7 +398,7 @@ class UserSession:
                         await self._output_queue.put(output)
             except Exception as e:
                 self._logger.error(
-                    f"Error processing output from agent {agent_name}: {e}"
+                    "Error processing output from agent %s: %s", agent_name, e
                 )
 
     async def _handle_message(self, message: Message):
@@ -307,11 +409,11 @@ class UserSession:
             try:
                 await handler(message)
             except Exception as e:
-                self._logger.error(f"Error handling message {message.id}: {e}")
+                self._logger.error("Error handling message %s: %s", message.id, e)
         else:
             # Default handling - just log and forward
             self._logger.debug(
-                f"No handler for message type {message.message_type.value}, forwarding"
+                "No handler for message type %s, forwarding", message.message_type.value
             )
             await self._output_queue.put(message)
 
@@ -323,13 +425,13 @@ class UserSession:
 
     async def _handle_user_message(self, message: Message):
         """Handle user messages."""
-        self._logger.debug(f"Handling user message: {message.content}")
+        self._logger.debug("Handling user message: %s", message.content)
         # Forward to agents or process directly
         await self._output_queue.put(message)
 
     async def _handle_system_message(self, message: Message):
         """Handle system messages."""
-        self._logger.debug(f"Handling system message: {message.content}")
+        self._logger.debug("Handling system message: %s", message.content)
         # Process system commands
         if isinstance(message.content, dict):
             command = message.content.get("command")
@@ -340,7 +442,7 @@ class UserSession:
 
     async def _handle_agent_message(self, message: Message):
         """Handle agent messages."""
-        self._logger.debug(f"Handling agent message: {message.content}")
+        self._logger.debug("Handling agent message: %s", message.content)
         # Process agent responses
         await self._output_queue.put(message)
 
@@ -362,11 +464,11 @@ class UserSession:
                 self._agent_tasks[agent_name] = task
 
                 self._logger.info(
-                    f"Initialized agent {agent_name} for session {self.session_id}"
+                    "Initialized agent %s for session %s", agent_name, self.session_id
                 )
 
             except Exception as e:
-                self._logger.error(f"Failed to initialize agent {agent_name}: {e}")
+                self._logger.error("Failed to initialize agent %s: %s", agent_name, e)
 
     def _clear_queues(self):
         """Clear all message queues."""
@@ -384,6 +486,11 @@ class UserSession:
             except asyncio.QueueEmpty:
                 break
 
+    @property
+    def queue_sizes(self) -> tuple[int, int]:
+        """Get the number of queued input and output messages."""
+        return self._input_queue.qsize(), self._output_queue.qsize()
+
     @property
     def session_info(self) -> SessionInfo:
         """Get session information."""
@@ -401,3 +508,81 @@ class UserSession:
             task_count=len(self._task_queue),
             metadata=self.metadata,
         )
+
+    def response_json(self) -> bytes:
+        """Encode the session as a ``SessionResponse`` JSON object.
+
+        Everything but the expiry flags is encoded once per change of status,
+        activity, lifetime, agent count or task count and then reused; the
+        flags depend on the current time and are appended on every call.
+        Metadata is assumed not to change after creation.
+        """
+        key = (
+            self.status,
+            self.last_activity,
+            self.expires_at,
+            len(self._agents),
+            len(self._task_queue),
+        )
+        if self._response_cache is None or self._response_cache[0] != key:
+            head = json.dumps(
+                {
+                    "session_id": str(self.session_id),
+                    "user_id": self.user_id,
+                    "project_id": str(self.project_id) if self.project_id else None,
+                    "status": self.status.value,
+                    "created_at": self.created_at.isoformat(),
+                    "last_activity": self.last_activity.isoformat(),
+                    "expires_at": self.expires_at.isoformat(),
+                }
+            )
+            tail = json.dumps(
+                {
+                    "agent_count": len(self._agents),
+                    "task_count": len(self._task_queue),
+                    "metadata": self.metadata,
+                },
+                default=str,
+            )
+            self._response_cache = (key, head[:-1].encode(), tail[1:].encode())
+        _, head, tail = self._response_cache
+
+        is_expired = self.is_expired()
+        is_active = self.status == SessionStatus.ACTIVE and not is_expired
+        flags = f', "is_expired": {"true" if is_expired else "false"}, '
+        flags += f'"is_active": {"true" if is_active else "false"}, '
+        return head + flags.encode() + tail
+
+
+def state_is_expired(state: dict[str, Any]) -> bool:
+    """Check if the session with the output of ``to_state`` has expired."""
+    return datetime.now(UTC) > datetime.fromisoformat(state["expires_at"])
+
+
+def state_is_active(state: dict[str, Any]) -> bool:
+    """Check if the session with the output of ``to_state`` is active."""
+    return state["status"] == SessionStatus.ACTIVE and not state_is_expired(state)
+
+
+def state_response_json(state: dict[str, Any]) -> bytes:
+    """Encode the output of ``to_state`` as a ``SessionResponse`` JSON object.
+
+    Used for sessions this worker does not run, which have no agents.
+    """
+    return json.dumps(
+        {
+            "session_id": state["session_id"],
+            "user_id": state["user_id"],
+            "project_id": state["project_id"],
+            "status": state["status"],
+            "created_at": state["created_at"],
+            "last_activity": state["last_activity"],
+            "expires_at": state["expires_at"],
+            "is_expired": state_is_expired(state),
+            "is_active": state_is_active(state),
+            "agent_count": 0,
+            "task_count": len(state["tasks"]),
+            "metadata": state["metadata"],
+        },
+        default=str,
+    ).encode()
@@ -1,11 +1,26 @@
 """Configuration manager for the backend."""
 
+import atexit
+import inspect
 import json
 import logging
 import logging.handlers
+import queue
+import threading
+import weakref
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
+from .logs import (
+    SAMPLED_LOGGERS,
+    TEXT_FORMAT,
+    DebugSampler,
+    DeferredQueueHandler,
+    JsonFormatter,
+)
+from .settings import Settings, apply_env_overrides
+
 
 class ConfigManager:
     """A singleton class to manage configuration."""
@@ -22,7 +37,10 @@ class ConfigManager:
         """Initialize the configuration manager."""
         if not hasattr(self, "initialized"):
             self.config_path = config_path
-            self.config = self._load_config()
+            self.config = apply_env_overrides(self._load_config())
+            self.settings = Settings.model_validate(self.config)
+            self._reload_lock = threading.Lock()
+            self._reload_callbacks: list[Callable[[], Callable | None]] = []
             self._setup_logging()
             self.initialized = True
 
@@ -40,12 +58,9 @@ class ConfigManager:
 
     def _setup_logging(self):
         """Set up the logging for the application."""
-        logging_config = self.config.get("logging", {})
-        log_level = logging_config.get("log_level", "INFO").upper()
-        console_logging = logging_config.get("console_logging", True)
-
-        system_config = self.config.get("system", {})
-        logs_path = system_config.get("logs_path", "../logs")
+        logging_config = self.settings.logging
+        log_level = logging_config.log_level.upper()
+        logs_path = self.settings.system.logs_path
 
         if not Path(logs_path).exists():
             Path(logs_path).mkdir(parents=True)
@@ -59,27 +74,117 @@ class ConfigManager:
         if root_logger.hasHandlers():
             root_logger.handlers.clear()
 
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
+        if logging_config.format == "json":
+            formatter: logging.Formatter = JsonFormatter()
+        else:
+            formatter = logging.Formatter(TEXT_FORMAT)
 
         # File handler
-        max_bytes = logging_config.get("max_bytes", 10485760)
-        backup_count = logging_config.get("backup_count", 5)
         file_handler = logging.handlers.RotatingFileHandler(
-            log_file, maxBytes=max_bytes, backupCount=backup_count
+            log_file,
+            maxBytes=logging_config.max_bytes,
+            backupCount=logging_config.backup_count,
         )
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        handlers: list[logging.Handler] = [file_handler]
 
         # Console handler
-        if console_logging:
+        if logging_config.console_logging:
             console_handler = logging.StreamHandler()
             console_handler.setFormatter(formatter)
-            root_logger.addHandler(console_handler)
+            handlers.append(console_handler)
+
+        # Write from a background thread so logging never blocks the loop
+        if logging_config.queue:
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            self.log_listener = logging.handlers.QueueListener(
+                log_queue, *handlers, respect_handler_level=True
+            )
+            self.log_listener.start()
+            atexit.register(self.stop_logging)
+            handlers = [DeferredQueueHandler(log_queue)]
+
+        for handler in handlers:
+            root_logger.addHandler(handler)
+
+        # Sample the DEBUG records logged for every message
+        sample_rate = logging_config.debug_sample_rate
+        for name in SAMPLED_LOGGERS:
+            sampled_logger = logging.getLogger(name)
+            for old_filter in sampled_logger.filters[:]:
+                if isinstance(old_filter, DebugSampler):
+                    sampled_logger.removeFilter(old_filter)
+            if sample_rate < 1:
+                sampled_logger.addFilter(DebugSampler(sample_rate))
 
         logging.info("Logging configured.")
 
+    def flush_logging(self):
+        """Write out the queued log records, keeping the background writer."""
+        listener = getattr(self, "log_listener", None)
+        if listener is not None:
+            # Stopping drains the queue; the listener can be started again
+            listener.stop()
+            listener.start()
+
+    def stop_logging(self):
+        """Flush queued log records and stop the background log writer.
+
+        Records logged afterwards are written synchronously.
+        """
+        listener = getattr(self, "log_listener", None)
+        if listener is None:
+            return
+        self.log_listener = None
+        root_logger = logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            if isinstance(handler, DeferredQueueHandler):
+                root_logger.removeHandler(handler)
+        listener.stop()
+        for handler in listener.handlers:
+            root_logger.addHandler(handler)
+
+    def reload(self) -> Settings:
+        """Re-read the configuration file and swap in a new snapshot.
+
+        The new configuration is validated before anything changes, so an
+        invalid file leaves the current snapshot in place. Readers holding
+        the old snapshot keep a consistent view; logging is not reconfigured.
+
+        Returns:
+            Settings: The new snapshot
+
+        Raises:
+            pydantic.ValidationError: If the configuration is invalid
+
+        """
+        with self._reload_lock:
+            config = apply_env_overrides(self._load_config())
+            settings = Settings.model_validate(config)
+            self.config, self.settings = config, settings
+            callbacks = [ref() for ref in self._reload_callbacks]
+            self._reload_callbacks = [
+                ref
+                for ref, callback in zip(self._reload_callbacks, callbacks, strict=True)
+                if callback is not None
+            ]
+        logging.info("Configuration reloaded from %s", self.config_path)
+        for callback in callbacks:
+            if callback is not None:
+                callback(settings)
+        return settings
+
+    def on_reload(self, callback: Callable[[Settings], None]):
+        """Call ``callback`` with every new snapshot.
+
+        Bound methods are held weakly, so subscribing does not keep their
+        object alive.
+        """
+        if inspect.ismethod(callback):
+            self._reload_callbacks.append(weakref.WeakMethod(callback))
+        else:
+            self._reload_callbacks.append(lambda: callback)
+
     def get(self, key: str, default: Any = None) -> Any:
         """Retrieve a configuration value."""
         return self.config.get(key, default)
@@ -127,3 +232,12 @@ def get_config() -> ConfigManager:
         config_path = Path(__file__).parent.parent / "config.json"
         config_manager = ConfigManager(config_path=config_path)
     return config_manager
+
+
+def get_settings() -> Settings:
+    """Get the current settings snapshot.
+
+    Usable as a FastAPI dependency; a request sees one snapshot throughout
+    even if the configuration is reloaded meanwhile.
+    """
+    return get_config().settings
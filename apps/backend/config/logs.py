@@ -0,0 +1,110 @@
+"""Logging handlers and filters for the backend.
+
+With ``logging.queue`` enabled, loggers only put records on an in-memory
+queue; a ``QueueListener`` thread formats them and writes them to the file
+and console handlers, so request handlers never wait on disk I/O. The
+message and traceback text are resolved before a record is queued; the
+rest of the formatting happens on the listener thread.
+
+``logging.format`` selects plain text or one JSON object per line, and
+``logging.debug_sample_rate`` keeps only a fraction of the DEBUG records
+logged for every message by sessions and the session manager.
+"""
+
+import copy
+import itertools
+import json
+import logging
+import logging.handlers
+from datetime import UTC, datetime
+from typing import Any
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Loggers that log DEBUG records for every message and get sampled
+SAMPLED_LOGGERS = ("api.user_session", "api.session_manager")
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects.
+
+    Fields passed with ``extra`` are included next to the standard ones.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Return the record as a JSON object."""
+        entry: dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves most formatting to the listener thread.
+
+    The stock ``QueueHandler`` fully formats the record on the logging
+    thread before enqueueing it. Here only what cannot wait is resolved: the
+    message is merged with its arguments, which may change before the
+    listener runs, and the traceback is rendered to text so the queued copy
+    keeps no frames alive. Timestamps, levels and JSON encoding are left to
+    the listener's formatters.
+    """
+
+    _exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Return a copy of the record, safe to format on another thread."""
+        record = copy.copy(record)
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exception_formatter.formatException(
+                    record.exc_info
+                )
+            record.exc_info = None
+        return record
+
+
+class DebugSampler(logging.Filter):
+    """Passes one in every N DEBUG records; other levels always pass.
+
+    Installed on the loggers in ``SAMPLED_LOGGERS``, where it drops records
+    before they reach any handler.
+    """
+
+    def __init__(self, rate: float):
+        """Initialize the sampler.
+
+        Args:
+            rate: Fraction of DEBUG records to keep, between 0 and 1
+
+        """
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._counter = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return whether the record should be emitted."""
+        if record.levelno != logging.DEBUG:
+            return True
+        if not self.every:
+            return False
+        return next(self._counter) % self.every == 0
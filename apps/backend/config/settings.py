@@ -0,0 +1,145 @@
+"""Typed application settings.
+
+``config.json`` is validated once into frozen Pydantic models, so reading a
+setting is an attribute access on an immutable snapshot rather than a chain
+of dict lookups with defaults scattered over the callers. Sections keep
+unknown keys, so settings not modelled here remain readable.
+
+Environment variables named ``BACKEND__<SECTION>__<KEY>`` override the file,
+for example ``BACKEND__RUNTIME__MAX_SESSIONS=200``. Values are parsed as
+JSON when possible, so objects and numbers can be given as well as strings.
+"""
+
+import copy
+import json
+import os
+from collections.abc import Mapping
+from typing import Any, Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+ENV_PREFIX = "BACKEND__"
+
+
+class _Section(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="allow")
+
+
+class RateLimitSettings(_Section):
+    """A sustained rate in requests per second with an allowed burst."""
+
+    rate: float = Field(gt=0)
+    burst: int = Field(1, ge=1)
+
+
+class SystemSettings(_Section):
+    """Paths of the files and directories the backend writes."""
+
+    logs_path: str = "./logs"
+    temp_path: str = "../temp"
+    journal_path: str = "./journal"
+    snapshot_path: str = "./snapshots"
+    vector_index_path: str = "./vector_index"
+    rate_limit_path: str = "./rate_limits.db"
+    session_state_path: str = "./sessions.db"
+    hibernation_path: str = "./hibernated"
+
+
+class LoggingSettings(_Section):
+    """Log level, destinations and formatting."""
+
+    log_level: str = "INFO"
+    console_logging: bool = True
+    max_bytes: int = Field(10485760, ge=0)
+    backup_count: int = Field(5, ge=0)
+    queue: bool = False
+    format: Literal["text", "json"] = "text"
+    debug_sample_rate: float = Field(1.0, ge=0, le=1)
+
+
+class RuntimeSettings(_Section):
+    """Limits and tuning of sessions, agents and the graph store."""
+
+    max_concurrent_agents: int = Field(10, ge=1)
+    agent_queue_timeout: float | None = 30.0
+    session_timeout: float = Field(3600, gt=0)
+    cleanup_interval: float = Field(300, gt=0)
+    max_sessions: int = Field(1000, ge=1)
+    session_hibernate_after: float = Field(300, ge=0)
+    session_state_backend: Literal["memory", "sqlite"] = "memory"
+    session_create_limit: RateLimitSettings = RateLimitSettings(rate=1.0, burst=5)
+    rate_limit_backend: Literal["memory", "sqlite"] = "memory"
+    rate_limit_max_keys: int = Field(10_000, ge=1)
+    rate_limits: dict[str, RateLimitSettings] = {}
+    health_check_interval: float = Field(15, gt=0)
+    health_check_timeout: float = Field(5, gt=0)
+    enable_tracing: bool = False
+    tracing_endpoint: str | None = None
+    tracing_exporter: str | None = None
+    rag_token_budget: int = Field(1024, ge=1)
+    rag_hops: int = Field(2, ge=0)
+    snapshot_interval: int = Field(100, ge=1)
+    journal_fsync_interval: float = Field(1.0, gt=0)
+    journal_compact_interval: float = Field(3600, gt=0)
+    journal_retention: float = Field(604800, gt=0)
+    embedding_dimension: int = Field(256, ge=1)
+    vector_ivf_lists: int = Field(0, ge=0)
+
+
+class ServerSettings(_Section):
+    """Where and how uvicorn serves the application."""
+
+    host: str = "0.0.0.0"  # noqa: S104
+    port: int = 8000
+    # Several workers each serve their own port, from ``port`` upwards
+    workers: int = Field(1, ge=1)
+    # Set when a proxy sends each session's requests to the worker named in
+    # its X-Session-Worker header; required to run several workers
+    sticky_sessions: bool = False
+    # Names this process in X-Session-Worker; the host and pid when empty
+    worker_id: str = ""
+
+
+class Settings(_Section):
+    """A validated, immutable snapshot of the configuration."""
+
+    llm_provider: str = "default_provider"
+    llm_config: dict[str, Any] = {}
+    system: SystemSettings = SystemSettings()
+    logging: LoggingSettings = LoggingSettings()
+    runtime: RuntimeSettings = RuntimeSettings()
+    server: ServerSettings = ServerSettings()
+
+
+def _parse_env_value(value: str) -> Any:
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return value
+
+
+def apply_env_overrides(
+    config: dict[str, Any], environ: Mapping[str, str] | None = None
+) -> dict[str, Any]:
+    """Return a copy of the configuration with environment overrides applied.
+
+    Args:
+        config: The configuration loaded from ``config.json``
+        environ: The environment to read, ``os.environ`` by default
+
+    Returns:
+        dict[str, Any]: The configuration with every ``BACKEND__`` variable
+            set at its lowercased key path
+
+    """
+    environ = os.environ if environ is None else environ
+    result = copy.deepcopy(config)
+    for name, value in environ.items():
+        if not name.startswith(ENV_PREFIX):
+            continue
+        *parents, key = name[len(ENV_PREFIX) :].lower().split("__")
+        target = result
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[key] = _parse_env_value(value)
+    return result
@@ -0,0 +1,176 @@
+"""OpenTelemetry tracing setup for the backend.
+
+Spans are exported in the background by batch span processors, either to an
+OTLP collector at ``runtime.tracing_endpoint`` or to a local exporter
+selected by ``runtime.tracing_exporter`` ("file" writes JSON lines to
+``<logs_path>/traces.jsonl``, "console" writes to stdout). When tracing is
+disabled the OpenTelemetry API falls back to no-op spans.
+
+OpenTelemetry accepts one global tracer provider per process, so the
+provider is installed by the first ``setup_tracing`` call and lives until
+the interpreter exits, when the SDK shuts it down. Application shutdowns
+only flush it, so a later startup in the same process keeps tracing.
+"""
+
+import functools
+import inspect
+import json
+import logging
+import threading
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, TypeVar
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
+)
+
+from .settings import RuntimeSettings
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+logger = logging.getLogger(__name__)
+
+# The provider installed for this process, if tracing was enabled
+_provider: TracerProvider | None = None
+_provider_lock = threading.Lock()
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Writes finished spans as JSON lines to a local file."""
+
+    def __init__(self, path: str | Path):
+        """Initialize the exporter with the output file path."""
+        self._path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        """Append the spans to the output file."""
+        lines = []
+        for span in spans:
+            parent = span.parent.span_id if span.parent else None
+            lines.append(
+                json.dumps(
+                    {
+                        "name": span.name,
+                        "trace_id": f"{span.context.trace_id:032x}",
+                        "span_id": f"{span.context.span_id:016x}",
+                        "parent_id": f"{parent:016x}" if parent else None,
+                        "start_time": span.start_time,
+                        "duration_ms": (span.end_time - span.start_time) / 1e6,
+                        "status": span.status.status_code.name,
+                        "attributes": dict(span.attributes or {}),
+                    },
+                    default=str,
+                )
+            )
+        try:
+            with self._lock, self._path.open("a") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError:
+            logger.exception("Failed to write spans to %s", self._path)
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        """Nothing to release; the file is opened per batch."""
+
+
+def setup_tracing(
+    runtime: RuntimeSettings, logs_path: str | Path
+) -> TracerProvider | None:
+    """Install the global tracer provider from the runtime configuration.
+
+    Only the first call with tracing enabled builds the provider; later calls
+    return it unchanged.
+
+    Args:
+        runtime: The ``runtime`` settings
+        logs_path: Directory where the file exporter writes ``traces.jsonl``
+
+    Returns:
+        The installed provider, or None if tracing is disabled.
+
+    """
+    global _provider  # noqa: PLW0603
+    if not runtime.enable_tracing:
+        return None
+
+    with _provider_lock:
+        if _provider is None:
+            _provider = _build_provider(runtime, logs_path)
+            trace.set_tracer_provider(_provider)
+            logger.info("Tracing configured.")
+    return _provider
+
+
+def _build_provider(runtime: RuntimeSettings, logs_path: str | Path) -> TracerProvider:
+    """Create a tracer provider with the configured exporters."""
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": "puntini-backend"})
+    )
+
+    endpoint = runtime.tracing_endpoint
+    if endpoint:
+        try:
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (  # noqa: PLC0415
+                OTLPSpanExporter,
+            )
+
+            provider.add_span_processor(
+                BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint, insecure=True))
+            )
+        except ImportError:
+            logger.warning("OTLP exporter is not installed, skipping %s", endpoint)
+
+    exporter = runtime.tracing_exporter
+    if exporter == "file":
+        Path(logs_path).mkdir(parents=True, exist_ok=True)
+        file_exporter = JsonLinesSpanExporter(Path(logs_path) / "traces.jsonl")
+        provider.add_span_processor(BatchSpanProcessor(file_exporter))
+    elif exporter == "console":
+        provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
+    return provider
+
+
+def traced(span_name: str) -> Callable[[F], F]:
+    """Wrap a function in a span named ``span_name``.
+
+    Coroutine functions are wrapped so the span covers the awaited call. If
+    the function returns a dictionary with a ``patches`` list, its length is
+    recorded as the ``puntini.patch_count`` attribute.
+    """
+    tracer = trace.get_tracer("puntini")
+
+    def record(span: trace.Span, result: Any):
+        if isinstance(result, dict) and isinstance(result.get("patches"), list):
+            span.set_attribute("puntini.patch_count", len(result["patches"]))
+
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.start_as_current_span(span_name) as span:
+                    result = await func(*args, **kwargs)
+                    record(span, result)
+                    return result
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(span_name) as span:
+                result = func(*args, **kwargs)
+                record(span, result)
+                return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
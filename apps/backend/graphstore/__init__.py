@@ -1,5 +1,6 @@
 """Graph store related modules."""
 
+from .memory import InMemoryGraphStore, get_graph_store
 from .store import GraphStore
 
-__all__ = ["GraphStore"]
+__all__ = ["GraphStore", "InMemoryGraphStore", "get_graph_store"]
@@ -0,0 +1,356 @@
+"""Dependency analytics over Epic/Issue dependency edges.
+
+Dependency edges are normalized to ``prerequisite -> dependent`` arcs:
+``A BLOCKS B`` and ``B DEPENDS_ON A`` both mean B cannot finish before A.
+On top of these arcs the engine answers topological ordering, critical path
+length, transitive blocker sets and cycle detection.
+
+The engine is fed the typed patches of every applied batch. Each patch
+updates the arc sets in place and invalidates only the cached results it can
+affect: adding ``u -> v`` drops the cached blocker sets of ``v`` and its
+descendants and the cached blocked sets of ``u`` and its ancestors. Whole-
+graph results such as the topological order are recomputed lazily, once per
+change, on the next question.
+"""
+
+import heapq
+from collections.abc import Iterable
+from typing import Any
+
+from models.graph import (
+    AddEdge,
+    AddNode,
+    Delete,
+    Edge,
+    GraphPatch,
+    Node,
+    Patch,
+    UpdateProps,
+    as_graph_patch,
+)
+
+from .memory import InMemoryGraphStore, get_graph_store
+
+# Edge type -> whether the edge points from the dependent to the prerequisite.
+DEPENDENCY_EDGE_TYPES = {"BLOCKS": False, "DEPENDS_ON": True}
+
+# Node property holding the duration used for the critical path.
+WEIGHT_PROPERTY = "estimate"
+
+
+class DependencyCycleError(Exception):
+    """Raised when an ordering is requested for a graph with cycles."""
+
+    def __init__(self, cycles: list[list[str]]):
+        """Initialize the error with the offending cycles."""
+        super().__init__(f"Dependency graph has {len(cycles)} cycle(s)")
+        self.cycles = cycles
+
+
+class DependencyAnalytics:
+    """Incrementally maintained dependency graph with cached analyses."""
+
+    def __init__(self, edge_types: dict[str, bool] | None = None):
+        """Initialize an empty dependency graph.
+
+        Args:
+            edge_types: Dependency edge types mapped to whether they point
+                from the dependent to the prerequisite
+
+        """
+        self._edge_types = edge_types or DEPENDENCY_EDGE_TYPES
+        self._successors: dict[str, set[str]] = {}
+        self._predecessors: dict[str, set[str]] = {}
+        # Edges stating each arc, since BLOCKS and DEPENDS_ON may state the same
+        # arc; the arc exists while at least one of them does.
+        self._arc_edges: dict[tuple[str, str], set[tuple[str, str, str]]] = {}
+        self._weights: dict[str, float] = {}
+
+        self._blockers: dict[str, frozenset[str]] = {}
+        self._blocked: dict[str, frozenset[str]] = {}
+        self._order: list[str] | None = None
+        self._cycles: list[list[str]] | None = None
+        self._critical: tuple[float, list[str]] | None = None
+
+    @classmethod
+    def from_graph(
+        cls, nodes: Iterable[Node], edges: Iterable[Edge]
+    ) -> "DependencyAnalytics":
+        """Build the analytics for an existing graph slice."""
+        analytics = cls()
+        analytics.apply(
+            [AddNode(id=n.id, type=n.type, properties=n.properties) for n in nodes]
+            + [
+                AddEdge(source=e.source, target=e.target, type=e.type)
+                for e in edges
+                if e.type in analytics._edge_types
+            ]
+        )
+        return analytics
+
+    def apply(self, patches: Iterable[Patch | GraphPatch]):
+        """Update the dependency graph with an applied batch of patches."""
+        for patch in patches:
+            match as_graph_patch(patch):
+                case AddNode(id=node_id, properties=properties) | UpdateProps(
+                    entity="node", id=node_id, properties=properties
+                ) if (WEIGHT_PROPERTY in properties):
+                    self._set_weight(node_id, properties[WEIGHT_PROPERTY])
+                case AddEdge() as edge if edge.type in self._edge_types:
+                    self._add_edge(edge.source, edge.target, edge.type)
+                case Delete(entity="edge", type=edge_type) as delete if (
+                    edge_type in self._edge_types
+                ):
+                    self._remove_edge(delete.source, delete.target, edge_type)
+                case Delete(entity="node", id=node_id):
+                    self._remove_node(node_id)
+
+    def blockers(self, node_id: str) -> frozenset[str]:
+        """Return every node that must be finished before ``node_id``."""
+        cached = self._blockers.get(node_id)
+        if cached is None:
+            cached = self._blockers[node_id] = self._reach(node_id, self._predecessors)
+        return cached
+
+    def blocked(self, node_id: str) -> frozenset[str]:
+        """Return every node that cannot finish before ``node_id`` does."""
+        cached = self._blocked.get(node_id)
+        if cached is None:
+            cached = self._blocked[node_id] = self._reach(node_id, self._successors)
+        return cached
+
+    def has_cycle(self) -> bool:
+        """Return whether any dependency cycle exists."""
+        return bool(self.cycles())
+
+    def cycles(self) -> list[list[str]]:
+        """Return the dependency cycles as sorted strongly connected components."""
+        if self._cycles is None:
+            self._cycles = self._find_cycles()
+        return self._cycles
+
+    def topological_order(self) -> list[str]:
+        """Return the nodes with arcs so that prerequisites come first.
+
+        Ties are broken by node id, so the order is deterministic.
+
+        Raises:
+            DependencyCycleError: If the dependency graph has cycles
+
+        """
+        if self._order is None:
+            if self.has_cycle():
+                raise DependencyCycleError(self.cycles())
+            in_degree = {node: len(preds) for node, preds in self._predecessors.items()}
+            ready = [node for node in self._successors if node not in in_degree]
+            heapq.heapify(ready)
+            order = []
+            while ready:
+                node = heapq.heappop(ready)
+                order.append(node)
+                for successor in self._successors.get(node, ()):
+                    in_degree[successor] -= 1
+                    if in_degree[successor] == 0:
+                        heapq.heappush(ready, successor)
+            self._order = order
+        return list(self._order)
+
+    def critical_path(self) -> tuple[float, list[str]]:
+        """Return the length and nodes of the longest weighted dependency chain.
+
+        Each node weighs its ``estimate`` property, or 1 if it has none.
+
+        Raises:
+            DependencyCycleError: If the dependency graph has cycles
+
+        """
+        if self._critical is None:
+            finish: dict[str, float] = {}
+            previous: dict[str, str | None] = {}
+            for node in self.topological_order():
+                predecessors = self._predecessors.get(node)
+                best = (
+                    max(predecessors, key=lambda p: (finish[p], p))
+                    if predecessors
+                    else None
+                )
+                finish[node] = self.weight(node) + (finish[best] if best else 0.0)
+                previous[node] = best
+
+            if not finish:
+                self._critical = (0.0, [])
+            else:
+                end = max(sorted(finish), key=finish.__getitem__)
+                path = [end]
+                while (prev := previous[path[-1]]) is not None:
+                    path.append(prev)
+                self._critical = (finish[end], path[::-1])
+        return self._critical[0], list(self._critical[1])
+
+    def weight(self, node_id: str) -> float:
+        """Return the critical path weight of a node."""
+        return self._weights.get(node_id, 1.0)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the size of the dependency graph."""
+        return {
+            "nodes": len(self._successors.keys() | self._predecessors.keys()),
+            "arcs": len(self._arc_edges),
+        }
+
+    def _arc(self, source: str, target: str, edge_type: str) -> tuple[str, str]:
+        """Normalize an edge to a (prerequisite, dependent) arc."""
+        return (target, source) if self._edge_types[edge_type] else (source, target)
+
+    def _add_edge(self, source: str, target: str, edge_type: str):
+        """Record a dependency edge, adding its arc if no edge stated it yet.
+
+        Re-adding an edge that is already recorded changes nothing.
+        """
+        arc = self._arc(source, target, edge_type)
+        edges = self._arc_edges.get(arc)
+        if edges is None:
+            self._add_arc(*arc)
+            edges = self._arc_edges[arc] = set()
+        edges.add((source, target, edge_type))
+
+    def _remove_edge(self, source: str, target: str, edge_type: str):
+        """Forget a dependency edge, removing its arc once no edge states it."""
+        arc = self._arc(source, target, edge_type)
+        edges = self._arc_edges.get(arc)
+        if edges is None:
+            return
+        edges.discard((source, target, edge_type))
+        if not edges:
+            self._remove_arc(*arc)
+
+    def _add_arc(self, prerequisite: str, dependent: str):
+        """Add an arc to both adjacency maps and invalidate what it affects."""
+        self._invalidate(prerequisite, dependent)
+        self._successors.setdefault(prerequisite, set()).add(dependent)
+        self._predecessors.setdefault(dependent, set()).add(prerequisite)
+
+    def _remove_arc(self, prerequisite: str, dependent: str):
+        """Remove an arc from both adjacency maps and invalidate what it affected."""
+        self._invalidate(prerequisite, dependent)
+        del self._arc_edges[prerequisite, dependent]
+        self._successors[prerequisite].discard(dependent)
+        self._predecessors[dependent].discard(prerequisite)
+        for table, node in (
+            (self._successors, prerequisite),
+            (self._predecessors, dependent),
+        ):
+            if not table[node]:
+                del table[node]
+
+    def _remove_node(self, node_id: str):
+        """Remove a node with all of its arcs."""
+        self._weights.pop(node_id, None)
+        for dependent in list(self._successors.get(node_id, ())):
+            self._remove_arc(node_id, dependent)
+        for prerequisite in list(self._predecessors.get(node_id, ())):
+            self._remove_arc(prerequisite, node_id)
+
+    def _set_weight(self, node_id: str, value: Any):
+        """Update a node weight; only the critical path depends on it."""
+        try:
+            weight = float(value)
+        except (TypeError, ValueError):
+            weight = 1.0
+        if self._weights.get(node_id, 1.0) != weight:
+            self._weights[node_id] = weight
+            self._critical = None
+
+    def _invalidate(self, prerequisite: str, dependent: str):
+        """Drop cached results affected by a change of the given arc.
+
+        Must run before the arc is changed while the cached reachability
+        still describes the affected region.
+        """
+        for node in self.blocked(dependent) | {dependent}:
+            self._blockers.pop(node, None)
+        for node in self.blockers(prerequisite) | {prerequisite}:
+            self._blocked.pop(node, None)
+        self._order = None
+        self._cycles = None
+        self._critical = None
+
+    @staticmethod
+    def _reach(start: str, arcs: dict[str, set[str]]) -> frozenset[str]:
+        """Return the nodes reachable from ``start``, excluding it."""
+        seen: set[str] = set()
+        stack = [start]
+        while stack:
+            for neighbour in arcs.get(stack.pop(), ()):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    stack.append(neighbour)
+        seen.discard(start)
+        return frozenset(seen)
+
+    def _find_cycles(self) -> list[list[str]]:
+        """Find strongly connected components with more than one node."""
+        index: dict[str, int] = {}
+        low: dict[str, int] = {}
+        on_stack: set[str] = set()
+        stack: list[str] = []
+        components: list[list[str]] = []
+
+        for root in sorted(self._successors):
+            if root in index:
+                continue
+            # Iterative Tarjan: (node, iterator over its successors).
+            work = [(root, iter(sorted(self._successors.get(root, ()))))]
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, successors = work[-1]
+                for successor in successors:
+                    if successor not in index:
+                        index[successor] = low[successor] = len(index)
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        work.append(
+                            (
+                                successor,
+                                iter(sorted(self._successors.get(successor, ()))),
+                            )
+                        )
+                        break
+                    if successor in on_stack:
+                        low[node] = min(low[node], index[successor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in self._successors.get(node, ()):
+                            components.append(sorted(component))
+        return sorted(components)
+
+
+# Global dependency analytics instance
+_dependency_analytics: DependencyAnalytics | None = None
+
+
+def get_dependency_analytics(
+    store: InMemoryGraphStore | None = None,
+) -> DependencyAnalytics:
+    """Get the global dependency analytics, kept in sync with the graph store."""
+    global _dependency_analytics  # noqa: PLW0603
+    if _dependency_analytics is None:
+        store = store or get_graph_store()
+        _dependency_analytics = DependencyAnalytics.from_graph(
+            store.nodes(), store.edges()
+        )
+        store.subscribe(_dependency_analytics.apply)
+    return _dependency_analytics
@@ -0,0 +1,238 @@
+"""Compact columnar representation of graph slices.
+
+Holding a large project as ``Node``/``Edge`` models costs a Pydantic object
+and a properties dict per entity. ``ColumnarGraph`` instead keeps:
+
+- node ids in one list, mapped to dense integer indices;
+- node and edge types as small integer codes into interned string tables;
+- outgoing edges in compressed sparse row (CSR) arrays;
+- one column per property key, with repeated string values shared.
+
+It is read-only and meant for analytics and export paths: ``/graph/export``
+copies a project into this form under the store lock and streams it from
+there, so a slow client holds neither the lock nor a list of models.
+``Node`` and ``Edge`` models are materialized lazily, one at a time, when
+asked for.
+"""
+
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from models.graph import Edge, Node
+
+from .memory import InMemoryGraphStore
+
+# Marks a property a node does not have, as opposed to one set to None.
+_MISSING = object()
+
+
+class _InternTable:
+    """Maps strings to dense integer codes and back."""
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self):
+        self.values: list[str] = []
+        self.codes: dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        """Return the code of a value, adding it if needed."""
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(sys.intern(value))
+        return code
+
+
+class ColumnarGraph:
+    """Read-only, column-oriented snapshot of a set of nodes and edges."""
+
+    def __init__(self, nodes: Iterable[Node], edges: Iterable[Edge] = ()):
+        """Build the columnar form of a graph slice.
+
+        Edges whose endpoints are not among ``nodes`` leave the slice and are
+        dropped.
+
+        Args:
+            nodes: The nodes of the slice
+            edges: The edges of the slice
+
+        Raises:
+            ValueError: If two nodes share an id
+
+        """
+        self._ids: list[str] = []
+        self._index: dict[str, int] = {}
+        self._node_types = _InternTable()
+        self._edge_types = _InternTable()
+        self._type_codes = array("I")
+        self._columns: dict[str, list[Any]] = {}
+
+        shared: dict[str, str] = {}
+        for position, node in enumerate(nodes):
+            if node.id in self._index:
+                raise ValueError(f"duplicate node id {node.id!r}")
+            self._index[node.id] = position
+            self._ids.append(node.id)
+            self._type_codes.append(self._node_types.code(node.type))
+            for key, value in node.properties.items():
+                column = self._columns.get(key)
+                if column is None:
+                    column = self._columns[key] = [_MISSING] * position
+                column.append(
+                    shared.setdefault(value, value) if isinstance(value, str) else value
+                )
+            for column in self._columns.values():
+                if len(column) == position:
+                    column.append(_MISSING)
+
+        self._build_csr(edges)
+
+    @classmethod
+    def from_store(
+        cls, store: InMemoryGraphStore, progetto_id: str | None = None
+    ) -> tuple["ColumnarGraph", int]:
+        """Copy a project, or the whole graph, out of a store.
+
+        Args:
+            store: The store to copy from
+            progetto_id: The project to copy, or None for every node
+
+        Returns:
+            tuple[ColumnarGraph, int]: The slice and the store version it
+                was taken at
+
+        """
+        with store.lock:
+            graph = cls(store.nodes(progetto_id=progetto_id), store.edges())
+            return graph, store.version
+
+    def _build_csr(self, edges: Iterable[Edge]):
+        """Sort edges by source into CSR arrays."""
+        triples = []
+        self._edge_properties: dict[int, dict[str, Any]] = {}
+        for edge in edges:
+            source = self._index.get(edge.source)
+            target = self._index.get(edge.target)
+            if source is None or target is None:
+                continue
+            triples.append(
+                (source, target, self._edge_types.code(edge.type), edge.properties)
+            )
+        triples.sort(key=lambda t: (t[0], t[1], t[2]))
+
+        self._indptr = array("q", [0] * (len(self._ids) + 1))
+        self._targets = array("q")
+        self._edge_type_codes = array("I")
+        for position, (source, target, type_code, properties) in enumerate(triples):
+            self._indptr[source + 1] += 1
+            self._targets.append(target)
+            self._edge_type_codes.append(type_code)
+            if properties:
+                self._edge_properties[position] = properties
+        for i in range(len(self._ids)):
+            self._indptr[i + 1] += self._indptr[i]
+
+    def __len__(self) -> int:
+        """Return the number of nodes."""
+        return len(self._ids)
+
+    def __contains__(self, node_id: object) -> bool:
+        """Return whether the slice contains a node id."""
+        return node_id in self._index
+
+    @property
+    def edge_count(self) -> int:
+        """Return the number of edges."""
+        return len(self._targets)
+
+    def node(self, node_id: str) -> Node:
+        """Materialize a single node.
+
+        Raises:
+            KeyError: If the node is not in the slice
+
+        """
+        return self._materialize(self._index[node_id])
+
+    def nodes(self, node_type: str | None = None) -> Iterator[Node]:
+        """Lazily materialize the nodes, optionally of a single type."""
+        for position in self._positions(node_type):
+            yield self._materialize(position)
+
+    def node_ids(self, node_type: str | None = None) -> list[str]:
+        """Return the node ids, optionally of a single type."""
+        return [self._ids[position] for position in self._positions(node_type)]
+
+    def node_type(self, node_id: str) -> str:
+        """Return the type of a node without materializing it."""
+        return self._node_types.values[self._type_codes[self._index[node_id]]]
+
+    def value(self, node_id: str, key: str, default: Any = None) -> Any:
+        """Return a single property value without materializing the node."""
+        column = self._columns.get(key)
+        if column is None:
+            return default
+        value = column[self._index[node_id]]
+        return default if value is _MISSING else value
+
+    def column(self, key: str) -> dict[str, Any]:
+        """Return the values of one property, keyed by node id."""
+        column = self._columns.get(key, ())
+        return {
+            self._ids[position]: value
+            for position, value in enumerate(column)
+            if value is not _MISSING
+        }
+
+    def successors(self, node_id: str, edge_type: str | None = None) -> list[str]:
+        """Return the targets of a node's outgoing edges."""
+        position = self._index[node_id]
+        type_code = self._edge_type_code(edge_type)
+        return [
+            self._ids[self._targets[i]]
+            for i in range(self._indptr[position], self._indptr[position + 1])
+            if type_code is None or self._edge_type_codes[i] == type_code
+        ]
+
+    def edges(self, edge_type: str | None = None) -> Iterator[Edge]:
+        """Lazily materialize the edges, optionally of a single type."""
+        type_code = self._edge_type_code(edge_type)
+        for source in range(len(self._ids)):
+            for i in range(self._indptr[source], self._indptr[source + 1]):
+                if type_code is not None and self._edge_type_codes[i] != type_code:
+                    continue
+                yield Edge.trusted(
+                    source=self._ids[source],
+                    target=self._ids[self._targets[i]],
+                    type=self._edge_types.values[self._edge_type_codes[i]],
+                    properties=self._edge_properties.get(i),
+                )
+
+    def _positions(self, node_type: str | None) -> Iterable[int]:
+        """Return the positions of the nodes of a type, or of all nodes."""
+        if node_type is None:
+            return range(len(self._ids))
+        code = self._node_types.codes.get(node_type)
+        return [i for i, c in enumerate(self._type_codes) if c == code]
+
+    def _edge_type_code(self, edge_type: str | None) -> int | None:
+        """Return the code of an edge type, or -1 if it never occurs."""
+        if edge_type is None:
+            return None
+        return self._edge_types.codes.get(edge_type, -1)
+
+    def _materialize(self, position: int) -> Node:
+        """Build the Node model for a position."""
+        properties = {}
+        for key, column in self._columns.items():
+            value = column[position]
+            if value is not _MISSING:
+                properties[key] = value
+        return Node.trusted(
+            id=self._ids[position],
+            type=self._node_types.values[self._type_codes[position]],
+            properties=properties,
+        )
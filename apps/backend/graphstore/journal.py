@@ -0,0 +1,579 @@
+"""Append-only journal of applied graph patch batches.
+
+Every batch the store applies becomes one JSON line in the active segment
+file. Writes are strictly sequential and ``fsync`` is batched: the file is
+synced once ``fsync_every`` records are pending or ``fsync_interval`` seconds
+have passed, and always when a segment is sealed or the journal is closed.
+The interval is checked on append and by ``maintain_journal``, so the last
+records before an idle period are synced too.
+
+Each segment keeps an index of record offsets by timestamp and by entity id
+(nodes, plus both endpoints of edges). Sealed segments persist it next to the
+log as ``.idx``, so reopening the journal reads no log data, and queries seek
+straight to the records they need instead of scanning the journal.
+
+Compaction folds the sealed segments older than a cutoff into a single
+checkpoint record holding the net graph state, so the timeline before the
+cutoff is kept at checkpoint granularity only. ``maintain_journal`` compacts
+every ``runtime.journal_compact_interval`` seconds, keeping the last
+``runtime.journal_retention`` seconds at full granularity.
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+from config.config import get_settings
+from models.graph import (
+    AddEdge,
+    AddNode,
+    Delete,
+    GraphPatch,
+    Node,
+    Patch,
+    UpdateProps,
+    as_graph_patch,
+    validate_graph_patches,
+)
+
+from .memory import InMemoryGraphStore, get_graph_store
+
+logger = logging.getLogger(__name__)
+
+_SEGMENT_GLOB = "segment-*.log"
+
+
+@dataclass
+class JournalRecord:
+    """A single journaled batch of applied patches."""
+
+    seq: int
+    version: int
+    timestamp: float
+    patches: list[GraphPatch]
+    checkpoint: bool = False
+
+    def to_line(self) -> bytes:
+        """Serialize the record as one JSON line."""
+        payload = {
+            "seq": self.seq,
+            "version": self.version,
+            "ts": self.timestamp,
+            "patches": [p.model_dump(mode="json") for p in self.patches],
+        }
+        if self.checkpoint:
+            payload["checkpoint"] = True
+        return json.dumps(payload, separators=(",", ":")).encode() + b"\n"
+
+    @classmethod
+    def from_line(cls, line: bytes) -> "JournalRecord":
+        """Parse a record written by ``to_line``."""
+        payload = json.loads(line)
+        return cls(
+            seq=payload["seq"],
+            version=payload["version"],
+            timestamp=payload["ts"],
+            patches=validate_graph_patches(payload["patches"]),
+            checkpoint=payload.get("checkpoint", False),
+        )
+
+    def entity_ids(self) -> set[str]:
+        """Return the ids of the nodes this record touches."""
+        ids: set[str] = set()
+        for patch in self.patches:
+            match patch:
+                case (
+                    AddNode(id=node_id)
+                    | UpdateProps(entity="node", id=node_id)
+                    | Delete(entity="node", id=node_id)
+                ):
+                    ids.add(node_id)
+                case AddEdge() | UpdateProps() | Delete():
+                    source, _, target = patch.edge_key
+                    ids.update((source, target))
+        return ids
+
+
+@dataclass
+class _Segment:
+    """A journal segment file and its in-memory index."""
+
+    path: Path
+    seqs: list[int] = field(default_factory=list)
+    versions: list[int] = field(default_factory=list)
+    timestamps: list[float] = field(default_factory=list)
+    offsets: list[int] = field(default_factory=list)
+    entities: dict[str, list[int]] = field(default_factory=dict)
+    size: int = 0
+
+    @property
+    def index_path(self) -> Path:
+        """Return the path of the persisted index."""
+        return self.path.with_suffix(".idx")
+
+    def add(self, record: JournalRecord, offset: int, length: int):
+        """Index a record written at ``offset``."""
+        position = len(self.offsets)
+        self.seqs.append(record.seq)
+        self.versions.append(record.version)
+        self.timestamps.append(record.timestamp)
+        self.offsets.append(offset)
+        for entity_id in record.entity_ids():
+            self.entities.setdefault(entity_id, []).append(position)
+        self.size = offset + length
+
+    def positions(
+        self, entity_id: str | None, since: float | None, until: float | None
+    ) -> list[int]:
+        """Return the record positions matching the filters, in order."""
+        if entity_id is None:
+            lo = 0 if since is None else bisect.bisect_left(self.timestamps, since)
+            hi = (
+                len(self.timestamps)
+                if until is None
+                else bisect.bisect_right(self.timestamps, until)
+            )
+            return list(range(lo, hi))
+        postings = self.entities.get(entity_id, [])
+
+        def timestamp(position: int) -> float:
+            return self.timestamps[position]
+
+        lo = 0 if since is None else bisect.bisect_left(postings, since, key=timestamp)
+        hi = (
+            len(postings)
+            if until is None
+            else bisect.bisect_right(postings, until, key=timestamp)
+        )
+        return postings[lo:hi]
+
+    def save_index(self):
+        """Persist the index next to the segment."""
+        payload = {
+            "seqs": self.seqs,
+            "versions": self.versions,
+            "timestamps": self.timestamps,
+            "offsets": self.offsets,
+            "entities": self.entities,
+            "size": self.size,
+        }
+        tmp = self.index_path.with_suffix(".idx.tmp")
+        tmp.write_text(json.dumps(payload, separators=(",", ":")))
+        tmp.replace(self.index_path)
+
+    @classmethod
+    def load(cls, path: Path) -> "_Segment":
+        """Load a segment from its persisted index, or by scanning the log."""
+        segment = cls(path)
+        index_path = segment.index_path
+        payload = json.loads(index_path.read_text()) if index_path.exists() else {}
+        # An index only describes the log it was written for.
+        if payload.get("size") == path.stat().st_size:
+            segment.seqs = payload["seqs"]
+            segment.versions = payload["versions"]
+            segment.timestamps = payload["timestamps"]
+            segment.offsets = payload["offsets"]
+            segment.entities = payload["entities"]
+            segment.size = payload["size"]
+            return segment
+
+        offset = 0
+        with path.open("rb") as log:
+            for line in log:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = JournalRecord.from_line(line)
+                except ValueError:
+                    logger.warning("Truncating corrupt journal tail in %s", path)
+                    break
+                segment.add(record, offset, len(line))
+                offset += len(line)
+        if path.stat().st_size != segment.size:
+            # Drop a torn write so the next append starts on a record boundary.
+            with path.open("r+b") as log:
+                log.truncate(segment.size)
+        return segment
+
+
+class PatchJournal:
+    """Segmented append-only journal of applied patch batches."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        segment_bytes: int = 4 * 1024 * 1024,
+        fsync_every: int = 64,
+        fsync_interval: float = 1.0,
+    ):
+        """Open the journal, recovering any existing segments.
+
+        Args:
+            directory: Directory holding the segment files
+            segment_bytes: Size after which the active segment is sealed
+            fsync_every: Number of unsynced records that forces an fsync
+            fsync_interval: Seconds after which unsynced records are fsynced
+
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._segment_bytes = segment_bytes
+        self._fsync_every = fsync_every
+        self._fsync_interval = fsync_interval
+
+        self._segments = [
+            _Segment.load(path) for path in sorted(self.directory.glob(_SEGMENT_GLOB))
+        ]
+        self._next_seq = next(
+            (s.seqs[-1] + 1 for s in reversed(self._segments) if s.seqs), 1
+        )
+        self._last_timestamp = next(
+            (s.timestamps[-1] for s in reversed(self._segments) if s.timestamps), 0.0
+        )
+        if not self._segments:
+            self._segments.append(self._new_segment())
+        self._active: IO[bytes] = self._segments[-1].path.open("ab")
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        # Appends come from store listeners, maintenance from a worker thread
+        self._lock = threading.RLock()
+
+    @property
+    def fsync_interval(self) -> float:
+        """Seconds after which unsynced records are fsynced."""
+        return self._fsync_interval
+
+    def append(
+        self,
+        patches: Iterable[Patch | GraphPatch],
+        version: int = 0,
+        timestamp: float | None = None,
+    ) -> JournalRecord:
+        """Append an applied batch to the active segment.
+
+        Args:
+            patches: The patches of the batch, in application order
+            version: The graph version the batch produced
+            timestamp: When the batch was applied, defaults to now
+
+        Returns:
+            JournalRecord: The record that was written
+
+        """
+        # Keep timestamps monotonic so segment indexes stay sorted.
+        timestamp = max(
+            time.time() if timestamp is None else timestamp, self._last_timestamp
+        )
+        record = JournalRecord(
+            seq=self._next_seq,
+            version=version,
+            timestamp=timestamp,
+            patches=[as_graph_patch(p) for p in patches],
+        )
+        with self._lock:
+            self._write(record)
+        return record
+
+    def timeline(
+        self,
+        entity_id: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> list[JournalRecord]:
+        """Return the journaled batches in a time range, oldest first.
+
+        Args:
+            entity_id: Only return batches touching this node
+            since: Inclusive lower timestamp bound
+            until: Inclusive upper timestamp bound
+
+        Returns:
+            list[JournalRecord]: The matching records
+
+        """
+        return list(self._iter_records(entity_id, since, until))
+
+    def versions(self, after: int, until: int | None = None) -> list[JournalRecord]:
+        """Return the batches that produced versions in ``(after, until]``.
+
+        Args:
+            after: Exclusive lower version bound
+            until: Inclusive upper version bound
+
+        Returns:
+            list[JournalRecord]: The matching records, oldest first
+
+        """
+        if not self._active.closed:
+            self._active.flush()
+        records: list[JournalRecord] = []
+        for segment in self._segments:
+            if not segment.versions or segment.versions[-1] <= after:
+                continue
+            if until is not None and segment.versions[0] > until:
+                break
+            lo = bisect.bisect_right(segment.versions, after)
+            hi = (
+                len(segment.versions)
+                if until is None
+                else bisect.bisect_right(segment.versions, until)
+            )
+            records.extend(self._read(segment, range(lo, hi)))
+        return records
+
+    def latest_version(self) -> int:
+        """Return the version produced by the last journaled batch, or 0."""
+        return next((s.versions[-1] for s in reversed(self._segments) if s.versions), 0)
+
+    def checkpoint_version(self) -> int:
+        """Return the version the journal was compacted up to, or 0."""
+        if not self._active.closed:
+            self._active.flush()
+        first = next((s for s in self._segments if s.offsets), None)
+        if first is None:
+            return 0
+        record = next(self._read(first, [0]))
+        return record.version if record.checkpoint else 0
+
+    def node_state(self, node_id: str, at: float | None = None) -> Node | None:
+        """Return a node as it was at time ``at``, or None if it did not exist.
+
+        Only the records indexed under the node are read.
+        """
+        node: Node | None = None
+        for record in self._iter_records(node_id, None, at):
+            for patch in record.patches:
+                match patch:
+                    case AddNode(id=patch_id, type=node_type, properties=properties):
+                        if patch_id != node_id:
+                            continue
+                        base = node.properties if node else {}
+                        node = Node(
+                            id=node_id,
+                            type=node_type,
+                            properties={**base, **properties},
+                        )
+                    case UpdateProps(
+                        entity="node", id=patch_id, properties=properties
+                    ) if (patch_id == node_id and node is not None):
+                        node = Node(
+                            id=node_id,
+                            type=node.type,
+                            properties={**node.properties, **properties},
+                        )
+                    case Delete(entity="node", id=patch_id) if patch_id == node_id:
+                        node = None
+        return node
+
+    def compact(self, before: float) -> int:
+        """Fold sealed segments older than ``before`` into a checkpoint.
+
+        Args:
+            before: Segments whose last record is older than this are folded
+
+        Returns:
+            int: The number of records folded into the checkpoint
+
+        """
+        with self._lock:
+            return self._compact(before)
+
+    def _compact(self, before: float) -> int:
+        # Only a prefix of the journal can be folded without reordering it.
+        folded: list[_Segment] = []
+        for segment in self._segments[:-1]:
+            if not segment.timestamps or segment.timestamps[-1] >= before:
+                break
+            folded.append(segment)
+        records = sum(len(s.offsets) for s in folded)
+        if records <= 1:
+            return 0
+
+        state = InMemoryGraphStore()
+        last: JournalRecord | None = None
+        for segment in folded:
+            for last in self._read(segment, range(len(segment.offsets))):
+                state.upsert(last.patches)
+        checkpoint = JournalRecord(
+            seq=last.seq,
+            version=last.version,
+            timestamp=last.timestamp,
+            patches=[
+                AddNode(id=n.id, type=n.type, properties=n.properties)
+                for n in state.nodes()
+            ]
+            + [
+                AddEdge(
+                    source=e.source,
+                    target=e.target,
+                    type=e.type,
+                    properties=e.properties,
+                )
+                for e in state.edges()
+            ],
+            checkpoint=True,
+        )
+
+        # Write the checkpoint under a temporary name, then swap it in.
+        compacted = _Segment(folded[0].path)
+        tmp_path = compacted.path.with_suffix(".compact")
+        line = checkpoint.to_line()
+        with tmp_path.open("wb") as log:
+            log.write(line)
+            log.flush()
+            os.fsync(log.fileno())
+        folded[0].index_path.unlink(missing_ok=True)
+        tmp_path.replace(compacted.path)
+        for segment in folded[1:]:
+            segment.path.unlink()
+            segment.index_path.unlink(missing_ok=True)
+        compacted.add(checkpoint, 0, len(line))
+        compacted.save_index()
+
+        self._segments[: len(folded)] = [compacted]
+        return records
+
+    def sync(self):
+        """Flush and fsync the active segment."""
+        with self._lock:
+            self._active.flush()
+            os.fsync(self._active.fileno())
+            self._pending = 0
+            self._last_sync = time.monotonic()
+
+    def sync_due(self) -> bool:
+        """Fsync pending records once ``fsync_interval`` has passed.
+
+        Returns:
+            bool: Whether the active segment was synced
+
+        """
+        with self._lock:
+            if self._active.closed or not self._pending:
+                return False
+            if time.monotonic() - self._last_sync < self._fsync_interval:
+                return False
+            self.sync()
+            return True
+
+    def close(self):
+        """Sync and close the active segment."""
+        with self._lock:
+            if not self._active.closed:
+                self.sync()
+                self._active.close()
+
+    def stats(self) -> dict[str, Any]:
+        """Return journal statistics."""
+        return {
+            "segments": len(self._segments),
+            "records": sum(len(s.offsets) for s in self._segments),
+            "bytes": sum(s.size for s in self._segments),
+            "next_seq": self._next_seq,
+            "pending_fsync": self._pending,
+        }
+
+    def _new_segment(self) -> _Segment:
+        return _Segment(self.directory / f"segment-{self._next_seq:020d}.log")
+
+    def _write(self, record: JournalRecord):
+        segment = self._segments[-1]
+        line = record.to_line()
+        self._active.write(line)
+        segment.add(record, segment.size, len(line))
+        self._next_seq = record.seq + 1
+        self._last_timestamp = record.timestamp
+
+        self._pending += 1
+        if (
+            self._pending >= self._fsync_every
+            or time.monotonic() - self._last_sync >= self._fsync_interval
+        ):
+            self.sync()
+        if segment.size >= self._segment_bytes:
+            self._roll()
+
+    def _roll(self):
+        """Seal the active segment and start a new one."""
+        self.sync()
+        self._active.close()
+        self._segments[-1].save_index()
+        segment = self._new_segment()
+        self._segments.append(segment)
+        self._active = segment.path.open("ab")
+
+    def _iter_records(
+        self, entity_id: str | None, since: float | None, until: float | None
+    ) -> Iterator[JournalRecord]:
+        with self._lock:
+            if not self._active.closed:
+                self._active.flush()
+        for segment in self._segments:
+            if not segment.timestamps:
+                continue
+            if since is not None and segment.timestamps[-1] < since:
+                continue
+            if until is not None and segment.timestamps[0] > until:
+                break
+            yield from self._read(segment, segment.positions(entity_id, since, until))
+
+    @staticmethod
+    def _read(segment: _Segment, positions: Iterable[int]) -> Iterator[JournalRecord]:
+        with segment.path.open("rb") as log:
+            for position in positions:
+                log.seek(segment.offsets[position])
+                yield JournalRecord.from_line(log.readline())
+
+
+async def maintain_journal(
+    journal: PatchJournal, *, compact_interval: float, retention: float
+):
+    """Sync idle records and compact old segments until cancelled.
+
+    Args:
+        journal: The journal to maintain
+        compact_interval: Seconds between two compactions
+        retention: Seconds of history kept at full granularity
+
+    """
+    next_compaction = time.monotonic() + compact_interval
+    while True:
+        await asyncio.sleep(journal.fsync_interval)
+        try:
+            await asyncio.to_thread(journal.sync_due)
+            if time.monotonic() >= next_compaction:
+                next_compaction = time.monotonic() + compact_interval
+                folded = await asyncio.to_thread(
+                    journal.compact, time.time() - retention
+                )
+                if folded:
+                    logger.info("Compacted %s journal records", folded)
+        except Exception:
+            logger.exception("Journal maintenance failed")
+
+
+# Global patch journal instance
+_patch_journal: PatchJournal | None = None
+
+
+def get_patch_journal(store: InMemoryGraphStore | None = None) -> PatchJournal:
+    """Get the global patch journal, recording every batch the store applies."""
+    global _patch_journal  # noqa: PLW0603
+    if _patch_journal is None:
+        store = store or get_graph_store()
+        settings = get_settings()
+        _patch_journal = PatchJournal(
+            settings.system.journal_path,
+            fsync_interval=settings.runtime.journal_fsync_interval,
+        )
+        store.subscribe(lambda patches: _patch_journal.append(patches, store.version))
+    return _patch_journal
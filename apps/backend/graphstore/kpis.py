@@ -0,0 +1,255 @@
+"""Materialized project KPIs over Task/Issue nodes.
+
+Each work item contributes to the aggregate of its ``Progetto`` and, when it
+belongs to one, of its Epic: a total, counts by status and priority, and the
+due dates of the items still open. The materializer remembers what every
+node contributed, so an applied patch only subtracts the old contribution and
+adds the new one instead of rescanning the project.
+
+Reads are O(1) apart from the overdue count, which is a bisection over the
+sorted open due dates since "overdue" moves with the clock.
+"""
+
+import bisect
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from typing import Any, NamedTuple
+
+from models.domain import Priority, TaskStatus
+from models.graph import (
+    AddNode,
+    Delete,
+    GraphPatch,
+    Node,
+    Patch,
+    UpdateProps,
+    as_graph_patch,
+)
+
+from .memory import InMemoryGraphStore, get_graph_store
+
+# Node types counted as work items.
+WORK_ITEM_TYPES = frozenset({"Task", "Issue"})
+
+# Node properties the aggregates depend on; only these are remembered per node.
+KPI_PROPERTIES = ("progetto_id", "epic_id", "status", "priority", "due_date")
+
+
+class _Contribution(NamedTuple):
+    """What a single work item adds to its aggregates."""
+
+    progetto_id: str | None
+    epic_id: str | None
+    status: str
+    priority: str
+    due_date: date | None
+
+
+@dataclass
+class _Aggregate:
+    """Running KPI totals for a project or an epic."""
+
+    total: int = 0
+    by_status: Counter[str] = field(default_factory=Counter)
+    by_priority: Counter[str] = field(default_factory=Counter)
+    open_due_dates: list[date] = field(default_factory=list)
+
+    def add(self, item: _Contribution):
+        """Count a work item in."""
+        self.total += 1
+        self.by_status[item.status] += 1
+        self.by_priority[item.priority] += 1
+        if item.due_date is not None and item.status != TaskStatus.COMPLETED.value:
+            bisect.insort(self.open_due_dates, item.due_date)
+
+    def remove(self, item: _Contribution):
+        """Count a work item out."""
+        self.total -= 1
+        self.by_status[item.status] -= 1
+        if not self.by_status[item.status]:
+            del self.by_status[item.status]
+        self.by_priority[item.priority] -= 1
+        if not self.by_priority[item.priority]:
+            del self.by_priority[item.priority]
+        if item.due_date is not None and item.status != TaskStatus.COMPLETED.value:
+            del self.open_due_dates[
+                bisect.bisect_left(self.open_due_dates, item.due_date)
+            ]
+
+    def snapshot(self, today: date) -> dict[str, Any]:
+        """Return the KPIs as a JSON-serializable dict."""
+        completed = self.by_status.get(TaskStatus.COMPLETED.value, 0)
+        return {
+            "total": self.total,
+            "completed": completed,
+            "progress": completed / self.total if self.total else 0.0,
+            "by_status": dict(self.by_status),
+            "by_priority": dict(self.by_priority),
+            "overdue": bisect.bisect_left(self.open_due_dates, today),
+        }
+
+
+def _enum_value(value: Any, default: str) -> str:
+    """Normalize an enum member or raw string property."""
+    if value is None:
+        return default
+    return str(getattr(value, "value", value))
+
+
+def _parse_due_date(value: Any) -> date | None:
+    """Read a ``due_date`` property, ignoring values that are not dates."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            return None
+    return None
+
+
+class KPIMaterializer:
+    """Incrementally maintained KPI aggregates per project and per epic."""
+
+    def __init__(self):
+        """Initialize empty aggregates."""
+        self._types: dict[str, str] = {}
+        self._properties: dict[str, dict[str, Any]] = {}
+        self._contributions: dict[str, _Contribution] = {}
+        self._projects: dict[str, _Aggregate] = {}
+        self._epics: dict[str, _Aggregate] = {}
+        # Project id -> epic id -> number of the project's items in that epic.
+        self._project_epics: dict[str, Counter[str]] = {}
+
+    @classmethod
+    def from_nodes(cls, nodes: Iterable[Node]) -> "KPIMaterializer":
+        """Build the aggregates for an existing set of nodes."""
+        materializer = cls()
+        for node in nodes:
+            materializer._set_node(node.id, node.type, dict(node.properties))
+        return materializer
+
+    def apply(self, patches: Iterable[Patch | GraphPatch]):
+        """Update the aggregates with an applied batch of patches."""
+        for patch in patches:
+            match as_graph_patch(patch):
+                case AddNode(id=node_id, type=node_type, properties=properties):
+                    merged = {**self._properties.get(node_id, {}), **properties}
+                    self._set_node(node_id, node_type, merged)
+                case UpdateProps(entity="node", id=node_id, properties=properties) if (
+                    node_id in self._types
+                ):
+                    merged = {**self._properties[node_id], **properties}
+                    self._set_node(node_id, self._types[node_id], merged)
+                case Delete(entity="node", id=node_id):
+                    self._drop_node(node_id)
+
+    def project(self, project_id: str, today: date | None = None) -> dict[str, Any]:
+        """Return the KPIs of a project and of each of its epics."""
+        today = today or datetime.now(UTC).date()
+        aggregate = self._projects.get(project_id) or _Aggregate()
+        return {
+            "project_id": project_id,
+            **aggregate.snapshot(today),
+            "epics": {
+                epic_id: self._epics[epic_id].snapshot(today)
+                for epic_id in sorted(self._project_epics.get(project_id, ()))
+            },
+        }
+
+    def epic(self, epic_id: str, today: date | None = None) -> dict[str, Any]:
+        """Return the KPIs of a single epic."""
+        today = today or datetime.now(UTC).date()
+        aggregate = self._epics.get(epic_id) or _Aggregate()
+        return {"epic_id": epic_id, **aggregate.snapshot(today)}
+
+    def projects(self) -> list[str]:
+        """Return the ids of the projects with at least one work item."""
+        return list(self._projects)
+
+    def snapshot(self, today: date | None = None) -> dict[str, Any]:
+        """Return every project and epic aggregate."""
+        today = today or datetime.now(UTC).date()
+        return {
+            "projects": {p: a.snapshot(today) for p, a in self._projects.items()},
+            "epics": {e: a.snapshot(today) for e, a in self._epics.items()},
+        }
+
+    def rebuild(self, nodes: Iterable[Node]):
+        """Discard the aggregates and recompute them from scratch."""
+        fresh = KPIMaterializer.from_nodes(nodes)
+        self.__dict__.update(fresh.__dict__)
+
+    def verify(self, nodes: Iterable[Node]) -> bool:
+        """Check the incremental aggregates against a from-scratch rebuild."""
+        today = datetime.now(UTC).date()
+        return KPIMaterializer.from_nodes(nodes).snapshot(today) == self.snapshot(today)
+
+    def _set_node(self, node_id: str, node_type: str, properties: dict[str, Any]):
+        self._drop_node(node_id)
+        self._types[node_id] = node_type
+        self._properties[node_id] = properties = {
+            key: properties[key] for key in KPI_PROPERTIES if key in properties
+        }
+        if node_type not in WORK_ITEM_TYPES:
+            return
+        item = _Contribution(
+            progetto_id=properties.get("progetto_id"),
+            epic_id=properties.get("epic_id"),
+            status=_enum_value(properties.get("status"), TaskStatus.PENDING.value),
+            priority=_enum_value(properties.get("priority"), Priority.MEDIUM.value),
+            due_date=_parse_due_date(properties.get("due_date")),
+        )
+        self._contributions[node_id] = item
+        for aggregates, key in (
+            (self._projects, item.progetto_id),
+            (self._epics, item.epic_id),
+        ):
+            if key is not None:
+                aggregates.setdefault(key, _Aggregate()).add(item)
+        if item.progetto_id is not None and item.epic_id is not None:
+            self._project_epics.setdefault(item.progetto_id, Counter())[
+                item.epic_id
+            ] += 1
+
+    def _drop_node(self, node_id: str):
+        self._types.pop(node_id, None)
+        self._properties.pop(node_id, None)
+        item = self._contributions.pop(node_id, None)
+        if item is None:
+            return
+        for aggregates, key in (
+            (self._projects, item.progetto_id),
+            (self._epics, item.epic_id),
+        ):
+            if key is None:
+                continue
+            aggregate = aggregates[key]
+            aggregate.remove(item)
+            if not aggregate.total:
+                del aggregates[key]
+        if item.progetto_id is not None and item.epic_id is not None:
+            epics = self._project_epics[item.progetto_id]
+            epics[item.epic_id] -= 1
+            if not epics[item.epic_id]:
+                del epics[item.epic_id]
+            if not epics:
+                del self._project_epics[item.progetto_id]
+
+
+# Global KPI materializer instance
+_kpi_materializer: KPIMaterializer | None = None
+
+
+def get_kpi_materializer(store: InMemoryGraphStore | None = None) -> KPIMaterializer:
+    """Get the global KPI materializer, kept in sync with the graph store."""
+    global _kpi_materializer  # noqa: PLW0603
+    if _kpi_materializer is None:
+        store = store or get_graph_store()
+        _kpi_materializer = KPIMaterializer.from_nodes(store.nodes())
+        store.subscribe(_kpi_materializer.apply)
+    return _kpi_materializer
@@ -0,0 +1,272 @@
+"""In-memory implementation of the graph store."""
+
+import logging
+import threading
+from collections.abc import Callable
+from typing import Any, Literal
+
+from models.graph import (
+    AddEdge,
+    AddNode,
+    Delete,
+    Edge,
+    GraphPatch,
+    Node,
+    Patch,
+    UpdateProps,
+    as_graph_patch,
+)
+
+from .store import GraphStore
+
+EdgeKey = tuple[str, str, str]
+PatchListener = Callable[[list[GraphPatch]], None]
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryGraphStore(GraphStore):
+    """Process-local GraphStore used until a database adapter is configured.
+
+    Nodes are keyed by id and edges by ``(source, type, target)``, which makes
+    every patch operation idempotent. The store keeps a version counter that
+    increases with every batch that applies at least one patch, and remembers the
+    version at which each node was last written.
+
+    Derived views (analytics, indexes, journals) subscribe to the store and
+    receive every applied batch as typed patches, so they can stay up to date
+    incrementally instead of rescanning the graph.
+
+    Batches are applied and handed to the listeners under ``lock``, which the
+    listing methods also hold. Code reading the store from another thread
+    holds it across several reads to see them at one version.
+    """
+
+    def __init__(self):
+        """Initialize an empty graph."""
+        self._nodes: dict[str, Node] = {}
+        self._edges: dict[EdgeKey, Edge] = {}
+        self._adjacency: dict[str, set[EdgeKey]] = {}
+        self._node_versions: dict[str, int] = {}
+        self._project_versions: dict[str | None, int] = {}
+        self._version = 0
+        self._listeners: list[PatchListener] = []
+        self.lock = threading.RLock()
+
+    def subscribe(self, listener: PatchListener):
+        """Register a callback invoked with the typed patches of each batch."""
+        self._listeners.append(listener)
+
+    def upsert(self, patches: list[Patch | GraphPatch]) -> dict[str, Any]:
+        """Apply a list of patch operations to the graph.
+
+        Args:
+            patches: The legacy or typed patches to apply, in order.
+
+        Returns:
+            A dictionary with the number of applied patches and any errors.
+
+        """
+        applied: list[GraphPatch] = []
+        errors: list[str] = []
+        with self.lock:
+            self._version += 1
+            for index, patch in enumerate(patches):
+                try:
+                    typed = as_graph_patch(patch)
+                    self._apply(typed)
+                    applied.append(typed)
+                except (KeyError, ValueError) as e:
+                    errors.append(f"patch {index}: {e}")
+            if not applied:
+                self._version -= 1
+            else:
+                self._notify(applied)
+        return {"success": not errors, "applied": len(applied), "errors": errors}
+
+    def replay(self, patches: list[GraphPatch], version: int):
+        """Re-apply a recorded batch at the version it produced.
+
+        Used to recover the store from its snapshots and journal on startup;
+        listeners are not notified, since the batch is already recorded.
+
+        Args:
+            patches: The typed patches of the batch, in order
+            version: The graph version the batch produced
+
+        """
+        with self.lock:
+            self._version = version
+            for patch in patches:
+                self._apply(patch)
+
+    def query_graph(
+        self, query: str, engine: Literal["cypher", "ngql"] = "cypher"
+    ) -> list[dict[str, Any]]:
+        """Raw queries are not supported by the in-memory store."""
+        raise NotImplementedError(
+            f"The in-memory graph store cannot execute {engine} queries"
+        )
+
+    def health(self) -> dict[str, Any]:
+        """Return the health of the in-memory store."""
+        with self.lock:
+            return {
+                "status": "healthy",
+                "backend": "memory",
+                "nodes": len(self._nodes),
+                "edges": len(self._edges),
+            }
+
+    def get_node(self, node_id: str) -> Node | None:
+        """Return the node with the given id, if present."""
+        return self._nodes.get(node_id)
+
+    @property
+    def version(self) -> int:
+        """Return the current graph version."""
+        return self._version
+
+    def node_version(self, node_id: str) -> int:
+        """Return the graph version at which a node was last written."""
+        return self._node_versions.get(node_id, 0)
+
+    def project_version(self, progetto_id: str | None) -> int:
+        """Return the graph version at which a node of a project last changed.
+
+        Nodes without a ``progetto_id`` count as the ``None`` project.
+        """
+        return self._project_versions.get(progetto_id, 0)
+
+    def project_versions(self) -> dict[str | None, int]:
+        """Return the version of every project, read at a single graph version."""
+        with self.lock:
+            return dict(self._project_versions)
+
+    def neighbors(self, node_id: str) -> set[str]:
+        """Return the ids of the nodes sharing an edge with the given node."""
+        with self.lock:
+            return {
+                key[2] if key[0] == node_id else key[0]
+                for key in self._adjacency.get(node_id, ())
+            }
+
+    def incident_edges(self, node_id: str) -> list[Edge]:
+        """Return the edges starting or ending at the given node."""
+        with self.lock:
+            return [self._edges[key] for key in self._adjacency.get(node_id, ())]
+
+    def nodes(
+        self, node_type: str | None = None, progetto_id: str | None = None
+    ) -> list[Node]:
+        """Return the nodes matching the optional type and project filters."""
+        with self.lock:
+            return [
+                node
+                for node in self._nodes.values()
+                if (node_type is None or node.type == node_type)
+                and (
+                    progetto_id is None
+                    or node.properties.get("progetto_id") == progetto_id
+                    or node.id == progetto_id
+                )
+            ]
+
+    def edges(self, edge_type: str | None = None) -> list[Edge]:
+        """Return the edges matching the optional type filter."""
+        with self.lock:
+            return [
+                edge
+                for edge in self._edges.values()
+                if edge_type is None or edge.type == edge_type
+            ]
+
+    def _notify(self, patches: list[GraphPatch]):
+        """Hand an applied batch to the subscribed listeners."""
+        for listener in self._listeners:
+            try:
+                listener(patches)
+            except Exception:
+                logger.exception("Graph store listener %r failed", listener)
+
+    def _apply(self, patch: GraphPatch):
+        """Apply a single typed patch operation."""
+        match patch:
+            case AddNode(id=node_id, type=node_type, properties=properties):
+                existing = self._nodes.get(node_id)
+                if existing is not None:
+                    properties = {**existing.properties, **properties}
+                    self._touch(existing)
+                self._nodes[node_id] = Node(
+                    id=node_id, type=node_type, properties=properties
+                )
+                self._touch(self._nodes[node_id])
+            case AddEdge() as add:
+                self._put_edge(add.edge_key, add.properties, must_exist=False)
+            case UpdateProps(entity="node", id=node_id, properties=properties):
+                existing = self._nodes.get(node_id)
+                if existing is None:
+                    raise KeyError(f"node {node_id} does not exist")
+                self._nodes[node_id] = Node(
+                    id=node_id,
+                    type=existing.type,
+                    properties={**existing.properties, **properties},
+                )
+                self._touch(existing)
+                self._touch(self._nodes[node_id])
+            case UpdateProps() as update:
+                self._put_edge(update.edge_key, update.properties, must_exist=True)
+            case Delete(entity="node", id=node_id):
+                if (removed := self._nodes.pop(node_id, None)) is not None:
+                    self._touch(removed)
+                self._node_versions.pop(node_id, None)
+                for key in list(self._adjacency.get(node_id, ())):
+                    self._remove_edge(key)
+            case Delete() as delete:
+                self._remove_edge(delete.edge_key)
+
+    def _touch(self, node: Node):
+        """Record that a node and its project changed at the current version."""
+        self._node_versions[node.id] = self._version
+        self._project_versions[node.properties.get("progetto_id")] = self._version
+
+    def _put_edge(
+        self, key: EdgeKey, properties: dict[str, Any] | None, must_exist: bool
+    ):
+        """Create an edge or merge properties into it."""
+        for endpoint in (key[0], key[2]):
+            if endpoint not in self._nodes:
+                raise KeyError(f"node {endpoint} does not exist")
+        existing = self._edges.get(key)
+        if must_exist and existing is None:
+            raise KeyError(f"edge {key} does not exist")
+        merged = dict(existing.properties or {}) if existing else {}
+        merged.update(properties or {})
+        self._edges[key] = Edge(
+            source=key[0], target=key[2], type=key[1], properties=merged
+        )
+        self._adjacency.setdefault(key[0], set()).add(key)
+        self._adjacency.setdefault(key[2], set()).add(key)
+
+    def _remove_edge(self, key: EdgeKey):
+        """Remove an edge and its adjacency entries, if present."""
+        if self._edges.pop(key, None) is None:
+            return
+        for endpoint in (key[0], key[2]):
+            incident = self._adjacency.get(endpoint)
+            if incident is not None:
+                incident.discard(key)
+                if not incident:
+                    del self._adjacency[endpoint]
+
+
+# Global graph store instance
+_graph_store: InMemoryGraphStore | None = None
+
+
+def get_graph_store() -> InMemoryGraphStore:
+    """Get the global graph store instance."""
+    global _graph_store  # noqa: PLW0603
+    if _graph_store is None:
+        _graph_store = InMemoryGraphStore()
+    return _graph_store
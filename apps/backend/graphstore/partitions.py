@@ -0,0 +1,113 @@
+"""Project partitions of the graph store for write concurrency control.
+
+Every ``Progetto`` is a partition with its own FIFO write lock. The agent
+resolves entities against the store without any lock, keeping the
+``InMemoryGraphStore.project_version`` of every project it read. Its upsert
+then holds its project's lock, and if a batch changed one of those projects
+in the meantime it diffs again in a worker thread before writing. So two
+sessions on the same project cannot both decide to create the same entity,
+while writes to other projects neither wait for it nor make it re-diff.
+Writes without a project share the ``None`` partition.
+
+The partitions are concurrency domains over a single store: cross-project
+views (KPIs, analytics, indexes, the journal) keep subscribing to that one
+store, and the store lock is held only for the version check and the batch
+itself. A partition is dropped as soon as nobody holds or waits for it, so
+the registry only grows with the number of projects being written to.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from models.graph import GraphPatch, Patch
+
+from .memory import InMemoryGraphStore, get_graph_store
+
+
+class ProjectPartition:
+    """The write lock and queue of a single project."""
+
+    __slots__ = ("lock", "project_id", "waiting")
+
+    def __init__(self, project_id: str | None):
+        """Initialize an idle partition."""
+        self.project_id = project_id
+        self.lock = asyncio.Lock()
+        self.waiting = 0
+
+
+class ProjectPartitions:
+    """Routes writes to per-project partitions of a graph store."""
+
+    def __init__(self, store: InMemoryGraphStore):
+        """Initialize the registry over a store.
+
+        Args:
+            store: The store the partitions write to
+
+        """
+        self._store = store
+        self._partitions: dict[str | None, ProjectPartition] = {}
+        self._writes = 0
+
+    @asynccontextmanager
+    async def write(self, project_id: str | None) -> AsyncIterator[InMemoryGraphStore]:
+        """Hold the write lock of a project.
+
+        Writers of the same project are admitted one at a time, in arrival
+        order; writers of other projects proceed concurrently.
+
+        Args:
+            project_id: The project to write to, or None for unscoped writes
+
+        Yields:
+            InMemoryGraphStore: The store to read and write under the lock
+
+        """
+        partition = self._partitions.get(project_id)
+        if partition is None:
+            partition = self._partitions[project_id] = ProjectPartition(project_id)
+        partition.waiting += 1
+        try:
+            await partition.lock.acquire()
+        finally:
+            # Also reached when cancelled while queued.
+            partition.waiting -= 1
+        try:
+            yield self._store
+        finally:
+            self._writes += 1
+            partition.lock.release()
+            if not partition.waiting and not partition.lock.locked():
+                self._partitions.pop(project_id, None)
+
+    async def upsert(
+        self, project_id: str | None, patches: list[Patch | GraphPatch]
+    ) -> dict[str, Any]:
+        """Apply patches under the write lock of a project."""
+        async with self.write(project_id) as store:
+            return store.upsert(patches)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the active partitions and the number of writes."""
+        return {
+            "active": {
+                str(p.project_id): {"locked": p.lock.locked(), "waiting": p.waiting}
+                for p in self._partitions.values()
+            },
+            "writes": self._writes,
+        }
+
+
+# Global project partitions instance
+_project_partitions: ProjectPartitions | None = None
+
+
+def get_project_partitions() -> ProjectPartitions:
+    """Get the global project partitions over the graph store."""
+    global _project_partitions  # noqa: PLW0603
+    if _project_partitions is None:
+        _project_partitions = ProjectPartitions(get_graph_store())
+    return _project_partitions
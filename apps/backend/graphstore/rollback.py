@@ -0,0 +1,386 @@
+"""Point-in-time rollback from graph snapshots and the patch journal.
+
+The graph state at any journaled version is rebuilt by loading the nearest
+snapshot at or before it and replaying only the journal tail between the two.
+Rolling back diffs that state against the live graph and applies the
+resulting inverse patches through ``GraphStore.upsert`` as a single batch, so
+the rollback itself is journaled like any other change.
+
+Snapshots are written on a dedicated writer thread: the store listener only
+copies the node and edge lists, which the store replaces copy-on-write, so
+serializing a large graph never runs under the store lock or on the event
+loop.
+"""
+
+import bisect
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from config.config import get_settings
+from models.graph import AddEdge, AddNode, Delete, Edge, GraphPatch, Node
+
+from .journal import PatchJournal, get_patch_journal
+from .memory import EdgeKey, InMemoryGraphStore, get_graph_store
+
+logger = logging.getLogger(__name__)
+
+
+class RollbackUnavailableError(Exception):
+    """Raised when the history needed to reach a version is gone."""
+
+
+@dataclass
+class GraphSnapshot:
+    """The full graph state at a version."""
+
+    version: int
+    timestamp: float
+    nodes: list[Node]
+    edges: list[Edge]
+
+    def patches(self) -> list[GraphPatch]:
+        """Return the batch that recreates the snapshot in an empty store."""
+        return [
+            AddNode(id=n.id, type=n.type, properties=n.properties) for n in self.nodes
+        ] + [
+            AddEdge(
+                source=e.source,
+                target=e.target,
+                type=e.type,
+                properties=e.properties,
+            )
+            for e in self.edges
+        ]
+
+    def to_store(self) -> InMemoryGraphStore:
+        """Load the snapshot into a scratch graph store."""
+        store = InMemoryGraphStore()
+        store.upsert(self.patches())
+        return store
+
+
+class SnapshotStore:
+    """Directory of periodic graph snapshots, one JSON file per version."""
+
+    def __init__(self, directory: str | Path, *, every: int = 100, keep: int = 10):
+        """Open the snapshot directory.
+
+        Args:
+            directory: Directory holding the snapshot files
+            every: Number of graph versions between automatic snapshots
+            keep: Number of most recent snapshots to retain
+
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._every = every
+        self._keep = keep
+        self._versions = sorted(
+            int(path.stem.removeprefix("snapshot-"))
+            for path in self.directory.glob("snapshot-*.json")
+        )
+        self._lock = threading.Lock()
+        self._scheduled = self._versions[-1] if self._versions else 0
+        self._pending: Future[GraphSnapshot] | None = None
+        self._writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="graph-snapshots"
+        )
+
+    @property
+    def versions(self) -> list[int]:
+        """Return the versions with a snapshot, oldest first."""
+        self.flush()
+        with self._lock:
+            return list(self._versions)
+
+    def maybe_take(self, store: InMemoryGraphStore) -> Future[GraphSnapshot] | None:
+        """Snapshot the store if ``every`` versions passed since the last one.
+
+        Only the node and edge lists are captured here; the snapshot is
+        written in the background.
+
+        Returns:
+            Future | None: The pending write, or None if no snapshot is due
+
+        """
+        with self._lock:
+            if store.version - self._scheduled < self._every:
+                return None
+            return self._submit(store)
+
+    def take(self, store: InMemoryGraphStore) -> GraphSnapshot:
+        """Write a snapshot of the store at its current version and wait for it."""
+        # Listeners run under the store lock; take it first here as well.
+        with store.lock, self._lock:
+            future = self._submit(store)
+        return future.result()
+
+    def flush(self) -> None:
+        """Wait until every snapshot scheduled so far is on disk."""
+        with self._lock:
+            pending = self._pending
+        if pending is not None:
+            # The writer is a single thread, so earlier writes are done too.
+            wait([pending])
+
+    def _submit(self, store: InMemoryGraphStore) -> Future[GraphSnapshot]:
+        """Capture the store and queue its snapshot write; hold ``_lock``."""
+        snapshot = GraphSnapshot(
+            version=store.version,
+            timestamp=time.time(),
+            nodes=store.nodes(),
+            edges=store.edges(),
+        )
+        self._scheduled = max(self._scheduled, snapshot.version)
+        self._pending = self._writer.submit(self._write, snapshot)
+        self._pending.add_done_callback(_log_failure)
+        return self._pending
+
+    def _write(self, snapshot: GraphSnapshot) -> GraphSnapshot:
+        """Serialize a captured snapshot to disk and apply retention."""
+        payload = {
+            "version": snapshot.version,
+            "ts": snapshot.timestamp,
+            "nodes": [n.model_dump(mode="json") for n in snapshot.nodes],
+            "edges": [e.model_dump(mode="json") for e in snapshot.edges],
+        }
+        path = self._path(snapshot.version)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, separators=(",", ":")))
+        tmp.replace(path)
+
+        with self._lock:
+            if snapshot.version not in self._versions:
+                bisect.insort(self._versions, snapshot.version)
+            while len(self._versions) > self._keep:
+                self._path(self._versions.pop(0)).unlink(missing_ok=True)
+        return snapshot
+
+    def nearest(self, version: int) -> GraphSnapshot | None:
+        """Load the latest snapshot taken at or before ``version``."""
+        versions = self.versions
+        index = bisect.bisect_right(versions, version)
+        if not index:
+            return None
+        payload = json.loads(self._path(versions[index - 1]).read_text())
+        return GraphSnapshot(
+            version=payload["version"],
+            timestamp=payload["ts"],
+            nodes=Node.validate_many(payload["nodes"]),
+            edges=Edge.validate_many(payload["edges"]),
+        )
+
+    def _path(self, version: int) -> Path:
+        return self.directory / f"snapshot-{version:020d}.json"
+
+
+def _log_failure(future: Future[GraphSnapshot]) -> None:
+    """Log a background snapshot write that failed."""
+    if not future.cancelled() and (error := future.exception()) is not None:
+        logger.error("Failed to write graph snapshot", exc_info=error)
+
+
+class RollbackManager:
+    """Rebuild past graph versions and roll the live graph back to them."""
+
+    def __init__(
+        self,
+        store: InMemoryGraphStore,
+        journal: PatchJournal,
+        snapshots: SnapshotStore,
+    ):
+        """Initialize the manager over a store and its history.
+
+        Args:
+            store: The live graph store
+            journal: The journal the store's batches are recorded in
+            snapshots: The periodic snapshots of the store
+
+        """
+        self._store = store
+        self._journal = journal
+        self._snapshots = snapshots
+
+    def recover(self) -> int:
+        """Load the latest recorded state into the empty live store.
+
+        The store starts empty at version 0 in every process while its
+        history stays on disk, so this runs before the store is served or any
+        derived view is built; it replays the latest snapshot and the journal
+        tail after it, and versions then continue where the history ends.
+
+        A store that already holds changes is left as is.
+
+        Returns:
+            int: The version of the live store
+
+        """
+        if self._store.version:
+            return self._store.version
+        snapshots = self._snapshots.versions
+        latest = max(self._journal.latest_version(), snapshots[-1] if snapshots else 0)
+        if not latest:
+            return 0
+        snapshot, base = self._base(latest)
+        if snapshot is not None:
+            self._store.replay(snapshot.patches(), snapshot.version)
+        for record in self._journal.versions(base, latest):
+            self._store.replay(record.patches, record.version)
+        return self._store.version
+
+    def flush(self) -> None:
+        """Wait until the snapshots scheduled so far are on disk."""
+        self._snapshots.flush()
+
+    def state_at(self, version: int) -> InMemoryGraphStore:
+        """Rebuild the graph as it was at ``version``.
+
+        Args:
+            version: The graph version to rebuild
+
+        Returns:
+            InMemoryGraphStore: A scratch store holding that version's graph
+
+        Raises:
+            ValueError: If the version is ahead of the live graph
+            RollbackUnavailableError: If compaction removed the history needed
+
+        """
+        if not 0 <= version <= self._store.version:
+            raise ValueError(f"version {version} is outside 0..{self._store.version}")
+        snapshot, base = self._base(version)
+        state = snapshot.to_store() if snapshot else InMemoryGraphStore()
+        for record in self._journal.versions(base, version):
+            state.upsert(record.patches)
+        return state
+
+    def _base(self, version: int) -> tuple[GraphSnapshot | None, int]:
+        """Return the snapshot to rebuild ``version`` from and its version."""
+        snapshot = self._snapshots.nearest(version)
+        base = snapshot.version if snapshot else 0
+        compacted = self._journal.checkpoint_version()
+        if base < compacted:
+            if version < compacted:
+                raise RollbackUnavailableError(
+                    f"history before version {compacted} was compacted"
+                )
+            # The checkpoint holds the full state; replay it from scratch.
+            return None, 0
+        return snapshot, base
+
+    def inverse_patches(self, version: int) -> list[GraphPatch]:
+        """Compute the batch that turns the live graph into ``version``."""
+        return _diff(self._store, self.state_at(version))
+
+    def rollback(self, version: int) -> dict[str, Any]:
+        """Roll the live graph back to ``version`` in a single batch.
+
+        This loads snapshots and replays the journal, so async callers run it
+        in a worker thread. The past state is rebuilt without the store lock;
+        the diff against the live graph and its upsert hold the lock, so no
+        concurrent write lands between them.
+
+        Args:
+            version: The graph version to return to
+
+        Returns:
+            dict: The upsert result, with the target and resulting versions
+
+        """
+        target = self.state_at(version)
+        with self._store.lock:
+            patches = _diff(self._store, target)
+            result = (
+                self._store.upsert(patches)
+                if patches
+                else {"success": True, "applied": 0, "errors": []}
+            )
+            return {
+                **result,
+                "target_version": version,
+                "version": self._store.version,
+            }
+
+
+def _diff(current: InMemoryGraphStore, target: InMemoryGraphStore) -> list[GraphPatch]:
+    """Return the patches that make ``current`` equal to ``target``.
+
+    Patches only merge properties, so a node or edge that lost properties is
+    deleted and recreated; a recreated node also gets its edges back.
+    """
+    node_deletes: list[GraphPatch] = []
+    edge_deletes: list[GraphPatch] = []
+    adds: list[GraphPatch] = []
+
+    target_nodes = {n.id: n for n in target.nodes()}
+    recreated: set[str] = set()
+    for node in current.nodes():
+        wanted = target_nodes.get(node.id)
+        if wanted is None or not node.properties.keys() <= wanted.properties.keys():
+            node_deletes.append(Delete(id=node.id))
+            recreated.add(node.id)
+    for node_id, wanted in target_nodes.items():
+        existing = current.get_node(node_id)
+        if (
+            node_id in recreated
+            or existing is None
+            or existing.type != wanted.type
+            or existing.properties != wanted.properties
+        ):
+            adds.append(
+                AddNode(id=node_id, type=wanted.type, properties=wanted.properties)
+            )
+
+    # Edges of deleted nodes go with them and are re-added from the target.
+    current_edges: dict[EdgeKey, Edge] = {
+        (e.source, e.type, e.target): e
+        for e in current.edges()
+        if e.source not in recreated and e.target not in recreated
+    }
+    target_edges = {(e.source, e.type, e.target): e for e in target.edges()}
+    stale: set[EdgeKey] = set()
+    for key, edge in current_edges.items():
+        wanted = target_edges.get(key)
+        if wanted is None or not edge.properties.keys() <= wanted.properties.keys():
+            edge_deletes.append(
+                Delete(entity="edge", source=key[0], type=key[1], target=key[2])
+            )
+            stale.add(key)
+    for key, wanted in target_edges.items():
+        existing = None if key in stale else current_edges.get(key)
+        if existing is None or existing.properties != wanted.properties:
+            adds.append(
+                AddEdge(
+                    source=key[0],
+                    type=key[1],
+                    target=key[2],
+                    properties=wanted.properties,
+                )
+            )
+
+    return edge_deletes + node_deletes + adds
+
+
+# Global rollback manager instance
+_rollback_manager: RollbackManager | None = None
+
+
+def get_rollback_manager(store: InMemoryGraphStore | None = None) -> RollbackManager:
+    """Get the global rollback manager, snapshotting the store periodically."""
+    global _rollback_manager  # noqa: PLW0603
+    if _rollback_manager is None:
+        store = store or get_graph_store()
+        settings = get_settings()
+        snapshots = SnapshotStore(
+            settings.system.snapshot_path, every=settings.runtime.snapshot_interval
+        )
+        journal = get_patch_journal(store)
+        store.subscribe(lambda _patches: snapshots.maybe_take(store))
+        _rollback_manager = RollbackManager(store, journal, snapshots)
+    return _rollback_manager
@@ -1,20 +1,59 @@
 """Abstract interface for a graph store."""
 
+import functools
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from typing import Any, Literal
 
-from ..models.graph import Patch
+from opentelemetry import trace
+
+from models.graph import GraphPatch, Patch
+
+tracer = trace.get_tracer(__name__)
+
+# Interface methods wrapped in a span for every implementation.
+_TRACED_METHODS = ("upsert", "query_graph", "health")
+
+
+def _traced_method(name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a GraphStore method in a ``graphstore.<name>`` span."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with tracer.start_as_current_span(f"graphstore.{name}") as span:
+            span.set_attribute("graphstore.backend", type(self).__name__)
+            if name == "upsert":
+                patches = kwargs.get("patches", args[0] if args else [])
+                span.set_attribute("puntini.patch_count", len(patches))
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class GraphStore(ABC):
-    """Abstract interface for a GraphStore."""
+    """Abstract interface for a GraphStore.
+
+    Implementations are traced automatically: ``upsert``, ``query_graph`` and
+    ``health`` each run inside an OpenTelemetry span.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        """Instrument the interface methods defined by an implementation."""
+        super().__init_subclass__(**kwargs)
+        for name in _TRACED_METHODS:
+            method = cls.__dict__.get(name)
+            if method is not None and not getattr(
+                method, "__isabstractmethod__", False
+            ):
+                setattr(cls, name, _traced_method(name, method))
 
     @abstractmethod
-    def upsert(self, patches: list[Patch]) -> dict[str, Any]:
+    def upsert(self, patches: list[Patch | GraphPatch]) -> dict[str, Any]:
         """Apply a list of idempotent patch operations to the graph.
 
         Args:
-            patches: A list of Patch objects (AddNode, UpdateProps, AddEdge, Delete).
+            patches: Typed patches (AddNode, UpdateProps, AddEdge, Delete) or
+                legacy Patch objects, which are converted with ``Patch.typed``.
 
         Returns:
             A dictionary with the outcome of the operation.
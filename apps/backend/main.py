@@ -4,29 +4,75 @@ This module provides the main FastAPI application with basic endpoints
 for the Phase 0 scaffolding requirements.
 """
 
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+import signal
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.datastructures import Default
 from fastapi.middleware.cors import CORSMiddleware
 
+from agent.graph import get_agent_app
+from api.health import (
+    HealthMonitor,
+    Probe,
+    probe_event,
+    probe_graph_store,
+    probe_llm,
+    probe_sessions,
+)
+from api.metrics import (
+    MetricsMiddleware,
+    get_metrics_registry,
+    register_runtime_gauges,
+)
+from api.rate_limit import RateLimit, RateLimiter, RateLimitMiddleware
+from api.responses import FastJSONResponse
 from api.routers import (
     agent_router,
     graph_router,
     health_router,
+    metrics_router,
     session_router,
     todo_router,
 )
 from api.session_manager import get_session_manager
-from config.config import ConfigManager
+from config.config import ConfigManager, get_config
+from config.tracing import setup_tracing
+from graphstore.journal import get_patch_journal, maintain_journal
+from graphstore.memory import get_graph_store
+from graphstore.rollback import get_rollback_manager
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def reload_config(config: ConfigManager):
+    """Swap in a new configuration snapshot, keeping the current one if invalid."""
+    try:
+        config.reload()
+    except Exception:
+        logger.exception("Configuration reload failed; keeping the current settings")
+
+
+async def warm_up_agent(application: FastAPI):
+    """Compile the agent graph off the event loop, then mark the agent ready."""
+    try:
+        await asyncio.to_thread(get_agent_app)
+    except Exception:
+        logger.exception("Agent graph failed to compile")
+        return
+    application.state.agent_ready.set()
+    logger.info("Agent graph compiled")
+
+    # Report readiness now rather than at the next probe pass
+    await application.state.health_monitor.check()
+
+
 @asynccontextmanager
-async def lifespan(_app: FastAPI):
+async def lifespan(application: FastAPI):
     """Application lifespan manager for startup and shutdown events.
 
     This handles initialization and cleanup of resources when the FastAPI
@@ -37,24 +83,94 @@ async def lifespan(_app: FastAPI):
     config = ConfigManager()
     logger.info(f"Configuration loaded: {config.config}")
 
+    # Initialize tracing
+    tracer_provider = setup_tracing(
+        config.settings.runtime, config.settings.system.logs_path
+    )
+
+    # Journal every batch applied to the graph store and snapshot it
+    patch_journal = get_patch_journal()
+    # Reload the graph from its history before anything reads or indexes it
+    graph_version = get_rollback_manager().recover()
+    logger.info("Graph store recovered at version %s", graph_version)
+    # Sync records left pending by idle periods and compact old segments
+    journal_maintenance = asyncio.create_task(
+        maintain_journal(
+            patch_journal,
+            compact_interval=config.settings.runtime.journal_compact_interval,
+            retention=config.settings.runtime.journal_retention,
+        )
+    )
+
+    # Imported here: NumPy is only needed once the application starts
+    from agent.vector_index import get_vector_index  # noqa: PLC0415
+
+    vector_index = get_vector_index()
+    logger.info(f"Patch journal opened at {patch_journal.directory}")
+
     # Initialize session manager
     session_manager = get_session_manager()
     await session_manager.start()
     logger.info("Session manager started")
 
+    # LangGraph loads in the background; agent_ready is set once it compiled
+    agent_warm_up = asyncio.create_task(warm_up_agent(application))
+
+    # Probe dependencies in the background for the health endpoints
+    application.state.health_monitor.start()
+
+    # Reload the configuration on SIGHUP; unsupported off the main thread
+    loop = asyncio.get_running_loop()
+    reload_on_hangup = False
+    with suppress(AttributeError, NotImplementedError, RuntimeError, ValueError):
+        loop.add_signal_handler(signal.SIGHUP, reload_config, config)
+        reload_on_hangup = True
+
     yield
 
+    if reload_on_hangup:
+        loop.remove_signal_handler(signal.SIGHUP)
+
     # Shutdown
     logger.info("Shutting down FastAPI application...")
+    agent_warm_up.cancel()
+    await application.state.health_monitor.stop()
+
+    # Close the LLM clients, which belong to this event loop
+    from agent.llm import close_llm_dispatcher  # noqa: PLC0415
+
+    await close_llm_dispatcher()
 
     # Stop session manager
     await session_manager.stop()
     logger.info("Session manager stopped")
 
+    # Sync and close the patch journal, finish pending snapshots, persist the
+    # vector index
+    journal_maintenance.cancel()
+    with suppress(asyncio.CancelledError):
+        await journal_maintenance
+    patch_journal.close()
+    await asyncio.to_thread(get_rollback_manager().flush)
+    vector_index.save(
+        config.settings.system.vector_index_path,
+        graph_version=get_graph_store().version,
+    )
+
+    # Flush pending spans; the provider is shut down when the process exits
+    if tracer_provider is not None:
+        tracer_provider.force_flush()
+
+    # Write out log records still queued; the writer stops at process exit
+    config.flush_logging()
 
-def create_app() -> FastAPI:
+
+def create_app(probes: dict[str, Probe] | None = None) -> FastAPI:
     """Create and configure the FastAPI application.
 
+    Args:
+        probes: Health probes replacing the default probes of the same name
+
     Returns:
         FastAPI: Configured FastAPI application instance
 
@@ -64,6 +180,38 @@ def create_app() -> FastAPI:
         description="API for managing business improvement projects using Agile and PMI methodologies",
         version="0.1.0",
         lifespan=lifespan,
+        # As a Default, routes with a response_model keep FastAPI's direct
+        # Pydantic serialization and only the others are rendered by orjson
+        default_response_class=Default(FastJSONResponse),
+    )
+
+    # Readiness waits for the agent graph, the graph store and the sessions
+    app.state.agent_ready = asyncio.Event()
+    runtime = get_config().settings.runtime
+    app.state.health_monitor = HealthMonitor(
+        {
+            "graph_store": probe_graph_store,
+            "sessions": probe_sessions,
+            "llm": probe_llm,
+            "agent": probe_event(app.state.agent_ready),
+            **(probes or {}),
+        },
+        critical=("graph_store", "sessions", "agent"),
+        interval=runtime.health_check_interval,
+        timeout=runtime.health_check_timeout,
+    )
+
+    # Rate limit route prefixes per client; routes share the same buckets.
+    # Added before CORS so that 429 responses also carry the CORS headers.
+    settings = get_config().settings
+    app.state.rate_limiter = RateLimiter.from_settings(settings)
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=app.state.rate_limiter,
+        rules={
+            prefix: RateLimit.from_settings(limit)
+            for prefix, limit in settings.runtime.rate_limits.items()
+        },
     )
 
     # Add CORS middleware for frontend integration
@@ -77,11 +225,25 @@ def create_app() -> FastAPI:
 
     # Include API routers
     app.include_router(health_router)
+    app.include_router(metrics_router)
     app.include_router(agent_router)
     app.include_router(graph_router)
     app.include_router(todo_router)
     app.include_router(session_router)
 
+    # Tell load balancers which worker runs the sessions it answers for
+    @app.middleware("http")
+    async def session_affinity(request: Request, call_next):
+        response = await call_next(request)
+        if request.url.path.startswith("/sessions"):
+            response.headers["X-Session-Worker"] = get_session_manager().worker_id
+        return response
+
+    # Added last so it is outermost and also times rejected requests
+    metrics_registry = get_metrics_registry()
+    register_runtime_gauges(metrics_registry)
+    app.add_middleware(MetricsMiddleware, registry=metrics_registry)
+
     # Add root endpoint
     @app.get("/")
     async def hello_world():
@@ -7,6 +7,8 @@ including domain entities, graph operations, and session management.
 from .base import BaseEntity
 from .domain import Epic, Issue, Progetto, Utente
 from .session import (
+    AgentActRequest,
+    AgentActResponse,
     Message,
     MessageRequest,
     MessageResponse,
@@ -22,6 +24,8 @@ from .session import (
 )
 
 __all__ = [
+    "AgentActRequest",
+    "AgentActResponse",
     "BaseEntity",
     "Epic",
     "Issue",
@@ -1,6 +1,9 @@
 """Base models for the backend."""
 
-from pydantic import BaseModel, ConfigDict
+from collections.abc import Iterable
+from typing import Any, ClassVar, Self
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
 
 class BaseEntity(BaseModel):
@@ -12,3 +15,34 @@ class BaseEntity(BaseModel):
         extra="forbid",
         use_enum_values=True,
     )
+
+    # Compiled list validators, one per subclass.
+    _list_adapters: ClassVar[dict[type, TypeAdapter]] = {}
+
+    @classmethod
+    def trusted(cls, **data: Any) -> Self:
+        """Build an instance without validation.
+
+        Only use this for data produced by our own code that has already been
+        checked, such as patches emitted by the planner. Nothing is validated
+        or coerced; omitted fields get their defaults.
+        """
+        return cls.model_construct(**data)
+
+    @classmethod
+    def validate_many(cls, items: Iterable[Self | dict[str, Any]]) -> list[Self]:
+        """Validate a batch of instances or dictionaries in a single pass.
+
+        Trusted instances are re-validated as well, so this can be used as the
+        opt-in check for batches built with :meth:`trusted`.
+
+        Raises:
+            pydantic.ValidationError: With the index of every invalid item
+
+        """
+        adapter = cls._list_adapters.get(cls)
+        if adapter is None:
+            adapter = cls._list_adapters[cls] = TypeAdapter(list[cls])
+        return adapter.validate_python(
+            [item.__dict__ if isinstance(item, BaseModel) else item for item in items]
+        )
@@ -29,3 +29,41 @@ class Task(BaseEntity):
     description: str | None = None
     status: TaskStatus = TaskStatus.PENDING
     priority: Priority = Priority.MEDIUM
+
+
+class Progetto(BaseEntity):
+    """Project model."""
+
+    id: str
+    name: str
+    description: str | None = None
+
+
+class Utente(BaseEntity):
+    """User model."""
+
+    id: str
+    name: str
+    email: str | None = None
+
+
+class Epic(BaseEntity):
+    """Epic model."""
+
+    id: str
+    progetto_id: str
+    name: str
+    description: str | None = None
+
+
+class Issue(BaseEntity):
+    """Issue model."""
+
+    id: str
+    progetto_id: str
+    name: str
+    description: str | None = None
+    epic_id: str | None = None
+    assignee_id: str | None = None
+    status: TaskStatus = TaskStatus.PENDING
+    priority: Priority = Priority.MEDIUM
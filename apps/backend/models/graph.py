@@ -1,6 +1,9 @@
 """Graph-related models for the backend."""
 
-from typing import Any, Literal
+from collections.abc import Iterable
+from typing import Annotated, Any, Literal, Self
+
+from pydantic import Field, TypeAdapter, model_validator
 
 from .base import BaseEntity
 
@@ -23,8 +26,144 @@ class Edge(BaseEntity):
 
 
 class Patch(BaseEntity):
-    """Patch model."""
+    """Patch model.
+
+    This is the untyped form accepted from external callers. Stores convert
+    it with :meth:`typed` into one of the :data:`GraphPatch` models.
+    """
 
     op: Literal["add", "update", "delete"]
     entity: Literal["node", "edge"]
     data: dict[str, Any]
+
+    def typed(self) -> "GraphPatch":
+        """Convert the patch into its typed form.
+
+        Raises:
+            KeyError: If the payload lacks the keys required by the operation
+            pydantic.ValidationError: If the payload values are invalid
+
+        """
+        data = self.data
+        if self.entity == "node":
+            if self.op == "add":
+                return AddNode(
+                    id=data["id"],
+                    type=data["type"],
+                    properties=data.get("properties") or {},
+                )
+            if self.op == "update":
+                return UpdateProps(
+                    id=data["id"], properties=data.get("properties") or {}
+                )
+            return Delete(id=data["id"])
+
+        key = {"source": data["source"], "target": data["target"], "type": data["type"]}
+        if self.op == "add":
+            return AddEdge(**key, properties=data.get("properties"))
+        if self.op == "update":
+            return UpdateProps(
+                entity="edge", **key, properties=data.get("properties") or {}
+            )
+        return Delete(entity="edge", **key)
+
+
+class _EntityRef(BaseEntity):
+    """Identifies a node by ``id`` or an edge by ``source``/``type``/``target``."""
+
+    entity: Literal["node", "edge"] = "node"
+    id: str | None = None
+    source: str | None = None
+    target: str | None = None
+    type: str | None = None
+
+    @model_validator(mode="after")
+    def _check_reference(self) -> Self:
+        """Require the identifying fields of the referenced entity."""
+        if self.entity == "node" and self.id is None:
+            raise ValueError("node patches require an id")
+        if self.entity == "edge" and None in (self.source, self.target, self.type):
+            raise ValueError("edge patches require source, target and type")
+        return self
+
+    @property
+    def edge_key(self) -> tuple[str, str, str]:
+        """Return the identity of the referenced edge."""
+        return (self.source, self.type, self.target)  # type: ignore[return-value]
+
+
+class AddNode(BaseEntity):
+    """Create a node, or merge properties into an existing one."""
+
+    op: Literal["add_node"] = "add_node"
+    id: str
+    type: str
+    properties: dict[str, Any] = Field(default_factory=dict)
+
+
+class AddEdge(BaseEntity):
+    """Create an edge, or merge properties into an existing one."""
+
+    op: Literal["add_edge"] = "add_edge"
+    source: str
+    target: str
+    type: str
+    properties: dict[str, Any] | None = None
+
+    @property
+    def edge_key(self) -> tuple[str, str, str]:
+        """Return the identity of the edge."""
+        return (self.source, self.type, self.target)
+
+
+class UpdateProps(_EntityRef):
+    """Merge properties into an existing node or edge."""
+
+    op: Literal["update_props"] = "update_props"
+    properties: dict[str, Any]
+
+
+class Delete(_EntityRef):
+    """Delete a node, with its incident edges, or an edge."""
+
+    op: Literal["delete"] = "delete"
+
+
+GraphPatch = Annotated[
+    AddNode | AddEdge | UpdateProps | Delete, Field(discriminator="op")
+]
+
+_graph_patch_list = TypeAdapter(list[GraphPatch])
+
+
+def validate_graph_patches(items: Iterable[Any]) -> list[GraphPatch]:
+    """Validate a batch of typed patches or dictionaries in a single pass.
+
+    Dictionaries are dispatched on their ``op`` field without trying every
+    member of the union.
+    """
+    return _graph_patch_list.validate_python(
+        [item.__dict__ if isinstance(item, BaseEntity) else item for item in items]
+    )
+
+
+def as_graph_patch(patch: "Patch | GraphPatch") -> "GraphPatch":
+    """Return the typed form of a legacy or typed patch."""
+    return patch.typed() if isinstance(patch, Patch) else patch
+
+
+class ExtractedEntity(BaseEntity):
+    """Entity extracted from a prompt, before resolution against the graph."""
+
+    type: str
+    name: str
+    id: str | None = None
+    progetto_id: str | None = None
+    properties: dict[str, Any] = Field(default_factory=dict)
+
+    def node_properties(self) -> dict[str, Any]:
+        """Return the properties a node for this entity should carry."""
+        properties = {**self.properties, "name": self.name}
+        if self.progetto_id is not None:
+            properties["progetto_id"] = self.progetto_id
+        return properties
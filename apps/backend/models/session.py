@@ -112,6 +112,21 @@ class MessageResponse(BaseModel):
     metadata: dict[str, Any] = Field(..., description="Message metadata")
 
 
+class AgentActRequest(BaseModel):
+    """Request model for running the agent in a session."""
+
+    session_id: UUID = Field(..., description="Session the run belongs to")
+    input: str = Field(..., min_length=1, description="Prompt for the agent")
+
+
+class AgentActResponse(BaseModel):
+    """Response model for an agent run."""
+
+    response: str = Field(..., description="Answer of the agent")
+    applied: int = Field(..., description="Number of graph patches applied")
+    errors: list[str] = Field(..., description="Errors of the graph upsert")
+
+
 class ProjectContextUpdate(BaseModel):
     """Model for updating project context."""
 
@@ -3,9 +3,20 @@
 
 This script provides a convenient way to start the FastAPI development server
 with proper configuration and logging.
+
+Several workers are started as separate single-process servers on
+consecutive ports, from ``server.port`` upwards, rather than as uvicorn
+workers sharing one socket: sessions live in the worker that runs them, so
+a proxy must be able to send each session's requests to the worker named in
+its ``X-Session-Worker`` header (``host:port``).
 """
 
+import os
+import signal
+import socket
+import subprocess
 import sys
+import time
 from pathlib import Path
 
 import uvicorn
@@ -29,15 +40,39 @@ def main():
         print(f"⚙️  Configuration loaded from: {config.config_path}")
 
         # Get server configuration
-        server_config = config_data.get("server", {})
+        server = config.settings.server
+
+        # Several workers need shared session state and sticky routing: a
+        # worker taking over a session re-initializes it and loses the
+        # messages still queued in the previous one
+        workers = server.workers
+        if workers > 1:
+            if config.settings.runtime.session_state_backend != "sqlite":
+                print(
+                    "❌ Sessions are not shared between workers; "
+                    'set runtime.session_state_backend to "sqlite"'
+                )
+                sys.exit(1)
+            if not server.sticky_sessions:
+                print(
+                    "❌ Several workers need a proxy routing each session to the "
+                    "worker in its X-Session-Worker header; set "
+                    "server.sticky_sessions once it does"
+                )
+                sys.exit(1)
+
+        log_level = config_data.get("log_level", "info").lower()
+        if workers > 1:
+            run_workers(server.host, server.port, workers, log_level)
+            return
 
         # Run the server
         uvicorn.run(
             "main:app",
-            host=server_config.get("host", "0.0.0.0"),  # noqa: S104
-            port=server_config.get("port", 8000),
+            host=server.host,
+            port=server.port,
             reload=config_data.get("api_reload", True),
-            log_level=config_data.get("log_level", "info").lower(),
+            log_level=log_level,
             access_log=True,
         )
 
@@ -48,5 +83,68 @@ def main():
         sys.exit(1)
 
 
+def run_workers(host: str, port: int, workers: int, log_level: str):
+    """Run one server process per worker, each on its own port.
+
+    Each worker is configured through ``BACKEND__`` environment overrides
+    with its port and a worker id naming it as ``host:port``. The workers
+    are stopped together when one of them exits or on interrupt.
+
+    Args:
+        host: The interface every worker binds to
+        port: The port of the first worker
+        workers: The number of workers
+        log_level: The uvicorn log level
+
+    """
+    hostname = socket.gethostname()
+    processes = []
+    for worker_port in range(port, port + workers):
+        print(f"👷 Worker {hostname}:{worker_port}")
+        env = {
+            **os.environ,
+            "BACKEND__SERVER__PORT": str(worker_port),
+            "BACKEND__SERVER__WORKERS": "1",
+            "BACKEND__SERVER__WORKER_ID": f"{hostname}:{worker_port}",
+        }
+        processes.append(
+            subprocess.Popen(  # noqa: S603
+                [
+                    sys.executable,
+                    "-m",
+                    "uvicorn",
+                    "main:app",
+                    "--host",
+                    host,
+                    "--port",
+                    str(worker_port),
+                    "--log-level",
+                    log_level,
+                ],
+                cwd=backend_dir,
+                env=env,
+            )
+        )
+
+    try:
+        while all(process.poll() is None for process in processes):
+            time.sleep(0.5)
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+        for process in processes:
+            process.wait()
+
+    # Workers stopped here exit with -SIGTERM
+    failed = [
+        process.returncode
+        for process in processes
+        if process.returncode not in (0, -signal.SIGTERM)
+    ]
+    if failed:
+        sys.exit(failed[0])
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Query latency of the fuzzy name index on a large project.
+
+Usage:
+    python scripts/bench_name_index.py [entities]
+"""
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from agent.name_index import NameIndex
+from models.graph import Node
+
+WORDS = [
+    "payment",
+    "gateway",
+    "checkout",
+    "invoice",
+    "refund",
+    "billing",
+    "onboarding",
+    "signup",
+    "login",
+    "profile",
+    "search",
+    "catalog",
+    "cart",
+    "shipping",
+    "tracking",
+    "report",
+    "export",
+    "import",
+    "audit",
+    "notification",
+    "email",
+    "sms",
+    "webhook",
+    "retry",
+    "timeout",
+    "cache",
+    "queue",
+    "worker",
+    "scheduler",
+    "dashboard",
+    "chart",
+    "metric",
+    "alert",
+    "backup",
+    "restore",
+    "migration",
+    "schema",
+    "index",
+    "upload",
+]
+TYPES = ["Epic", "Issue", "Task", "Utente"]
+
+
+def build_nodes(count: int, rng: random.Random) -> list[Node]:
+    """Build ``count`` entities with names of two to four random words."""
+    return [
+        Node(
+            id=f"n{i}",
+            type=TYPES[i % len(TYPES)],
+            properties={
+                "name": " ".join(rng.sample(WORDS, rng.randint(2, 4))) + f" {i}",
+                "description": " ".join(rng.sample(WORDS, 6)),
+                "progetto_id": f"p{i % 10}",
+            },
+        )
+        for i in range(count)
+    ]
+
+
+def typo(name: str, rng: random.Random) -> str:
+    """Swap two adjacent letters of a name."""
+    i = rng.randrange(len(name) - 1)
+    return name[:i] + name[i + 1] + name[i] + name[i + 2 :]
+
+
+def main():
+    """Run the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(42)  # noqa: S311
+    nodes = build_nodes(count, rng)
+
+    start = time.perf_counter()
+    index = NameIndex.from_nodes(nodes)
+    build_seconds = time.perf_counter() - start
+
+    sample = rng.sample(nodes, 500)
+    queries = [typo(n.properties["name"], rng) for n in sample]
+    for label, kwargs in (
+        ("all", {}),
+        ("project", {"progetto_id": "p3"}),
+        ("type", {"node_type": "Issue"}),
+    ):
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query, **kwargs)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(
+            f"{label:8} median {statistics.median(timings) * 1e3:6.3f} ms  "
+            f"p95 {timings[int(len(timings) * 0.95)] * 1e3:6.3f} ms"
+        )
+    found = sum(
+        [m.id for m in index.search(query, limit=1)] == [node.id]
+        for query, node in zip(queries, sample, strict=True)
+    )
+    print(f"top-1 hit rate on misspelled names {found / len(queries):.1%}")
+    print(f"built {len(index):,} entities in {build_seconds:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
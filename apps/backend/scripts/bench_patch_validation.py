@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Microbenchmark of validated versus trusted patch construction.
+
+Usage:
+    python scripts/bench_patch_validation.py [count]
+"""
+
+import gc
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from models.graph import Patch, validate_graph_patches
+
+
+def make_payloads(count: int) -> list[dict]:
+    """Build ``count`` node patch payloads."""
+    return [
+        {
+            "op": "add",
+            "entity": "node",
+            "data": {
+                "id": f"issue-{i}",
+                "type": "Issue",
+                "properties": {"name": f"Issue {i}", "status": "pending"},
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def timed(label: str, func, count: int) -> float:
+    """Run ``func`` once with the GC paused and print its throughput."""
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+    finally:
+        gc.enable()
+    print(f"{label:<32} {elapsed * 1000:9.1f} ms  {count / elapsed:12,.0f} patches/s")
+    return elapsed
+
+
+def main():
+    """Run the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    payloads = make_payloads(count)
+    trusted: list[Patch] = []
+
+    print(f"Constructing {count:,} patches")
+    timed("validated (Patch(**payload))", lambda: [Patch(**p) for p in payloads], count)
+    timed("bulk (Patch.validate_many)", lambda: Patch.validate_many(payloads), count)
+    timed(
+        "model_construct",
+        lambda: [Patch.model_construct(**p) for p in payloads],
+        count,
+    )
+    timed(
+        "trusted (Patch.trusted)",
+        lambda: trusted.extend([Patch.trusted(**p) for p in payloads]),
+        count,
+    )
+    timed("re-check trusted batch", lambda: Patch.validate_many(trusted), count)
+
+    typed_payloads = [{"op": "add_node", **p["data"]} for p in payloads]
+    typed = validate_graph_patches(typed_payloads)
+    timed(
+        "typed (validate_graph_patches)",
+        lambda: validate_graph_patches(typed_payloads),
+        count,
+    )
+    timed("legacy -> typed (Patch.typed)", lambda: [p.typed() for p in trusted], count)
+    timed("serialize legacy", lambda: [p.model_dump_json() for p in trusted], count)
+    timed("serialize typed", lambda: [p.model_dump_json() for p in typed], count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Encoding cost and throughput of the session list and message endpoints.
+
+For each payload, compares FastAPI's default path (``jsonable_encoder`` or
+per-row response models, then stdlib ``json``) with the orjson-backed
+``FastJSONResponse`` and the cached session encoding. It then measures the
+requests per second of the endpoints in-process, both on a baseline app that
+serves them with FastAPI's stock serialization and on the application.
+
+Usage:
+    python scripts/bench_responses.py [sessions]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+import httpx
+from fastapi import APIRouter, FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from api.responses import FastJSONResponse
+from api.session_manager import get_session_manager
+from main import create_app
+from models.session import (
+    MessageRequest,
+    MessageResponse,
+    SessionListResponse,
+    SessionResponse,
+)
+
+
+def per_second(func, seconds: float = 1.0) -> float:
+    """Return how many times ``func`` runs per second."""
+    count = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < seconds:
+        func()
+        count += 1
+    return count / elapsed
+
+
+def session_list_model(sessions: list[Any]) -> SessionListResponse:
+    """Build the session list response model with one model per row."""
+    rows = []
+    for session in sessions:
+        info = session.session_info
+        rows.append(
+            SessionResponse(
+                session_id=info.session_id,
+                user_id=info.user_id,
+                project_id=info.project_id,
+                status=info.status.value,
+                created_at=info.created_at.isoformat(),
+                last_activity=info.last_activity.isoformat(),
+                expires_at=info.expires_at.isoformat(),
+                is_expired=info.is_expired,
+                is_active=info.is_active,
+                agent_count=info.agent_count,
+                task_count=info.task_count,
+                metadata=info.metadata,
+            )
+        )
+    return SessionListResponse(
+        sessions=rows, total_count=len(rows), active_count=len(rows)
+    )
+
+
+def session_list_before(sessions: list[Any]) -> bytes:
+    """Encode the session list the way the route did before caching."""
+    return session_list_model(sessions).model_dump_json().encode()
+
+
+def session_list_after(sessions: list[Any]) -> bytes:
+    """Encode the session list from the cached per-session payloads."""
+    return (
+        b'{"sessions": ['
+        + b", ".join(session.response_json() for session in sessions)
+        + b'], "total_count": %d, "active_count": %d}' % (len(sessions), 0)
+    )
+
+
+def create_baseline_app() -> FastAPI:
+    """Return the application with the benchmarked endpoints overridden.
+
+    The overrides go through ``response_model`` validation or
+    ``jsonable_encoder`` and the stdlib-backed ``JSONResponse``, as before
+    ``FastJSONResponse``; middleware and every other route are unchanged.
+    """
+    app = create_app()
+    stock = APIRouter(default_response_class=JSONResponse)
+    manager = get_session_manager()
+
+    @stock.get("/sessions/", response_model=SessionListResponse)
+    async def list_sessions():
+        return session_list_model(await manager.list_sessions())
+
+    @stock.get("/sessions/{session_id}/tasks")
+    async def get_tasks(session_id: UUID):
+        tasks = await (await manager.get_session(session_id)).get_tasks()
+        return {"tasks": tasks, "count": len(tasks)}
+
+    @stock.post("/sessions/{session_id}/messages", response_model=MessageResponse)
+    async def send_message(session_id: UUID, request: MessageRequest):
+        session = await manager.get_session(session_id)
+        message_id = await session.send_message(
+            content=request.content,
+            message_type=request.message_type,
+            metadata=request.metadata,
+        )
+        return MessageResponse(
+            message_id=message_id,
+            content=request.content,
+            timestamp=session.last_activity.isoformat(),
+            message_type=request.message_type,
+            metadata=request.metadata or {},
+        )
+
+    # Matched before the application's own routes
+    app.router.routes[:0] = stock.routes
+    return app
+
+
+async def throughput(client: httpx.AsyncClient, method: str, url: str, **kwargs):
+    """Return the requests per second of an endpoint over one second."""
+    count = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < 1.0:
+        response = await client.request(method, url, **kwargs)
+        response.raise_for_status()
+        count += 1
+    return count / elapsed
+
+
+async def main():
+    """Run the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    manager = get_session_manager()
+    sessions = [
+        await manager.create_session(f"user{i}", metadata={"source": "bench"})
+        for i in range(count)
+    ]
+    session = sessions[0]
+    for i in range(20):
+        await session.add_task({"title": f"Task {i}", "description": "x" * 40})
+    tasks = {"tasks": await session.get_tasks(), "count": 20}
+    message = MessageResponse(
+        message_id="m1",
+        content={"text": "hello", "entities": list(range(20))},
+        timestamp="2025-01-01T00:00:00+00:00",
+        message_type="user",
+        metadata={},
+    )
+
+    print(f"encodings per second ({count} sessions)")
+    for label, before, after in (
+        (
+            "session list",
+            lambda: session_list_before(sessions),
+            lambda: session_list_after(sessions),
+        ),
+        (
+            "tasks",
+            lambda: JSONResponse(jsonable_encoder(tasks)).body,
+            lambda: FastJSONResponse(tasks).body,
+        ),
+        (
+            "message",
+            lambda: JSONResponse(jsonable_encoder(message)).body,
+            lambda: FastJSONResponse(message).body,
+        ),
+    ):
+        slow, fast = per_second(before), per_second(after)
+        print(f"  {label:13} {slow:10.0f} -> {fast:10.0f}  ({fast / slow:4.1f}x)")
+
+    baseline = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_baseline_app()),
+        base_url="http://bench",
+    )
+    fast = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_app()), base_url="http://bench"
+    )
+    async with baseline, fast:
+        print("requests per second (stock serialization -> application)")
+        for label, method, url, kwargs in (
+            ("GET /sessions", "GET", "/sessions/", {}),
+            ("GET tasks", "GET", f"/sessions/{session.session_id}/tasks", {}),
+            (
+                "POST message",
+                "POST",
+                f"/sessions/{session.session_id}/messages",
+                {"json": {"content": "hello"}},
+            ),
+        ):
+            slow = await throughput(baseline, method, url, **kwargs)
+            rate = await throughput(fast, method, url, **kwargs)
+            print(f"  {label:13} {slow:10.0f} -> {rate:10.0f}  ({rate / slow:4.1f}x)")
+    await manager.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,134 @@
+"""Unit tests for the agent admission scheduler."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from agent.scheduler import AdmissionRejectedError, AdmissionScheduler
+
+
+async def _occupy(scheduler: AdmissionScheduler, release: asyncio.Event, user="busy"):
+    """Hold a slot until ``release`` is set."""
+    async with scheduler.slot(user):
+        await release.wait()
+
+
+class TestAdmissionScheduler:
+    """Test cases for AdmissionScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_global_cap_is_enforced(self):
+        """Test that no more than max_concurrent runs execute at once."""
+        scheduler = AdmissionScheduler(max_concurrent=3)
+        running = 0
+        peak = 0
+
+        async def job():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        await asyncio.gather(
+            *(scheduler.run(f"user{i % 4}", None, job) for i in range(12))
+        )
+
+        assert peak == 3
+        assert scheduler.stats()["admitted"] == 12
+        assert scheduler.stats()["active"] == 0
+
+    @pytest.mark.asyncio
+    async def test_users_are_served_round_robin(self):
+        """Test that a burst from one user does not starve another."""
+        scheduler = AdmissionScheduler(max_concurrent=1)
+        release = asyncio.Event()
+        blocker = asyncio.create_task(_occupy(scheduler, release))
+        await asyncio.sleep(0)
+        order: list[str] = []
+
+        async def job(name: str):
+            order.append(name)
+
+        tasks = [
+            asyncio.create_task(scheduler.run("alice", None, lambda i=i: job(f"a{i}")))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(scheduler.run("bob", None, lambda: job("b0"))))
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(blocker, *tasks)
+
+        assert order == ["a0", "b0", "a1", "a2"]
+
+    @pytest.mark.asyncio
+    async def test_projects_are_served_round_robin_within_user(self):
+        """Test that a user's projects take turns."""
+        scheduler = AdmissionScheduler(max_concurrent=1)
+        release = asyncio.Event()
+        blocker = asyncio.create_task(_occupy(scheduler, release))
+        await asyncio.sleep(0)
+        order: list[str] = []
+
+        async def job(name: str):
+            order.append(name)
+
+        tasks = []
+        for name, project in [("p1-0", "p1"), ("p1-1", "p1"), ("p2-0", "p2")]:
+            tasks.append(
+                asyncio.create_task(
+                    scheduler.run("alice", project, lambda n=name: job(n))
+                )
+            )
+            await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(blocker, *tasks)
+
+        assert order == ["p1-0", "p2-0", "p1-1"]
+
+    @pytest.mark.asyncio
+    async def test_queued_run_is_shed_after_deadline(self):
+        """Test that a run waiting past its deadline is rejected."""
+        scheduler = AdmissionScheduler(max_concurrent=1)
+        release = asyncio.Event()
+        blocker = asyncio.create_task(_occupy(scheduler, release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejectedError):
+            await scheduler.run("alice", None, lambda: asyncio.sleep(0), timeout=0.01)
+
+        release.set()
+        await blocker
+        stats = scheduler.stats()
+        assert stats["shed"] == 1
+        assert stats["queued"] == 0
+        assert stats["active"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_frees_its_place(self):
+        """Test that cancelling a queued run leaves the scheduler consistent."""
+        scheduler = AdmissionScheduler(max_concurrent=1)
+        release = asyncio.Event()
+        blocker = asyncio.create_task(_occupy(scheduler, release))
+        await asyncio.sleep(0)
+
+        waiting = asyncio.create_task(
+            scheduler.run("alice", None, lambda: asyncio.sleep(0))
+        )
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        release.set()
+        await blocker
+        assert scheduler.stats()["queued"] == 0
+        assert scheduler.stats()["active"] == 0
@@ -4,7 +4,9 @@ This module contains comprehensive tests for all FastAPI endpoints
 to ensure proper functionality, error handling, and response validation.
 """
 
+import json
 import sys
+import time
 from pathlib import Path
 from uuid import uuid4
 
@@ -14,8 +16,13 @@ from fastapi.testclient import TestClient
 # Add the parent directory to the Python path to allow for relative imports
 sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
 
-from api.session_manager import SessionManager
+from agent.scheduler import AdmissionRejectedError, AdmissionScheduler
+from api.session_manager import SessionManager, get_session_manager
+from api.user_session import UserSession
+from config.config import get_config
+from graphstore.memory import get_graph_store
 from main import create_app
+from models.graph import AddEdge, AddNode
 
 
 @pytest.fixture(autouse=True)
@@ -24,11 +31,36 @@ def reset_session_manager():
     SessionManager._instance = None
 
 
+async def probe_llm_stub() -> dict:
+    """Report the LLM providers as reachable without contacting them."""
+    return {"status": "healthy", "providers": {}}
+
+
 @pytest.fixture
-def client():
-    """Create a test client for the FastAPI application."""
-    app = create_app()
-    return TestClient(app)
+def client(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch):
+    """Create a test client for the FastAPI application.
+
+    Used as a context manager, the client runs the application lifespan and
+    serves every request from one event loop, so session runtime loops
+    started by one request keep running. Files the lifespan writes go to a
+    temporary directory, and the LLM probe is stubbed so no provider is
+    contacted. The client is returned once the application is ready.
+    """
+    data = tmp_path_factory.getbasetemp() / "backend"
+    for key in ("logs", "journal", "snapshot", "vector_index", "hibernation"):
+        monkeypatch.setenv(f"BACKEND__SYSTEM__{key.upper()}_PATH", str(data / key))
+    config = get_config()
+    config.reload()
+    try:
+        with TestClient(create_app(probes={"llm": probe_llm_stub})) as client:
+            deadline = time.monotonic() + 30
+            while client.get("/health/ready").status_code != 200:
+                assert time.monotonic() < deadline, "application never got ready"
+                time.sleep(0.01)
+            yield client
+    finally:
+        monkeypatch.undo()
+        config.reload()
 
 
 @pytest.fixture
@@ -115,6 +147,17 @@ class TestSessionEndpoints:
         response = client.post("/sessions/", json=session_data)
         assert response.status_code == 422
 
+    def test_create_session_rate_limited(self, client):
+        """Test that a user opening sessions too fast is rejected after a burst."""
+        codes = [
+            client.post("/sessions/", json={"user_id": "eager_user"}).status_code
+            for _ in range(6)
+        ]
+
+        assert codes == [200] * 5 + [429]
+        other = client.post("/sessions/", json={"user_id": "other_user"})
+        assert other.status_code == 200
+
     def test_get_session_success(self, client):
         """Test successful session retrieval."""
         # First create a session
@@ -219,6 +262,19 @@ class TestSessionEndpoints:
         assert "max_sessions" in data
         assert "average_session_duration" in data
 
+    def test_session_stats_count_other_workers(self, client):
+        """Test that stats include the sessions stored by other workers."""
+        client.post("/sessions/", json={"user_id": "user1"})
+        state = UserSession(uuid4(), "user2").to_state()
+        state["status"] = "error"
+        get_session_manager()._state_store.save(state, "other-worker")
+
+        data = client.get("/sessions/stats").json()
+
+        assert data["total_sessions"] == 2
+        assert data["active_sessions"] == 1
+        assert data["error_sessions"] == 1
+
     def test_send_message_success(self, client):
         """Test sending a message to a session."""
         # Create a session first
@@ -330,17 +386,62 @@ class TestSessionEndpoints:
         assert isinstance(data["tasks"], list)
 
 
-class TestPlaceholderEndpoints:
-    """Test cases for placeholder endpoints."""
+class TestAgentEndpoints:
+    """Test cases for running the agent."""
 
-    def test_agent_action_endpoint(self, client):
-        """Test the agent action placeholder endpoint."""
-        response = client.post("/agent/act")
-        assert response.status_code == 200
+    def test_agent_action_runs_through_scheduler(self, client, monkeypatch):
+        """Test that an agent run is admitted under the session's user and project."""
+        project_id = str(uuid4())
+        session_id = client.post(
+            "/sessions/", json={"user_id": "agent_user", "project_id": project_id}
+        ).json()["session_id"]
+        admitted = []
+        run = AdmissionScheduler.run
+
+        async def record(self, user_id, project, *args, **kwargs):
+            admitted.append((user_id, project))
+            return await run(self, user_id, project, *args, **kwargs)
+
+        monkeypatch.setattr(AdmissionScheduler, "run", record)
 
+        response = client.post(
+            "/agent/act", json={"session_id": session_id, "input": "Add two issues"}
+        )
+
+        assert response.status_code == 200
         data = response.json()
-        assert "placeholder" in data["status"]
-        assert "Phase 1" in data["message"]
+        assert data["response"]
+        assert data["errors"] == []
+        assert admitted == [("agent_user", project_id)]
+
+    def test_agent_action_session_not_found(self, client):
+        """Test running the agent in an unknown session."""
+        response = client.post(
+            "/agent/act", json={"session_id": str(uuid4()), "input": "Add an issue"}
+        )
+        assert response.status_code == 404
+
+    def test_agent_action_shed(self, client, monkeypatch):
+        """Test that a run shed by the scheduler is reported as unavailable."""
+        session_id = client.post("/sessions/", json={"user_id": "agent_user"}).json()[
+            "session_id"
+        ]
+
+        async def shed(*_args, **_kwargs):
+            raise AdmissionRejectedError("Agent run shed after its deadline")
+
+        monkeypatch.setattr(AdmissionScheduler, "run", shed)
+
+        response = client.post(
+            "/agent/act", json={"session_id": session_id, "input": "Add an issue"}
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+
+class TestPlaceholderEndpoints:
+    """Test cases for placeholder endpoints."""
 
     def test_graph_patch_endpoint(self, client):
         """Test the graph patch placeholder endpoint."""
@@ -379,6 +480,76 @@ class TestPlaceholderEndpoints:
         assert "Phase 1" in data["message"]
 
 
+class TestGraphKpiEndpoints:
+    """Test cases for the graph KPI endpoints."""
+
+    def test_get_project_kpis(self, client):
+        """Test reading the KPIs of a project without work items."""
+        response = client.get("/graph/kpis", params={"project_id": "no-such-project"})
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["project_id"] == "no-such-project"
+        assert data["total"] == 0
+        assert data["epics"] == {}
+
+    def test_get_project_kpis_requires_project(self, client):
+        """Test that the project id is required."""
+        response = client.get("/graph/kpis")
+        assert response.status_code == 422
+
+    def test_rebuild_kpis(self, client):
+        """Test the rebuild consistency check."""
+        response = client.post("/graph/kpis/rebuild")
+        assert response.status_code == 200
+        assert response.json()["consistent"] is True
+
+    @pytest.mark.parametrize("path", ["/graph/search", "/graph/similar"])
+    @pytest.mark.parametrize("limit", [0, -1, 101])
+    def test_search_limit_bounds(self, client, path, limit):
+        """Test that search limits outside 1..100 are rejected."""
+        response = client.get(path, params={"q": "signup", "limit": limit})
+        assert response.status_code == 422
+
+
+class TestGraphExportEndpoint:
+    """Test cases for exporting a project slice."""
+
+    def test_export_streams_project(self, client):
+        """Test that a project's nodes and edges arrive as JSON lines."""
+        store = get_graph_store()
+        store.upsert(
+            [
+                AddNode(id="export-p", type="Progetto"),
+                AddNode(
+                    id="export-i", type="Issue", properties={"progetto_id": "export-p"}
+                ),
+                AddEdge(source="export-i", target="export-p", type="PART_OF"),
+            ]
+        )
+
+        response = client.get("/graph/export", params={"project_id": "export-p"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert int(response.headers["x-graph-version"]) == store.version
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["node"]["id"] for line in lines[:2]] == ["export-p", "export-i"]
+        assert lines[2]["edge"]["type"] == "PART_OF"
+
+
+class TestRateLimitEndpoints:
+    """Test cases for route rate limits."""
+
+    def test_rejections_carry_cors_headers(self, client):
+        """Test that a 429 from the rate limiter still passes through CORS."""
+        headers = {"Origin": "http://frontend.example"}
+        responses = [client.get("/agent/missing", headers=headers) for _ in range(11)]
+
+        assert responses[-1].status_code == 429
+        assert "access-control-allow-origin" in responses[-1].headers
+
+
 class TestErrorHandling:
     """Test cases for error handling and edge cases."""
 
@@ -0,0 +1,105 @@
+"""Unit tests for the columnar graph representation."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from graphstore.columnar import ColumnarGraph
+from graphstore.memory import InMemoryGraphStore
+from models.graph import AddEdge, AddNode, Edge, Node
+
+
+@pytest.fixture
+def nodes() -> list[Node]:
+    """Provide an epic with three issues that have sparse properties."""
+    return [
+        Node(id="e1", type="Epic", properties={"name": "Payments"}),
+        Node(id="i1", type="Issue", properties={"name": "A", "status": "pending"}),
+        Node(id="i2", type="Issue", properties={"name": "B", "estimate": None}),
+        Node(id="i3", type="Issue", properties={"status": "pending"}),
+    ]
+
+
+@pytest.fixture
+def edges() -> list[Edge]:
+    """Provide membership and blocking edges, plus one leaving the slice."""
+    return [
+        Edge(source="i1", target="e1", type="PART_OF"),
+        Edge(source="i2", target="e1", type="PART_OF"),
+        Edge(source="i1", target="i2", type="BLOCKS", properties={"hard": True}),
+        Edge(source="i3", target="elsewhere", type="BLOCKS"),
+    ]
+
+
+class TestColumnarGraph:
+    """Test cases for ColumnarGraph."""
+
+    def test_nodes_round_trip(self, nodes, edges):
+        """Test that materialized nodes equal the originals."""
+        graph = ColumnarGraph(nodes, edges)
+
+        assert list(graph.nodes()) == nodes
+        assert graph.node("i2").properties == {"name": "B", "estimate": None}
+
+    def test_edges_round_trip(self, nodes, edges):
+        """Test that edges inside the slice are kept, with their properties."""
+        graph = ColumnarGraph(nodes, edges)
+
+        def key(edge):
+            return (edge.source, edge.target)
+
+        assert sorted(graph.edges(), key=key) == sorted(edges[:3], key=key)
+        assert graph.edge_count == 3
+
+    def test_successors_by_type(self, nodes, edges):
+        """Test CSR adjacency lookups, filtered by edge type."""
+        graph = ColumnarGraph(nodes, edges)
+
+        assert graph.successors("i1") == ["e1", "i2"]
+        assert graph.successors("i1", "BLOCKS") == ["i2"]
+        assert graph.successors("e1") == []
+        assert graph.successors("i1", "UNKNOWN") == []
+
+    def test_columns_and_types(self, nodes):
+        """Test column access without materializing nodes."""
+        graph = ColumnarGraph(nodes)
+
+        assert graph.column("status") == {"i1": "pending", "i3": "pending"}
+        assert graph.value("i2", "status", "n/a") == "n/a"
+        assert graph.node_type("e1") == "Epic"
+        assert graph.node_ids("Issue") == ["i1", "i2", "i3"]
+        assert [n.id for n in graph.nodes("Epic")] == ["e1"]
+
+    def test_repeated_strings_are_shared(self, nodes):
+        """Test that equal property values are stored once."""
+        graph = ColumnarGraph(nodes)
+
+        assert graph.value("i1", "status") is graph.value("i3", "status")
+
+    def test_duplicate_ids_rejected(self, nodes):
+        """Test that two nodes with one id cannot share a slice."""
+        with pytest.raises(ValueError, match="duplicate node id 'i1'"):
+            ColumnarGraph([*nodes, Node(id="i1", type="Issue", properties={})])
+
+    def test_from_store_takes_project_slice(self, nodes, edges):
+        """Test copying one project out of a store with its version."""
+        store = InMemoryGraphStore()
+        store.upsert(
+            [
+                AddNode(id="p1", type="Progetto"),
+                AddNode(id="i1", type="Issue", properties={"progetto_id": "p1"}),
+                AddNode(id="i2", type="Issue", properties={"progetto_id": "p2"}),
+                AddEdge(source="i1", target="p1", type="PART_OF"),
+                AddEdge(source="i2", target="i1", type="BLOCKS"),
+            ]
+        )
+
+        graph, version = ColumnarGraph.from_store(store, "p1")
+
+        assert version == store.version
+        assert graph.node_ids() == ["p1", "i1"]
+        assert [(e.source, e.target) for e in graph.edges()] == [("i1", "p1")]
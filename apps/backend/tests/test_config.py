@@ -22,12 +22,12 @@ def reset_singleton():
 
 
 @pytest.fixture
-def mock_config_data() -> dict[str, Any]:
+def mock_config_data(tmp_path) -> dict[str, Any]:
     """Provide a dictionary with mock configuration data for testing."""
     return {
         "llm_provider": "test_provider",
         "llm_config": {"model": "test_model"},
-        "system": {"logs_path": "test_logs"},
+        "system": {"logs_path": str(tmp_path / "logs")},
         "logging": {
             "log_level": "DEBUG",
             "console_logging": False,
@@ -94,16 +94,17 @@ def test_properties(mock_config_file: str, mock_config_data: dict[str, Any]):
     assert cm.server == mock_config_data["server"]
 
 
-@patch("os.makedirs")
-@patch("os.path.exists", return_value=False)
 def test_setup_logging_creates_log_dir(
-    mock_exists, mock_makedirs, mock_config_file: str
+    mock_config_file: str, mock_config_data: dict[str, Any]
 ):
     """Test that the logging setup creates the log directory if it does not exist."""
+    # The log path is retrieved from the mock config data
+    log_path = Path(mock_config_data["system"]["logs_path"])
+    assert not log_path.exists()
+
     with patch("logging.handlers.RotatingFileHandler") as mock_handler:
         mock_handler.return_value.level = logging.NOTSET
         ConfigManager(config_path=mock_config_file)
-        # The log path is retrieved from the mock config data
-        log_path = "test_logs"
-        mock_exists.assert_called_with(log_path)
-        mock_makedirs.assert_called_with(log_path)
+
+    assert log_path.is_dir()
+    assert mock_handler.call_args.args[0] == log_path / "app.log"
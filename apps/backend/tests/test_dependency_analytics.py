@@ -0,0 +1,145 @@
+"""Unit tests for the dependency analytics engine."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from graphstore.analytics import DependencyAnalytics, DependencyCycleError
+from graphstore.memory import InMemoryGraphStore
+from models.graph import AddEdge, AddNode, Delete, UpdateProps
+
+
+def _issues(*ids: str, estimate: float | None = None) -> list[AddNode]:
+    properties = {} if estimate is None else {"estimate": estimate}
+    return [AddNode(id=i, type="Issue", properties=properties) for i in ids]
+
+
+@pytest.fixture
+def store() -> InMemoryGraphStore:
+    """Provide a store whose dependency graph is a diamond plus a risk.
+
+    risk BLOCKS a, a BLOCKS b, a BLOCKS c, d DEPENDS_ON b, d DEPENDS_ON c.
+    """
+    store = InMemoryGraphStore()
+    store.upsert(
+        [
+            AddNode(id="risk", type="Risk"),
+            *_issues("a", "b", "c", "d"),
+            AddEdge(source="risk", target="a", type="BLOCKS"),
+            AddEdge(source="a", target="b", type="BLOCKS"),
+            AddEdge(source="a", target="c", type="BLOCKS"),
+            AddEdge(source="d", target="b", type="DEPENDS_ON"),
+            AddEdge(source="d", target="c", type="DEPENDS_ON"),
+            AddEdge(source="a", target="risk", type="RELATES_TO"),
+        ]
+    )
+    return store
+
+
+@pytest.fixture
+def analytics(store) -> DependencyAnalytics:
+    """Provide analytics subscribed to the store."""
+    analytics = DependencyAnalytics.from_graph(store.nodes(), store.edges())
+    store.subscribe(analytics.apply)
+    return analytics
+
+
+class TestDependencyAnalytics:
+    """Test cases for DependencyAnalytics."""
+
+    def test_topological_order(self, analytics):
+        """Test that prerequisites come first with deterministic ties."""
+        assert analytics.topological_order() == ["risk", "a", "b", "c", "d"]
+
+    def test_blockers_and_blocked(self, analytics):
+        """Test transitive blocker sets in both directions."""
+        assert analytics.blockers("d") == {"risk", "a", "b", "c"}
+        assert analytics.blocked("risk") == {"a", "b", "c", "d"}
+        assert analytics.blockers("risk") == frozenset()
+
+    def test_critical_path_uses_estimates(self, store, analytics):
+        """Test that the longest weighted chain is found and updated."""
+        assert analytics.critical_path()[0] == 4
+
+        store.upsert([UpdateProps(id="c", properties={"estimate": 5})])
+
+        assert analytics.critical_path() == (8, ["risk", "a", "c", "d"])
+
+    def test_cycle_detection(self, store, analytics):
+        """Test that a closing edge is reported as a cycle."""
+        assert analytics.has_cycle() is False
+
+        store.upsert([AddEdge(source="d", target="a", type="BLOCKS")])
+
+        assert analytics.cycles() == [["a", "b", "c", "d"]]
+        with pytest.raises(DependencyCycleError):
+            analytics.topological_order()
+
+        store.upsert([Delete(entity="edge", source="d", target="a", type="BLOCKS")])
+        assert analytics.has_cycle() is False
+
+    def test_self_loop_is_a_cycle(self, store, analytics):
+        """Test that an issue blocking itself is a cycle."""
+        store.upsert([AddEdge(source="b", target="b", type="BLOCKS")])
+
+        assert analytics.cycles() == [["b"]]
+
+    def test_incremental_updates_invalidate_cached_sets(self, store, analytics):
+        """Test that cached blocker sets follow added and removed edges."""
+        assert analytics.blocked("risk") == {"a", "b", "c", "d"}
+        assert analytics.blockers("d") == {"risk", "a", "b", "c"}
+
+        store.upsert(
+            [
+                *_issues("e"),
+                AddEdge(source="d", target="e", type="BLOCKS"),
+                Delete(entity="edge", source="risk", target="a", type="BLOCKS"),
+            ]
+        )
+
+        assert analytics.blocked("risk") == frozenset()
+        assert analytics.blockers("e") == {"a", "b", "c", "d"}
+
+    def test_deleting_node_removes_its_arcs(self, store, analytics):
+        """Test that deleting a node removes it from every result."""
+        store.upsert([Delete(id="a")])
+
+        assert analytics.blockers("d") == {"b", "c"}
+        assert "a" not in analytics.topological_order()
+
+    def test_edge_stated_twice_counts_once(self, analytics):
+        """Test that BLOCKS and DEPENDS_ON stating the same arc are one arc."""
+        analytics.apply([AddEdge(source="b", target="a", type="DEPENDS_ON")])
+        analytics.apply([Delete(entity="edge", source="a", target="b", type="BLOCKS")])
+
+        assert "a" in analytics.blockers("b")
+        assert analytics.stats()["arcs"] == 5
+
+    def test_dual_stated_edges_keep_full_order(self):
+        """Test that an arc stated by both edge types keeps both maps in step."""
+        analytics = DependencyAnalytics()
+        analytics.apply(
+            [
+                AddEdge(source="a", target="b", type="BLOCKS"),
+                AddEdge(source="b", target="a", type="DEPENDS_ON"),
+                AddEdge(source="b", target="c", type="BLOCKS"),
+            ]
+        )
+
+        assert analytics.topological_order() == ["a", "b", "c"]
+        assert analytics.critical_path() == (3.0, ["a", "b", "c"])
+
+    def test_re_added_edge_is_removed_by_one_delete(self, analytics):
+        """Test that re-upserting an edge leaves no phantom arc after its delete."""
+        edge = AddEdge(source="c", target="e", type="BLOCKS")
+        analytics.apply([edge])
+        analytics.apply([edge])
+        analytics.apply([Delete(entity="edge", source="c", target="e", type="BLOCKS")])
+
+        assert analytics.blockers("e") == frozenset()
+        assert "e" not in analytics.topological_order()
+        assert analytics.stats()["arcs"] == 5
@@ -0,0 +1,191 @@
+"""Unit tests for incremental entity resolution and the in-memory graph store."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from agent.resolver import EntityResolver, normalize_name
+from graphstore.memory import InMemoryGraphStore
+from models.graph import (
+    AddEdge,
+    AddNode,
+    Delete,
+    ExtractedEntity,
+    Node,
+    Patch,
+    UpdateProps,
+)
+
+
+@pytest.fixture
+def existing_nodes() -> list[Node]:
+    """Provide a small project with one epic and one issue."""
+    return [
+        Node(id="p1", type="Progetto", properties={"name": "Shop"}),
+        Node(
+            id="e1",
+            type="Epic",
+            properties={"name": "Payment Gateway", "progetto_id": "p1"},
+        ),
+        Node(
+            id="i1",
+            type="Issue",
+            properties={"name": "Add PayPal", "progetto_id": "p1", "status": "pending"},
+        ),
+    ]
+
+
+def test_normalize_name():
+    """Test that names are compared ignoring case, accents and spacing."""
+    assert normalize_name("  Payment   GATEWAY ") == "payment gateway"
+    assert normalize_name("Attività") == normalize_name("attivita")
+
+
+class TestEntityResolver:
+    """Test cases for EntityResolver."""
+
+    def test_unchanged_entity_produces_no_patch(self, existing_nodes):
+        """Test that re-extracting a known entity writes nothing."""
+        resolver = EntityResolver(existing_nodes)
+        entity = ExtractedEntity(type="Epic", name="payment gateway", progetto_id="p1")
+
+        assert resolver.diff([entity]) == []
+
+    def test_changed_property_produces_update(self, existing_nodes):
+        """Test that only changed properties are emitted."""
+        resolver = EntityResolver(existing_nodes)
+        entity = ExtractedEntity(
+            type="Issue",
+            name="add paypal",
+            progetto_id="p1",
+            properties={"status": "in_progress"},
+        )
+
+        patches = resolver.diff([entity])
+
+        assert len(patches) == 1
+        assert isinstance(patches[0], UpdateProps)
+        assert patches[0].id == "i1"
+        assert patches[0].properties == {"status": "in_progress"}
+
+    def test_match_by_id_wins_over_name(self, existing_nodes):
+        """Test that an explicit id resolves even if the name differs."""
+        resolver = EntityResolver(existing_nodes)
+        entity = ExtractedEntity(
+            id="e1", type="Epic", name="Payments", progetto_id="p1"
+        )
+
+        assert resolver.match(entity).id == "e1"
+
+    def test_same_name_in_other_project_is_new(self, existing_nodes):
+        """Test that names are only matched within the same project."""
+        resolver = EntityResolver(existing_nodes)
+        entity = ExtractedEntity(type="Epic", name="Payment Gateway", progetto_id="p2")
+
+        patches = resolver.diff([entity])
+
+        assert [p.op for p in patches] == ["add_node"]
+        assert patches[0].properties["progetto_id"] == "p2"
+
+    def test_duplicates_in_batch_resolve_to_one_node(self):
+        """Test that an entity repeated in one prompt is only added once."""
+        resolver = EntityResolver([])
+        entities = [
+            ExtractedEntity(type="Issue", name="Refund flow", progetto_id="p1"),
+            ExtractedEntity(type="Issue", name="refund  flow", progetto_id="p1"),
+        ]
+
+        patches = resolver.diff(entities)
+
+        assert [p.op for p in patches] == ["add_node"]
+
+
+class TestInMemoryGraphStore:
+    """Test cases for InMemoryGraphStore."""
+
+    def test_upsert_is_idempotent(self):
+        """Test that applying the same patches twice yields the same graph."""
+        store = InMemoryGraphStore()
+        patches = [
+            Patch(
+                op="add",
+                entity="node",
+                data={"id": "a", "type": "Issue", "properties": {"name": "A"}},
+            ),
+            Patch(
+                op="add",
+                entity="node",
+                data={"id": "b", "type": "Issue", "properties": {"name": "B"}},
+            ),
+            Patch(
+                op="add",
+                entity="edge",
+                data={"source": "a", "target": "b", "type": "BLOCKS"},
+            ),
+        ]
+
+        store.upsert(patches)
+        result = store.upsert(patches)
+
+        assert result["success"] is True
+        assert store.health()["nodes"] == 2
+        assert store.health()["edges"] == 1
+
+    def test_update_missing_node_reports_error(self):
+        """Test that updating an unknown node is reported, not applied."""
+        store = InMemoryGraphStore()
+
+        result = store.upsert(
+            [Patch(op="update", entity="node", data={"id": "x", "properties": {}})]
+        )
+
+        assert result["success"] is False
+        assert result["applied"] == 0
+
+    def test_delete_node_removes_incident_edges(self):
+        """Test that deleting a node also removes its edges."""
+        store = InMemoryGraphStore()
+        store.upsert(
+            [
+                Patch(op="add", entity="node", data={"id": "a", "type": "Issue"}),
+                Patch(op="add", entity="node", data={"id": "b", "type": "Issue"}),
+                Patch(
+                    op="add",
+                    entity="edge",
+                    data={"source": "a", "target": "b", "type": "BLOCKS"},
+                ),
+                Patch(op="delete", entity="node", data={"id": "a"}),
+            ]
+        )
+
+        assert store.get_node("a") is None
+        assert store.edges() == []
+
+    def test_typed_patches_are_applied(self):
+        """Test that typed patches dispatch to the matching operation."""
+        store = InMemoryGraphStore()
+
+        result = store.upsert(
+            [
+                AddNode(id="a", type="Issue", properties={"name": "A"}),
+                AddNode(id="b", type="Issue"),
+                AddEdge(source="a", target="b", type="BLOCKS"),
+                UpdateProps(
+                    entity="edge",
+                    source="a",
+                    target="b",
+                    type="BLOCKS",
+                    properties={"weight": 2},
+                ),
+                UpdateProps(id="a", properties={"status": "done"}),
+                Delete(id="b"),
+            ]
+        )
+
+        assert result == {"success": True, "applied": 6, "errors": []}
+        assert store.get_node("a").properties == {"name": "A", "status": "done"}
+        assert store.edges() == []
@@ -0,0 +1,135 @@
+"""Unit tests for the token-budgeted graph context builder."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from agent.context import GraphContextBuilder, estimate_tokens
+from graphstore.memory import InMemoryGraphStore
+from models.graph import Patch
+
+
+def _node(node_id: str, node_type: str, name: str, **properties) -> Patch:
+    return Patch(
+        op="add",
+        entity="node",
+        data={
+            "id": node_id,
+            "type": node_type,
+            "properties": {"name": name, "progetto_id": "p1", **properties},
+        },
+    )
+
+
+def _edge(source: str, target: str, edge_type: str) -> Patch:
+    return Patch(
+        op="add",
+        entity="edge",
+        data={"source": source, "target": target, "type": edge_type},
+    )
+
+
+@pytest.fixture
+def store() -> InMemoryGraphStore:
+    """Provide a chain epic <- issue <- risk <- far away issue."""
+    store = InMemoryGraphStore()
+    store.upsert(
+        [
+            _node("e1", "Epic", "Payment Gateway"),
+            _node("i1", "Issue", "Add PayPal", status="pending"),
+            _node("r1", "Risk", "Provider outage"),
+            _node("i2", "Issue", "Unrelated cleanup"),
+        ]
+    )
+    store.upsert(
+        [
+            _edge("i1", "e1", "PART_OF"),
+            _edge("r1", "i1", "BLOCKS"),
+            _edge("i2", "r1", "RELATES_TO"),
+        ]
+    )
+    return store
+
+
+class TestGraphContextBuilder:
+    """Test cases for GraphContextBuilder."""
+
+    def test_mentions_match_normalized_names(self, store):
+        """Test that entities are found by name regardless of case."""
+        builder = GraphContextBuilder(store)
+
+        assert builder.find_mentions("What is the status of the payment gateway?") == {
+            "e1"
+        }
+
+    def test_mentions_scan_the_graph_once_per_version(self, store, monkeypatch):
+        """Test that names are read from the store only after it changes."""
+        builder = GraphContextBuilder(store)
+        scans = []
+        nodes = store.nodes
+        monkeypatch.setattr(
+            store, "nodes", lambda **kwargs: scans.append(kwargs) or nodes(**kwargs)
+        )
+
+        assert builder.find_mentions("payment gateway and paypal") == {"e1"}
+        assert builder.find_mentions("add paypal, please") == {"i1"}
+        assert len(scans) == 1
+
+        store.upsert([_node("i3", "Issue", "Refund flow")])
+
+        assert builder.find_mentions("the refund flow") == {"i3"}
+        assert len(scans) == 2
+
+    def test_neighbourhood_is_limited_to_hops(self, store):
+        """Test that nodes beyond the hop radius are not included."""
+        builder = GraphContextBuilder(store, hops=2)
+
+        context = builder.build("payment gateway status")
+
+        assert "[Epic e1] Payment Gateway" in context
+        assert "[Issue i1] Add PayPal | status=pending" in context
+        assert "r1" in context
+        assert "i2" not in context
+        assert "i1 -PART_OF-> e1" in context
+
+    def test_output_is_deterministic(self, store):
+        """Test that equal inputs serialize identically."""
+        first = GraphContextBuilder(store).build("payment gateway")
+        second = GraphContextBuilder(store).build("payment gateway")
+
+        assert first == second
+
+    def test_token_budget_is_respected(self, store):
+        """Test that the context never exceeds the token budget."""
+        builder = GraphContextBuilder(store, token_budget=12)
+
+        context = builder.build("payment gateway")
+
+        assert context.startswith("[Epic e1]")
+        assert estimate_tokens(context) <= 12
+
+    def test_cache_is_invalidated_by_graph_version(self, store):
+        """Test that a cached context is reused until the graph changes."""
+        builder = GraphContextBuilder(store)
+        first = builder.build("payment gateway")
+        assert builder.build("payment gateway") is first
+
+        store.upsert(
+            [
+                Patch(
+                    op="update",
+                    entity="node",
+                    data={"id": "e1", "properties": {"status": "done"}},
+                )
+            ]
+        )
+
+        assert "status=done" in builder.build("payment gateway")
+
+    def test_no_mentions_yields_empty_context(self, store):
+        """Test that questions about unknown entities produce no context."""
+        assert GraphContextBuilder(store).build("hello there") == ""
@@ -0,0 +1,129 @@
+"""Unit tests for the background health checks and probe endpoints."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from api.health import HealthMonitor, probe_event, probe_graph_store
+from main import create_app
+
+
+class CountingProbe:
+    """Probe returning a fixed status and counting its calls."""
+
+    def __init__(self, status: str = "healthy", delay: float = 0.0):
+        """Initialize the probe with its status and latency."""
+        self.status = status
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self) -> dict:
+        """Return the configured status after the configured delay."""
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.status == "error":
+            raise ConnectionError("refused")
+        return {"status": self.status}
+
+
+class TestHealthMonitor:
+    """Tests for running and caching health probes."""
+
+    @pytest.mark.asyncio
+    async def test_not_ready_before_first_pass(self):
+        """Test that readiness waits for the critical probes to run."""
+        monitor = HealthMonitor({"db": CountingProbe()}, critical=("db",))
+
+        assert not monitor.ready
+        assert monitor.checks["db"]["status"] == "unknown"
+
+        await monitor.check()
+
+        assert monitor.ready
+        assert monitor.status == "healthy"
+
+    @pytest.mark.asyncio
+    async def test_failures_and_timeouts(self):
+        """Test that raising and slow probes count as unhealthy."""
+        monitor = HealthMonitor(
+            {
+                "db": CountingProbe("error"),
+                "llm": CountingProbe(delay=1.0),
+            },
+            critical=("db",),
+            timeout=0.05,
+        )
+
+        await monitor.check()
+
+        assert not monitor.ready
+        assert monitor.status == "unhealthy"
+        assert monitor.checks["db"]["error"] == "ConnectionError: refused"
+        assert "timed out" in monitor.checks["llm"]["error"]
+
+    @pytest.mark.asyncio
+    async def test_non_critical_failure_degrades(self):
+        """Test that a failing non-critical probe degrades but keeps readiness."""
+        monitor = HealthMonitor(
+            {"db": CountingProbe(), "llm": CountingProbe("unhealthy")},
+            critical=("db",),
+        )
+
+        await monitor.check()
+
+        assert monitor.ready
+        assert monitor.status == "degraded"
+
+    @pytest.mark.asyncio
+    async def test_background_loop(self):
+        """Test that the monitor probes on its interval until stopped."""
+        probe = CountingProbe()
+        monitor = HealthMonitor({"db": probe}, interval=0.01)
+
+        monitor.start()
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+        assert probe.calls >= 2
+        assert monitor.ready
+
+    @pytest.mark.asyncio
+    async def test_builtin_probes(self):
+        """Test the graph store and event probes."""
+        event = asyncio.Event()
+        probe = probe_event(event)
+
+        assert (await probe())["status"] == "unhealthy"
+        event.set()
+        assert (await probe())["status"] == "healthy"
+        assert (await probe_graph_store())["status"] == "healthy"
+
+
+class TestHealthEndpoints:
+    """Tests for the liveness and readiness endpoints."""
+
+    def test_probes_are_served_from_cache(self):
+        """Test that polling the endpoints never runs a probe."""
+        app = create_app()
+        probe = CountingProbe()
+        probes = dict.fromkeys(("graph_store", "sessions", "llm", "agent"), probe)
+        app.state.health_monitor = HealthMonitor(probes, critical=("graph_store",))
+        client = TestClient(app)
+
+        assert client.get("/health/live").json() == {"status": "alive"}
+        assert client.get("/health/ready").status_code == 503
+
+        asyncio.run(app.state.health_monitor.check())
+        calls = probe.calls
+        for _ in range(20):
+            response = client.get("/health/ready")
+            assert response.status_code == 200
+        assert response.json()["checks"]["graph_store"]["status"] == "healthy"
+        assert client.get("/health/").json()["components"]["database"] == "healthy"
+        assert probe.calls == calls
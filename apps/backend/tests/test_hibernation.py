@@ -0,0 +1,142 @@
+"""Unit tests for session hibernation."""
+
+import asyncio
+import sys
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from api.hibernation import SessionHibernator
+from api.session_manager import SessionManager, SessionNotFoundError
+from api.session_store import MemorySessionStateStore
+from models.session import MessageType
+
+
+@pytest.fixture
+def hibernator(tmp_path: Path) -> SessionHibernator:
+    """Provide a hibernator writing to a temporary directory."""
+    return SessionHibernator(tmp_path / "hibernated")
+
+
+@pytest_asyncio.fixture
+async def manager(hibernator: SessionHibernator):
+    """Provide a started session manager that hibernates into the fixture."""
+    manager = SessionManager(MemorySessionStateStore(), hibernator=hibernator)
+    await manager.start()
+    try:
+        yield manager
+    finally:
+        await manager.stop()
+
+
+class TestHibernation:
+    """Tests for spilling sessions to disk and rehydrating them."""
+
+    @pytest.mark.asyncio
+    async def test_rehydrate_keeps_context_tasks_and_messages(
+        self, manager: SessionManager, hibernator: SessionHibernator
+    ):
+        """Test that a hibernated session comes back with its full state."""
+        session = await manager.create_session("user1")
+        await session.update_project_context({"sprint": 4})
+        await session.add_task({"title": "Review backlog"})
+        await session.send_message("still queued", MessageType.AGENT)
+
+        assert await manager.hibernate_session(session.session_id)
+        assert manager.session_count == 0
+        assert session.session_id in hibernator
+
+        restored = await manager.get_session(session.session_id)
+
+        assert session.session_id not in hibernator
+        assert await restored.get_project_context() == {"sprint": 4}
+        assert [t.title for t in await restored.get_tasks()] == ["Review backlog"]
+        message = await restored.receive_message(timeout=1)
+        assert message.content == "still queued"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_rehydrate_once(
+        self, manager: SessionManager, hibernator: SessionHibernator
+    ):
+        """Test that concurrent requests for a hibernated session share one runtime."""
+        session = await manager.create_session("user1")
+        await session.send_message("still queued", MessageType.AGENT)
+        await manager.hibernate_session(session.session_id)
+
+        first, second = await asyncio.gather(
+            manager.get_session(session.session_id),
+            manager.get_session(session.session_id),
+        )
+
+        assert first is second
+        assert manager.session_count == 1
+        assert (await first.receive_message(timeout=1)).content == "still queued"
+
+    @pytest.mark.asyncio
+    async def test_idle_sessions_are_hibernated(self, manager: SessionManager):
+        """Test that the cleanup pass hibernates sessions past the idle threshold."""
+        idle = await manager.create_session("user1")
+        busy = await manager.create_session("user2")
+        idle.last_activity = datetime.now(UTC) - timedelta(hours=1)
+
+        await manager._cleanup_expired_sessions()
+
+        assert manager.session_count == 1
+        assert len(await manager.list_sessions()) == 2
+        assert (await manager.get_session(idle.session_id)).user_id == "user1"
+        assert (await manager.get_session(busy.session_id)) is busy
+
+    @pytest.mark.asyncio
+    async def test_capacity_hibernates_least_recent(
+        self, manager: SessionManager, hibernator: SessionHibernator
+    ):
+        """Test that creating past max_sessions hibernates instead of destroying."""
+        manager._max_sessions = 1
+        first = await manager.create_session("user1")
+        await manager.create_session("user2")
+
+        assert first.session_id in hibernator
+        assert (await manager.get_session(first.session_id)).user_id == "user1"
+
+    @pytest.mark.asyncio
+    async def test_destroy_hibernated_session(
+        self, manager: SessionManager, hibernator: SessionHibernator
+    ):
+        """Test that destroying a hibernated session removes its file."""
+        session = await manager.create_session("user1")
+        await manager.hibernate_session(session.session_id)
+
+        assert await manager.destroy_session(session.session_id)
+
+        assert len(hibernator) == 0
+        with pytest.raises(SessionNotFoundError):
+            await manager.get_session(session.session_id)
+
+    @pytest.mark.asyncio
+    async def test_cleanup_keeps_other_workers_files(
+        self, hibernator: SessionHibernator
+    ):
+        """Test that a worker's cleanup only drops files of dead sessions."""
+        store = MemorySessionStateStore()
+        worker_a = SessionManager(store, "worker-a", hibernator)
+        worker_b = SessionManager(store, "worker-b", hibernator)
+        kept = await worker_a.create_session("user1")
+        dropped = await worker_a.create_session("user2")
+        await kept.send_message("still queued", MessageType.AGENT)
+        await worker_a.hibernate_session(kept.session_id)
+        await worker_a.hibernate_session(dropped.session_id)
+        store.delete(dropped.session_id)
+
+        await worker_b._cleanup_expired_sessions()
+
+        assert kept.session_id in hibernator
+        assert dropped.session_id not in hibernator
+        restored = await worker_b.get_session(kept.session_id)
+        assert (await restored.receive_message(timeout=1)).content == "still queued"
+        await worker_a.stop()
+        await worker_b.stop()
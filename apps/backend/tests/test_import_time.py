@@ -0,0 +1,86 @@
+"""Import-time regression tests for the application module.
+
+``python -X importtime -c "import main"`` runs in a fresh interpreter and its
+report is parsed. The test fails when a heavy subsystem that should load on
+first use is imported with the application, or when importing the
+application takes longer than ``IMPORT_BUDGET_SECONDS`` (overridable with the
+``BACKEND_IMPORT_BUDGET`` environment variable); the slowest imports are
+printed with the failure.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+BACKEND_DIR = Path(__file__).parent.parent.resolve()
+
+# Loaded on first use or during startup, never by importing the application
+DEFERRED_MODULES = ("langgraph", "langchain_core", "numpy", "httpx")
+
+IMPORT_BUDGET_SECONDS = float(os.environ.get("BACKEND_IMPORT_BUDGET", "1.5"))
+
+
+class ImportTime(NamedTuple):
+    """One line of the ``-X importtime`` report, in microseconds."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def profile_import(module: str) -> list[ImportTime]:
+    """Import ``module`` in a fresh interpreter and return its import times."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times.append(ImportTime(name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def report(times: list[ImportTime], top: int = 15) -> str:
+    """Return the slowest imports by cumulative time."""
+    lines = [f"{'cumulative ms':>14} {'self ms':>8}  module"]
+    for entry in sorted(times, key=lambda t: t.cumulative_us, reverse=True)[:top]:
+        lines.append(
+            f"{entry.cumulative_us / 1000:14.1f} {entry.self_us / 1000:8.1f}"
+            f"  {entry.module}"
+        )
+    return "\n".join(lines)
+
+
+class TestImportTime:
+    """Tests for the cost of importing the application."""
+
+    def test_heavy_subsystems_are_deferred(self):
+        """Test that importing the application loads no deferred subsystem."""
+        times = profile_import("main")
+        loaded = sorted(
+            {
+                entry.module
+                for entry in times
+                if entry.module.split(".")[0] in DEFERRED_MODULES
+            }
+        )
+
+        assert not loaded, f"imported with main: {loaded}\n{report(times)}"
+
+    def test_import_within_budget(self):
+        """Test that importing the application stays within its time budget."""
+        # Best of two runs, to keep a cold disk cache from failing the test
+        runs = [profile_import("main") for _ in range(2)]
+        best = min(runs, key=lambda times: times[-1].cumulative_us)
+        total = best[-1]
+
+        assert total.module == "main"
+        assert total.cumulative_us / 1e6 < IMPORT_BUDGET_SECONDS, report(best)
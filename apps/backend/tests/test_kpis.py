@@ -0,0 +1,153 @@
+"""Unit tests for the materialized project KPIs."""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from graphstore.kpis import KPIMaterializer
+from graphstore.memory import InMemoryGraphStore
+from models.graph import AddNode, Delete, UpdateProps
+
+TODAY = date(2026, 3, 15)
+
+
+def _issue(node_id: str, **properties) -> AddNode:
+    return AddNode(
+        id=node_id, type="Issue", properties={"progetto_id": "p1", **properties}
+    )
+
+
+@pytest.fixture
+def store() -> InMemoryGraphStore:
+    """Provide a store with one project, two epics and four issues."""
+    store = InMemoryGraphStore()
+    store.upsert(
+        [
+            AddNode(id="p1", type="Progetto", properties={"name": "Apollo"}),
+            AddNode(id="e1", type="Epic", properties={"progetto_id": "p1"}),
+            AddNode(id="e2", type="Epic", properties={"progetto_id": "p1"}),
+            _issue("i1", epic_id="e1", status="completed", due_date="2026-03-01"),
+            _issue("i2", epic_id="e1", priority="high", due_date="2026-03-10"),
+            _issue("i3", epic_id="e2", status="in_progress", due_date="2026-04-01"),
+            _issue("i4"),
+        ]
+    )
+    return store
+
+
+@pytest.fixture
+def kpis(store: InMemoryGraphStore) -> KPIMaterializer:
+    """Provide a materializer subscribed to the store."""
+    kpis = KPIMaterializer.from_nodes(store.nodes())
+    store.subscribe(kpis.apply)
+    return kpis
+
+
+class TestAggregates:
+    """Tests for the project and epic aggregates."""
+
+    def test_project_kpis(self, kpis: KPIMaterializer):
+        """Test counts, progress and overdue items of a project."""
+        report = kpis.project("p1", today=TODAY)
+
+        assert report["total"] == 4
+        assert report["completed"] == 1
+        assert report["progress"] == 0.25
+        assert report["by_status"] == {
+            "completed": 1,
+            "pending": 2,
+            "in_progress": 1,
+        }
+        assert report["by_priority"] == {"medium": 3, "high": 1}
+        # i1 is past due but completed, i3 is not due yet.
+        assert report["overdue"] == 1
+        assert set(report["epics"]) == {"e1", "e2"}
+
+    def test_epic_kpis(self, kpis: KPIMaterializer):
+        """Test the aggregate of a single epic."""
+        report = kpis.epic("e1", today=TODAY)
+
+        assert report["total"] == 2
+        assert report["progress"] == 0.5
+
+    def test_unknown_project_is_empty(self, kpis: KPIMaterializer):
+        """Test that a project without work items reports zeros."""
+        report = kpis.project("missing", today=TODAY)
+
+        assert report["total"] == 0
+        assert report["progress"] == 0.0
+        assert report["epics"] == {}
+
+
+class TestIncrementalUpdates:
+    """Tests for keeping the aggregates in sync with applied patches."""
+
+    def test_status_update_moves_counts(
+        self, store: InMemoryGraphStore, kpis: KPIMaterializer
+    ):
+        """Test that completing an issue updates progress and overdue work."""
+        store.upsert([UpdateProps(id="i2", properties={"status": "completed"})])
+
+        report = kpis.project("p1", today=TODAY)
+        assert report["completed"] == 2
+        assert report["overdue"] == 0
+        assert kpis.epic("e1", today=TODAY)["progress"] == 1.0
+
+    def test_moving_issue_between_epics(
+        self, store: InMemoryGraphStore, kpis: KPIMaterializer
+    ):
+        """Test that re-parenting an issue moves it between epic aggregates."""
+        store.upsert([UpdateProps(id="i3", properties={"epic_id": "e1"})])
+
+        assert kpis.epic("e1")["total"] == 3
+        assert kpis.epic("e2")["total"] == 0
+        assert set(kpis.project("p1")["epics"]) == {"e1"}
+
+    def test_delete_removes_contribution(
+        self, store: InMemoryGraphStore, kpis: KPIMaterializer
+    ):
+        """Test that deleting a node drops it from every aggregate."""
+        store.upsert([Delete(id="i1"), Delete(id="i2")])
+
+        assert kpis.project("p1")["total"] == 2
+        assert "e1" not in kpis.project("p1")["epics"]
+
+    def test_non_work_items_are_ignored(
+        self, store: InMemoryGraphStore, kpis: KPIMaterializer
+    ):
+        """Test that nodes other than tasks and issues do not count."""
+        store.upsert([AddNode(id="r1", type="Risk", properties={"progetto_id": "p1"})])
+
+        assert kpis.project("p1")["total"] == 4
+
+    def test_incremental_matches_rebuild(
+        self, store: InMemoryGraphStore, kpis: KPIMaterializer
+    ):
+        """Test that the incremental aggregates equal a full rebuild."""
+        store.upsert(
+            [
+                UpdateProps(id="i4", properties={"status": "completed"}),
+                _issue("i5", epic_id="e2", priority="low"),
+                Delete(id="i3"),
+                AddNode(id="i1", type="Issue", properties={"status": "pending"}),
+            ]
+        )
+
+        assert kpis.verify(store.nodes())
+
+    def test_rebuild_repairs_drift(
+        self, store: InMemoryGraphStore, kpis: KPIMaterializer
+    ):
+        """Test that a rebuild recomputes aggregates the store disagrees with."""
+        kpis.apply([_issue("ghost")])
+        assert not kpis.verify(store.nodes())
+
+        kpis.rebuild(store.nodes())
+
+        assert kpis.verify(store.nodes())
+        assert kpis.project("p1")["total"] == 4
@@ -0,0 +1,169 @@
+"""Unit tests for the hedged LLM dispatch layer."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from agent import llm
+from agent.llm import LatencyTracker, LLMDispatcher, LLMError, LLMProvider
+
+
+class FakeProvider(LLMProvider):
+    """Local provider that answers after an injected delay."""
+
+    def __init__(self, name: str, delay: float, fail: bool = False):
+        """Initialize the fake with its delay and failure mode."""
+        super().__init__(name)
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.closed = False
+
+    async def complete(self, prompt: str) -> str:
+        """Answer after the injected delay, tracking concurrency."""
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        if self.fail:
+            raise RuntimeError(f"{self.name} is down")
+        return f"{self.name}: {prompt}"
+
+    async def ping(self):
+        """Fail when the provider is configured to fail."""
+        if self.fail:
+            raise RuntimeError(f"{self.name} is down")
+
+    async def aclose(self):
+        """Record that the provider was closed."""
+        self.closed = True
+
+
+class TestLLMDispatcher:
+    """Test cases for LLMDispatcher."""
+
+    @pytest.mark.asyncio
+    async def test_ping_reports_each_provider(self):
+        """Test that ping returns an error only for unreachable providers."""
+        dispatcher = LLMDispatcher(
+            [FakeProvider("remote", 0, fail=True), FakeProvider("local", 0)]
+        )
+
+        assert await dispatcher.ping() == {
+            "remote": "RuntimeError: remote is down",
+            "local": None,
+        }
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        """Test that a primary answering within the hedge delay wins alone."""
+        primary = FakeProvider("remote", delay=0.01)
+        backup = FakeProvider("local", delay=0.01)
+        dispatcher = LLMDispatcher([primary, backup], default_hedge_delay=0.2)
+
+        result = await dispatcher.complete("hi")
+
+        assert result.provider == "remote"
+        assert result.hedged is False
+        assert backup.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self):
+        """Test that a hedge starts after the delay and the loser is cancelled."""
+        primary = FakeProvider("remote", delay=1.0)
+        backup = FakeProvider("local", delay=0.01)
+        dispatcher = LLMDispatcher([primary, backup], default_hedge_delay=0.05)
+
+        result = await dispatcher.complete("hi")
+        await asyncio.sleep(0)
+
+        assert result.provider == "local"
+        assert result.hedged is True
+        assert result.latency < 0.5
+        assert primary.cancelled == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_primary_falls_back_immediately(self):
+        """Test that a failing primary does not wait for the hedge delay."""
+        primary = FakeProvider("remote", delay=0.0, fail=True)
+        backup = FakeProvider("local", delay=0.01)
+        dispatcher = LLMDispatcher([primary, backup], default_hedge_delay=5.0)
+
+        result = await dispatcher.complete("hi")
+
+        assert result.provider == "local"
+        assert dispatcher.stats()["remote"]["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_all_providers_failing_raises(self):
+        """Test that an error is raised when no provider answers."""
+        dispatcher = LLMDispatcher(
+            [FakeProvider("a", 0.0, fail=True), FakeProvider("b", 0.0, fail=True)]
+        )
+
+        with pytest.raises(LLMError):
+            await dispatcher.complete("hi")
+
+    @pytest.mark.asyncio
+    async def test_per_provider_concurrency_limit(self):
+        """Test that in-flight calls per provider never exceed the limit."""
+        provider = FakeProvider("remote", delay=0.02)
+        dispatcher = LLMDispatcher([provider], max_concurrency=2)
+
+        await asyncio.gather(*(dispatcher.complete(str(i)) for i in range(6)))
+
+        assert provider.max_in_flight == 2
+        assert dispatcher.stats()["remote"]["wins"] == 6
+
+    @pytest.mark.asyncio
+    async def test_faster_provider_becomes_primary(self):
+        """Test that observed latency reorders providers."""
+        slow = FakeProvider("remote", delay=0.03)
+        fast = FakeProvider("local", delay=0.0)
+        dispatcher = LLMDispatcher([slow, fast], default_hedge_delay=0.0)
+
+        for _ in range(6):
+            await dispatcher.complete("warmup")
+        result = await dispatcher.complete("hi")
+
+        assert result.provider == "local"
+        assert result.hedged is False
+
+
+@pytest.mark.asyncio
+async def test_closing_the_global_dispatcher(monkeypatch: pytest.MonkeyPatch):
+    """Test that closing the global dispatcher closes its providers."""
+    providers = [FakeProvider("remote", 0), FakeProvider("local", 0)]
+    dispatcher = LLMDispatcher(providers)
+    monkeypatch.setattr(llm, "_llm_dispatcher", dispatcher)
+
+    await llm.close_llm_dispatcher()
+
+    assert all(provider.closed for provider in providers)
+    assert llm._llm_dispatcher is None
+
+
+def test_latency_tracker_quantile():
+    """Test quantiles and the default before enough samples exist."""
+    tracker = LatencyTracker()
+    assert tracker.quantile(0.95, default=2.0) == 2.0
+
+    for latency in range(1, 101):
+        tracker.record(latency / 100)
+
+    assert tracker.quantile(0.5, default=2.0) == pytest.approx(0.51)
+    assert tracker.quantile(0.95, default=2.0) == pytest.approx(0.96)
@@ -0,0 +1,168 @@
+"""Unit tests for the logging handlers and filters."""
+
+import json
+import logging
+import queue
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from config import ConfigManager
+from config.logs import DebugSampler, DeferredQueueHandler, JsonFormatter
+
+
+def make_record(level: int = logging.DEBUG, **extra) -> logging.LogRecord:
+    """Build a record of the session logger."""
+    record = logging.LogRecord(
+        "api.user_session", level, __file__, 1, "Handled %s", ("msg-1",), None
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.fixture
+def root_logger():
+    """Restore the root logger and the ConfigManager singleton after a test."""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    ConfigManager._instance = None
+    try:
+        yield root
+    finally:
+        config = ConfigManager._instance
+        if config is not None:
+            config.stop_logging()
+        ConfigManager._instance = None
+        for handler in root.handlers:
+            handler.close()
+        root.handlers[:] = handlers
+        root.setLevel(level)
+        for name in ("api.user_session", "api.session_manager"):
+            logging.getLogger(name).filters.clear()
+
+
+def write_config(tmp_path: Path, **logging_config) -> str:
+    """Write a configuration logging to ``tmp_path/logs``."""
+    config_file = tmp_path / "config.json"
+    config_file.write_text(
+        json.dumps(
+            {
+                "system": {"logs_path": str(tmp_path / "logs")},
+                "logging": {"console_logging": False, **logging_config},
+            }
+        )
+    )
+    return str(config_file)
+
+
+class TestFormatting:
+    """Tests for the JSON formatter."""
+
+    def test_json_fields(self):
+        """Test that records become JSON objects including extra fields."""
+        entry = json.loads(JsonFormatter().format(make_record(session_id="s-1")))
+
+        assert entry["level"] == "DEBUG"
+        assert entry["logger"] == "api.user_session"
+        assert entry["message"] == "Handled msg-1"
+        assert entry["session_id"] == "s-1"
+        assert "timestamp" in entry
+
+    def test_json_exception(self):
+        """Test that exception tracebacks are included."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = make_record(logging.ERROR)
+            record.exc_info = sys.exc_info()
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert "ValueError: boom" in entry["exception"]
+
+
+class TestSampling:
+    """Tests for sampling DEBUG records."""
+
+    def test_keeps_one_in_n_debug_records(self):
+        """Test that a tenth of the DEBUG records and all others pass."""
+        sampler = DebugSampler(0.1)
+
+        debug = [sampler.filter(make_record()) for _ in range(100)]
+        info = [sampler.filter(make_record(logging.INFO)) for _ in range(10)]
+
+        assert sum(debug) == 10
+        assert all(info)
+
+    def test_zero_rate_drops_debug(self):
+        """Test that a rate of zero drops every DEBUG record."""
+        assert not DebugSampler(0).filter(make_record())
+
+
+class TestQueuedLogging:
+    """Tests for writing log records from a background thread."""
+
+    def test_queue_writes_json_lines(self, tmp_path: Path, root_logger):
+        """Test that queued records reach the log file once flushed."""
+        config = ConfigManager(
+            write_config(tmp_path, log_level="DEBUG", queue=True, format="json")
+        )
+        assert isinstance(root_logger.handlers[0], DeferredQueueHandler)
+
+        logging.getLogger("api.session_manager").info("Created session %s", "s-1")
+        config.stop_logging()
+
+        lines = (tmp_path / "logs" / "app.log").read_text().splitlines()
+        messages = [json.loads(line)["message"] for line in lines]
+        assert "Created session s-1" in messages
+        assert not any(
+            isinstance(h, DeferredQueueHandler) for h in root_logger.handlers
+        )
+
+    def test_flush_keeps_queue(self, tmp_path: Path, root_logger):
+        """Test that flushing writes queued records and keeps queueing."""
+        config = ConfigManager(write_config(tmp_path, queue=True))
+        logger = logging.getLogger("api.session_manager")
+
+        logger.info("first")
+        config.flush_logging()
+        logger.info("second")
+        config.flush_logging()
+
+        text = (tmp_path / "logs" / "app.log").read_text()
+        assert "first" in text
+        assert "second" in text
+        assert isinstance(root_logger.handlers[0], DeferredQueueHandler)
+
+    def test_records_are_resolved_before_queueing(self):
+        """Test that queued records carry text, not arguments or tracebacks."""
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        arguments = ["msg-1"]
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = make_record(logging.ERROR)
+            record.args, record.exc_info = (arguments,), sys.exc_info()
+        DeferredQueueHandler(log_queue).handle(record)
+        arguments.append("changed later")
+
+        prepared = log_queue.get_nowait()
+        entry = json.loads(JsonFormatter().format(prepared))
+
+        assert prepared is not record
+        assert prepared.args is None
+        assert prepared.exc_info is None
+        assert entry["message"] == "Handled ['msg-1']"
+        assert "ValueError: boom" in entry["exception"]
+
+    def test_sampler_installed_on_session_loggers(self, tmp_path: Path, root_logger):
+        """Test that the sample rate only applies to the session loggers."""
+        ConfigManager(write_config(tmp_path, debug_sample_rate=0.5))
+
+        filters = logging.getLogger("api.user_session").filters
+        assert [type(f) for f in filters] == [DebugSampler]
+        assert not logging.getLogger("graphstore").filters
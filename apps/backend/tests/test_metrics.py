@@ -0,0 +1,70 @@
+"""Unit tests for the Prometheus metrics."""
+
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from api.metrics import Gauge, Histogram, MetricsRegistry
+from main import create_app
+
+
+class TestExposition:
+    """Tests for rendering metrics in the text format."""
+
+    def test_histogram(self):
+        """Test cumulative buckets, sum and count of a histogram."""
+        histogram = Histogram("latency", "Latency.", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 3.0):
+            histogram.observe(value, ("/a",))
+
+        assert histogram.render().splitlines() == [
+            "# HELP latency Latency.",
+            "# TYPE latency histogram",
+            'latency_bucket{route="/a",le="0.1"} 1',
+            'latency_bucket{route="/a",le="1"} 3',
+            'latency_bucket{route="/a",le="+Inf"} 4',
+            'latency_sum{route="/a"} 4.05',
+            'latency_count{route="/a"} 4',
+        ]
+
+    def test_gauges(self):
+        """Test set and callback gauges, including label escaping."""
+        registry = MetricsRegistry()
+        registry.register(Gauge("depth", "Depth.", ("q",))).set(2, ('a"b',))
+        registry.register(Gauge("unknown", "Not measured yet.", callback=lambda: None))
+        registry.register(Gauge("live", "Live.", callback=lambda: 7))
+
+        lines = registry.render().splitlines()
+
+        assert 'depth{q="a\\"b"} 2' in lines
+        assert not any(line.startswith("unknown") for line in lines)
+        assert "live 7" in lines
+
+
+class TestMetricsEndpoint:
+    """Tests for the request metrics and the /metrics endpoint."""
+
+    def test_requests_are_recorded_by_route(self):
+        """Test that requests are labelled with their route template."""
+        client = TestClient(create_app())
+        client.get("/health/")
+        client.get("/sessions/00000000-0000-0000-0000-000000000000")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        assert (
+            'http_request_duration_seconds_count{method="GET",route="/health/",'
+            'status="200"} 1'
+        ) in body
+        assert 'route="/sessions/{session_id}",status="404"' in body
+        assert "http_requests_in_flight 1" in body
+        assert "sessions_live " in body
+        assert 'session_queue_depth{direction="input"}' in body
+        assert 'agent_admission_runs{state="queued"} 0' in body
@@ -0,0 +1,133 @@
+"""Unit tests for the fuzzy name index."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from agent.name_index import NameIndex
+from graphstore.memory import InMemoryGraphStore
+from models.graph import AddNode, Delete, UpdateProps
+
+
+@pytest.fixture
+def store() -> InMemoryGraphStore:
+    """Provide a store with a few named entities in two projects."""
+    store = InMemoryGraphStore()
+    store.upsert(
+        [
+            AddNode(
+                id="e1",
+                type="Epic",
+                properties={
+                    "name": "Payment Gateway",
+                    "progetto_id": "p1",
+                    "description": "Card processing and refunds",
+                },
+            ),
+            AddNode(
+                id="e2",
+                type="Epic",
+                properties={"name": "Onboarding", "progetto_id": "p1"},
+            ),
+            AddNode(
+                id="i1",
+                type="Issue",
+                properties={"name": "Fix payment retries", "progetto_id": "p2"},
+            ),
+            AddNode(
+                id="u1",
+                type="Utente",
+                properties={"name": "Mario Rossi", "progetto_id": "p1"},
+            ),
+            AddNode(id="r1", type="Risk", properties={"name": "Payment outage"}),
+        ]
+    )
+    return store
+
+
+@pytest.fixture
+def index(store: InMemoryGraphStore) -> NameIndex:
+    """Provide an index subscribed to the store."""
+    index = NameIndex.from_nodes(store.nodes())
+    store.subscribe(index.apply)
+    return index
+
+
+class TestSearch:
+    """Tests for fuzzy and full-text lookup."""
+
+    def test_typo_tolerant_match(self, index: NameIndex):
+        """Test that a misspelled name still finds the entity."""
+        matches = index.search("paymnet gatway")
+
+        assert matches[0].id == "e1"
+        assert matches[0].name == "Payment Gateway"
+
+    def test_word_match_in_name(self, index: NameIndex):
+        """Test that a single word of a longer name is found."""
+        assert index.search("Mario's issues")[0].id == "u1"
+
+    def test_description_match(self, index: NameIndex):
+        """Test that description words find the entity."""
+        assert [m.id for m in index.search("refunds")] == ["e1"]
+
+    def test_accents_and_case_are_ignored(self, index: NameIndex):
+        """Test that matching uses the resolver normalization."""
+        assert index.search("ONBOÀRDING")[0].id == "e2"
+
+    def test_filters(self, index: NameIndex):
+        """Test the type and project filters."""
+        assert [m.id for m in index.search("payment", node_type="Issue")] == ["i1"]
+        assert {m.id for m in index.search("payment", progetto_id="p1")} == {"e1"}
+
+    def test_unindexed_types_are_skipped(self, index: NameIndex):
+        """Test that only the configured node types are indexed."""
+        assert "r1" not in {m.id for m in index.search("payment outage")}
+        assert len(index) == 4
+
+    def test_limit_and_ordering(self, index: NameIndex):
+        """Test that matches come best first and are capped."""
+        matches = index.search("payment", limit=1)
+
+        assert len(matches) == 1
+        assert matches[0].score >= 0.5
+
+    def test_empty_query(self, index: NameIndex):
+        """Test that a blank query matches nothing."""
+        assert index.search("   ") == []
+
+
+class TestUpdates:
+    """Tests for keeping the index in sync with applied patches."""
+
+    def test_rename(self, store: InMemoryGraphStore, index: NameIndex):
+        """Test that a renamed entity is found under its new name only."""
+        store.upsert([UpdateProps(id="e2", properties={"name": "Checkout Flow"})])
+
+        assert index.search("checkout")[0].id == "e2"
+        assert "e2" not in {m.id for m in index.search("onboarding")}
+
+    def test_partial_update_keeps_name(
+        self, store: InMemoryGraphStore, index: NameIndex
+    ):
+        """Test that updating other properties keeps the entity indexed."""
+        store.upsert([UpdateProps(id="e1", properties={"status": "done"})])
+
+        assert index.search("payment gateway")[0].id == "e1"
+
+    def test_delete(self, store: InMemoryGraphStore, index: NameIndex):
+        """Test that deleted entities disappear from results."""
+        store.upsert([Delete(id="u1")])
+
+        assert index.search("mario rossi") == []
+        assert len(index) == 3
+
+    def test_retyped_node_is_indexed(self, store: InMemoryGraphStore, index: NameIndex):
+        """Test that a node becoming an indexed type keeps its stored name."""
+        store.upsert([AddNode(id="r1", type="Issue")])
+
+        assert index.search("payment outage")[0].id == "r1"
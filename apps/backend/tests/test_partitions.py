@@ -0,0 +1,202 @@
+"""Unit tests for the per-project write partitions."""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from agent import graph
+from graphstore.memory import InMemoryGraphStore
+from graphstore.partitions import ProjectPartitions
+from models.graph import AddNode, Delete, ExtractedEntity
+
+
+@pytest.fixture
+def partitions() -> ProjectPartitions:
+    """Provide partitions over an empty store."""
+    return ProjectPartitions(InMemoryGraphStore())
+
+
+@pytest.fixture
+def agent_store(partitions: ProjectPartitions, monkeypatch) -> list[int]:
+    """Point the agent graph at the partitions and count its re-diffs."""
+    monkeypatch.setattr(graph, "get_graph_store", lambda: partitions._store)
+    monkeypatch.setattr(graph, "get_project_partitions", lambda: partitions)
+    rediffs: list[int] = []
+    resolve_patches = graph._resolve_patches
+
+    def count(*args):
+        rediffs.append(1)
+        return resolve_patches(*args)
+
+    monkeypatch.setattr(graph, "_resolve_patches", count)
+    return rediffs
+
+
+def _resolved(name: str, project_id: str) -> dict:
+    entities = [ExtractedEntity(type="Issue", name=name, progetto_id=project_id)]
+    state = {"project_id": project_id, "validated_entities": entities}
+    return {**state, **graph.resolve(state)}
+
+
+class TestProjectPartitions:
+    """Tests for routing writes to project partitions."""
+
+    @pytest.mark.asyncio
+    async def test_projects_write_concurrently(self, partitions: ProjectPartitions):
+        """Test that a writer on one project does not block another project."""
+        release = asyncio.Event()
+
+        async def hold_p1():
+            async with partitions.write("p1"):
+                await release.wait()
+
+        holder = asyncio.create_task(hold_p1())
+        await asyncio.sleep(0)
+
+        result = await asyncio.wait_for(
+            partitions.upsert("p2", [AddNode(id="a", type="Issue")]), timeout=1
+        )
+        release.set()
+        await holder
+
+        assert result["success"]
+        assert partitions.stats()["writes"] == 2
+
+    @pytest.mark.asyncio
+    async def test_project_writes_are_serialized_in_order(
+        self, partitions: ProjectPartitions
+    ):
+        """Test that writers of one project run one at a time, first come first."""
+        events = []
+
+        async def writer(name: str):
+            async with partitions.write("p1"):
+                events.append(f"{name}:start")
+                await asyncio.sleep(0)
+                events.append(f"{name}:end")
+
+        await asyncio.gather(writer("a"), writer("b"), writer("c"))
+
+        assert events == [
+            "a:start",
+            "a:end",
+            "b:start",
+            "b:end",
+            "c:start",
+            "c:end",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_idle_partitions_are_dropped(self, partitions: ProjectPartitions):
+        """Test that a partition is removed once nobody holds or awaits it."""
+        async with partitions.write("p1"):
+            assert partitions.stats()["active"] == {
+                "p1": {"locked": True, "waiting": 0}
+            }
+
+        assert partitions.stats()["active"] == {}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self, partitions: ProjectPartitions):
+        """Test that cancelling a queued writer does not leak the partition."""
+        release = asyncio.Event()
+
+        async def hold():
+            async with partitions.write("p1"):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(partitions.upsert("p1", []))
+        await asyncio.sleep(0)
+        assert partitions.stats()["active"]["p1"]["waiting"] == 1
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        release.set()
+        await holder
+
+        assert partitions.stats()["active"] == {}
+
+    @pytest.mark.asyncio
+    async def test_thread_readers_see_whole_versions(
+        self, partitions: ProjectPartitions
+    ):
+        """Test that a batch waits for a thread reading under the store lock."""
+        store = partitions._store
+        reading = threading.Event()
+        release = threading.Event()
+
+        def read() -> tuple[int, int]:
+            with store.lock:
+                before = store.version
+                reading.set()
+                release.wait()
+                return before, len(store.nodes())
+
+        reader = asyncio.create_task(asyncio.to_thread(read))
+        await asyncio.to_thread(reading.wait)
+        writer = asyncio.create_task(
+            asyncio.to_thread(store.upsert, [AddNode(id="a", type="Issue")])
+        )
+        await asyncio.sleep(0.05)
+        assert not writer.done()
+
+        release.set()
+        assert await reader == (0, 0)
+        assert (await writer)["applied"] == 1
+        assert store.version == 1
+
+
+class TestProjectVersions:
+    """Tests for per-project versions and the agent's stale-diff check."""
+
+    def test_store_tracks_project_versions(self):
+        """Test that a batch only advances the versions of the projects it wrote."""
+        store = InMemoryGraphStore()
+        store.upsert([AddNode(id="a", type="Issue", properties={"progetto_id": "p1"})])
+        store.upsert([AddNode(id="b", type="Issue", properties={"progetto_id": "p2"})])
+        store.upsert([AddNode(id="c", type="Issue")])
+        store.upsert([Delete(id="a")])
+
+        assert store.project_versions() == {"p1": 4, "p2": 2, None: 3}
+        assert store.project_version("p3") == 0
+
+    @pytest.mark.asyncio
+    async def test_other_projects_keep_the_diff(
+        self, partitions: ProjectPartitions, agent_store: list[int]
+    ):
+        """Test that a write to another project does not force a re-diff."""
+        state = _resolved("Login bug", "p1")
+        agent_store.clear()
+        partitions._store.upsert(
+            [AddNode(id="x", type="Issue", properties={"progetto_id": "p2"})]
+        )
+
+        result = await graph.upsert(state)
+
+        assert result["upsert_results"]["applied"] == 1
+        assert agent_store == []
+
+    @pytest.mark.asyncio
+    async def test_same_project_write_rediffs(
+        self, partitions: ProjectPartitions, agent_store: list[int]
+    ):
+        """Test that a diff made stale by its own project is redone."""
+        first = _resolved("Login bug", "p1")
+        second = _resolved("Login bug", "p1")
+        agent_store.clear()
+
+        assert (await graph.upsert(first))["upsert_results"]["applied"] == 1
+        result = await graph.upsert(second)
+
+        assert agent_store == [1]
+        assert result["patches"] == []
+        assert len(partitions._store.nodes(progetto_id="p1")) == 1
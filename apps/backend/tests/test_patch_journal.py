@@ -0,0 +1,199 @@
+"""Unit tests for the segmented patch journal."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from graphstore.journal import PatchJournal, maintain_journal
+from graphstore.memory import InMemoryGraphStore
+from models.graph import AddEdge, AddNode, Delete, UpdateProps
+
+
+@pytest.fixture
+def journal(tmp_path: Path) -> PatchJournal:
+    """Provide a journal with small segments holding a short history.
+
+    t=10 add a and b, t=20 update a, t=30 link a to b, t=40 delete b,
+    t=50 add c.
+    """
+    journal = PatchJournal(tmp_path, segment_bytes=200, fsync_every=2)
+    journal.append(
+        [
+            AddNode(id="a", type="Issue", properties={"status": "pending"}),
+            AddNode(id="b", type="Issue"),
+        ],
+        version=1,
+        timestamp=10.0,
+    )
+    journal.append(
+        [UpdateProps(id="a", properties={"status": "completed"})],
+        version=2,
+        timestamp=20.0,
+    )
+    journal.append(
+        [AddEdge(source="a", target="b", type="BLOCKS")], version=3, timestamp=30.0
+    )
+    journal.append([Delete(id="b")], version=4, timestamp=40.0)
+    journal.append([AddNode(id="c", type="Epic")], version=5, timestamp=50.0)
+    yield journal
+    journal.close()
+
+
+class TestAppend:
+    """Tests for writing and reopening the journal."""
+
+    def test_segments_roll_over(self, journal: PatchJournal):
+        """Test that small segments are sealed with a persisted index."""
+        stats = journal.stats()
+
+        assert stats["records"] == 5
+        assert stats["segments"] > 1
+        assert list(journal.directory.glob("segment-*.idx"))
+
+    def test_fsync_is_batched(self, tmp_path: Path):
+        """Test that records are synced in batches rather than one by one."""
+        journal = PatchJournal(tmp_path, fsync_every=3, fsync_interval=60)
+        for version in range(1, 3):
+            journal.append([AddNode(id="a", type="Issue")], version=version)
+        assert journal.stats()["pending_fsync"] == 2
+
+        journal.append([AddNode(id="a", type="Issue")], version=3)
+        assert journal.stats()["pending_fsync"] == 0
+        journal.close()
+
+    def test_idle_records_are_synced(self, tmp_path: Path):
+        """Test that a lone record is synced once the interval has passed."""
+        journal = PatchJournal(tmp_path, fsync_every=3, fsync_interval=0.01)
+        journal.sync()
+        journal.append([AddNode(id="a", type="Issue")], version=1)
+        journal._last_sync -= 1
+
+        assert journal.sync_due()
+        assert journal.stats()["pending_fsync"] == 0
+        assert not journal.sync_due()
+        journal.close()
+
+    def test_reopen_recovers_records(self, journal: PatchJournal):
+        """Test that a reopened journal continues the sequence."""
+        journal.close()
+
+        reopened = PatchJournal(journal.directory, segment_bytes=200)
+        record = reopened.append([AddNode(id="d", type="Issue")], version=6)
+
+        assert record.seq == 6
+        assert len(reopened.timeline()) == 6
+        reopened.close()
+
+    def test_torn_tail_is_truncated(self, journal: PatchJournal):
+        """Test that a partially written record is dropped on reopen."""
+        journal.close()
+        active = sorted(journal.directory.glob("segment-*.log"))[-1]
+        with active.open("ab") as log:
+            log.write(b'{"seq": 99, "vers')
+
+        reopened = PatchJournal(journal.directory)
+
+        assert [r.seq for r in reopened.timeline()] == [1, 2, 3, 4, 5]
+        reopened.close()
+
+    def test_store_batches_are_journaled(self, tmp_path: Path):
+        """Test that a subscribed journal records the store version."""
+        store = InMemoryGraphStore()
+        journal = PatchJournal(tmp_path)
+        store.subscribe(lambda patches: journal.append(patches, store.version))
+
+        store.upsert([AddNode(id="a", type="Issue")])
+        store.upsert([UpdateProps(id="missing", properties={})])
+
+        assert [(r.seq, r.version) for r in journal.timeline()] == [(1, 1)]
+        journal.close()
+
+
+class TestQueries:
+    """Tests for timeline and point-in-time queries."""
+
+    def test_timeline_by_time(self, journal: PatchJournal):
+        """Test selecting batches by an inclusive time range."""
+        records = journal.timeline(since=20.0, until=40.0)
+
+        assert [r.version for r in records] == [2, 3, 4]
+
+    def test_timeline_by_entity(self, journal: PatchJournal):
+        """Test that entity timelines include edges touching the node."""
+        assert [r.version for r in journal.timeline("b")] == [1, 3, 4]
+        assert [r.version for r in journal.timeline("a", since=25.0)] == [3]
+
+    def test_node_state_at_time(self, journal: PatchJournal):
+        """Test reconstructing a node as it was at a given time."""
+        assert journal.node_state("a", at=5.0) is None
+        assert journal.node_state("a", at=15.0).properties == {"status": "pending"}
+        assert journal.node_state("a").properties == {"status": "completed"}
+        assert journal.node_state("b", at=35.0) is not None
+        assert journal.node_state("b", at=45.0) is None
+
+
+class TestCompaction:
+    """Tests for folding old segments into a checkpoint."""
+
+    def test_compaction_keeps_net_state(self, journal: PatchJournal):
+        """Test that compacted history still answers state queries."""
+        before = journal.stats()["segments"]
+
+        folded = journal.compact(before=45.0)
+
+        assert folded > 1
+        assert journal.stats()["segments"] < before
+        assert journal.node_state("a").properties == {"status": "completed"}
+        assert journal.node_state("b") is None
+        assert journal.node_state("c").type == "Epic"
+
+    def test_compaction_survives_reopen(self, journal: PatchJournal):
+        """Test that the checkpoint segment is read back after a restart."""
+        journal.compact(before=45.0)
+        journal.close()
+
+        reopened = PatchJournal(journal.directory)
+        records = reopened.timeline()
+
+        assert records[0].checkpoint
+        assert records[-1].version == 5
+        reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_maintenance_syncs_and_compacts(self, tmp_path: Path):
+        """Test that the maintenance task syncs idle records and compacts."""
+        journal = PatchJournal(tmp_path, segment_bytes=100, fsync_interval=0.01)
+        for version in range(1, 6):
+            journal.append(
+                [AddNode(id=f"n{version}", type="Issue")],
+                version=version,
+                timestamp=float(version),
+            )
+        before = journal.stats()["segments"]
+
+        task = asyncio.create_task(
+            maintain_journal(journal, compact_interval=0.01, retention=60)
+        )
+        await asyncio.sleep(0.2)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert journal.stats()["segments"] < before
+        assert journal.stats()["pending_fsync"] == 0
+        assert journal.node_state("n1").type == "Issue"
+        journal.close()
+
+    def test_active_segment_is_never_compacted(self, tmp_path: Path):
+        """Test that a journal with a single segment is left alone."""
+        journal = PatchJournal(tmp_path)
+        journal.append([AddNode(id="a", type="Issue")], timestamp=1.0)
+        journal.append([AddNode(id="b", type="Issue")], timestamp=2.0)
+
+        assert journal.compact(before=100.0) == 0
+        assert len(journal.timeline()) == 2
+        journal.close()
@@ -0,0 +1,123 @@
+"""Unit tests for trusted construction and bulk validation of entities."""
+
+import sys
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from models.graph import (
+    AddEdge,
+    AddNode,
+    Delete,
+    Edge,
+    Patch,
+    UpdateProps,
+    validate_graph_patches,
+)
+
+
+def test_trusted_patch_equals_validated_patch():
+    """Test that a trusted patch is indistinguishable from a validated one."""
+    data = {"op": "add", "entity": "node", "data": {"id": "a", "type": "Issue"}}
+
+    trusted = Patch.trusted(**data)
+
+    assert trusted == Patch(**data)
+    assert trusted.model_dump() == data
+    assert trusted.model_fields_set == {"op", "entity", "data"}
+
+
+def test_trusted_fills_defaults():
+    """Test that omitted fields fall back to their defaults."""
+    edge = Edge.trusted(source="a", target="b", type="BLOCKS")
+
+    assert edge.properties is None
+
+
+def test_trusted_skips_validation():
+    """Test that trusted construction does not validate its input."""
+    patch = Patch.trusted(op="rename", entity="node", data={})
+
+    assert patch.op == "rename"
+
+
+def test_validate_many_accepts_dicts_and_models():
+    """Test that a mixed batch validates into Patch instances."""
+    patches = Patch.validate_many(
+        [
+            {"op": "add", "entity": "node", "data": {"id": "a"}},
+            Patch(op="delete", entity="node", data={"id": "b"}),
+        ]
+    )
+
+    assert [p.op for p in patches] == ["add", "delete"]
+    assert all(isinstance(p, Patch) for p in patches)
+
+
+def test_validate_many_rechecks_trusted_patches():
+    """Test that the bulk validator reports invalid trusted patches by index."""
+    batch = [
+        Patch.trusted(op="add", entity="node", data={"id": "a"}),
+        Patch.trusted(op="rename", entity="node", data={"id": "b"}),
+    ]
+
+    with pytest.raises(ValidationError) as excinfo:
+        Patch.validate_many(batch)
+
+    assert excinfo.value.errors()[0]["loc"][:2] == (1, "op")
+
+
+class TestTypedPatches:
+    """Test cases for the discriminated-union patch models."""
+
+    def test_dicts_dispatch_on_op(self):
+        """Test that dictionaries validate into the model named by ``op``."""
+        patches = validate_graph_patches(
+            [
+                {"op": "add_node", "id": "a", "type": "Issue"},
+                {"op": "add_edge", "source": "a", "target": "b", "type": "BLOCKS"},
+                {"op": "update_props", "id": "a", "properties": {"x": 1}},
+                {"op": "delete", "id": "a"},
+            ]
+        )
+
+        assert [type(p) for p in patches] == [AddNode, AddEdge, UpdateProps, Delete]
+
+    def test_edge_reference_requires_key_fields(self):
+        """Test that edge updates and deletes must identify the edge."""
+        with pytest.raises(ValidationError):
+            Delete(entity="edge", source="a", type="BLOCKS")
+
+    @pytest.mark.parametrize(
+        ("patch", "expected"),
+        [
+            (
+                Patch(op="add", entity="node", data={"id": "a", "type": "Issue"}),
+                AddNode(id="a", type="Issue"),
+            ),
+            (
+                Patch(op="update", entity="node", data={"id": "a", "properties": {}}),
+                UpdateProps(id="a", properties={}),
+            ),
+            (
+                Patch(
+                    op="delete",
+                    entity="edge",
+                    data={"source": "a", "target": "b", "type": "BLOCKS"},
+                ),
+                Delete(entity="edge", source="a", target="b", type="BLOCKS"),
+            ),
+        ],
+    )
+    def test_legacy_patch_converts_to_typed(self, patch, expected):
+        """Test the conversion from the untyped Patch form."""
+        assert patch.typed() == expected
+
+    def test_legacy_patch_missing_key_raises(self):
+        """Test that an incomplete legacy payload cannot be converted."""
+        with pytest.raises(KeyError):
+            Patch(op="add", entity="edge", data={"source": "a"}).typed()
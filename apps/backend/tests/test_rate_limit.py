@@ -0,0 +1,161 @@
+"""Unit tests for the token-bucket rate limiter."""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from api.rate_limit import (
+    MemoryBucketStore,
+    RateLimit,
+    RateLimiter,
+    RateLimitMiddleware,
+    SQLiteBucketStore,
+)
+
+LIMIT = RateLimit(rate=2.0, burst=3)
+
+
+class TestMemoryBucketStore:
+    """Tests for the in-process bucket store."""
+
+    def test_burst_then_refill(self):
+        """Test that a bucket allows a burst and refills at the rate."""
+        store = MemoryBucketStore()
+
+        assert [store.take("k", LIMIT, 0.0).allowed for _ in range(4)] == [
+            True,
+            True,
+            True,
+            False,
+        ]
+        assert store.take("k", LIMIT, 0.0).retry_after == pytest.approx(0.5)
+        assert store.take("k", LIMIT, 0.5).allowed
+        assert not store.take("k", LIMIT, 0.5).allowed
+        assert store.take("k", LIMIT, 100.0).remaining == LIMIT.burst - 1
+
+    def test_keys_are_independent(self):
+        """Test that exhausting one bucket leaves the others full."""
+        store = MemoryBucketStore()
+        for _ in range(3):
+            store.take("a", LIMIT, 0.0)
+
+        assert not store.take("a", LIMIT, 0.0).allowed
+        assert store.take("b", LIMIT, 0.0).allowed
+
+    def test_size_is_bounded(self):
+        """Test that the least recently used buckets are evicted."""
+        store = MemoryBucketStore(max_keys=2)
+        for key in ("a", "b", "c"):
+            store.take(key, LIMIT, 0.0)
+
+        assert len(store) == 2
+
+
+class TestSQLiteBucketStore:
+    """Tests for the bucket store shared between processes."""
+
+    def test_buckets_are_shared(self, tmp_path: Path):
+        """Test that two connections to one file draw from the same bucket."""
+        first = SQLiteBucketStore(tmp_path / "limits.db")
+        second = SQLiteBucketStore(tmp_path / "limits.db")
+        try:
+            first.take("k", LIMIT, 0.0)
+            second.take("k", LIMIT, 0.0)
+            first.take("k", LIMIT, 0.0)
+
+            assert not second.take("k", LIMIT, 0.0).allowed
+        finally:
+            first.close()
+            second.close()
+
+    def test_refilled_buckets_are_pruned(self, tmp_path: Path):
+        """Test that buckets that have refilled are swept from the table."""
+        store = SQLiteBucketStore(tmp_path / "limits.db", prune_every=2)
+        try:
+            store.take("old", LIMIT, 0.0)
+            store.take("new", LIMIT, 10.0)
+
+            keys = store._conn.execute("SELECT key FROM buckets").fetchall()
+            assert keys == [("new",)]
+        finally:
+            store.close()
+
+
+class TestRateLimiting:
+    """Tests for applying limits to requests."""
+
+    @pytest.mark.asyncio
+    async def test_check_raises_429(self):
+        """Test that an empty bucket rejects with a Retry-After header."""
+        limiter = RateLimiter()
+        limit = RateLimit(rate=0.1, burst=1)
+        await limiter.check("k", limit)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await limiter.check("k", limit)
+
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.headers == {"Retry-After": "10"}
+
+    @pytest.mark.asyncio
+    async def test_sqlite_store_runs_off_the_loop(self, tmp_path: Path):
+        """Test that a blocking store is used from a worker thread."""
+        store = SQLiteBucketStore(tmp_path / "limits.db")
+        threads = []
+        take = store.take
+
+        def record_thread(*args):
+            threads.append(threading.current_thread())
+            return take(*args)
+
+        store.take = record_thread
+        try:
+            decision = await RateLimiter(store).take("k", LIMIT)
+        finally:
+            store.close()
+
+        assert decision.allowed
+        assert threads
+        assert threads[0] is not threading.main_thread()
+
+    def test_middleware_limits_prefixes(self):
+        """Test that the middleware limits only the configured prefixes."""
+        app = FastAPI()
+
+        @app.get("/agent/act")
+        async def act():
+            return {}
+
+        @app.get("/other")
+        async def other():
+            return {}
+
+        @app.get("/agents")
+        async def agents():
+            return {}
+
+        app.add_middleware(
+            RateLimitMiddleware,
+            limiter=RateLimiter(),
+            rules={"/agent": RateLimit(rate=0.01, burst=2)},
+        )
+        client = TestClient(app)
+
+        codes = [client.get("/agent/act").status_code for _ in range(3)]
+        assert codes == [200, 200, 429]
+        assert client.get("/agent").status_code == 429
+        assert client.get("/other").status_code == 200
+        # A prefix covers whole path segments only
+        assert client.get("/agents").status_code == 200
+
+    def test_invalid_limit(self):
+        """Test that a limit must allow at least one request."""
+        with pytest.raises(ValueError, match="invalid rate limit"):
+            RateLimit(rate=0, burst=1)
@@ -0,0 +1,53 @@
+"""Unit tests for the orjson-backed response class."""
+
+import sys
+from datetime import UTC, datetime
+from pathlib import Path
+from uuid import UUID
+
+import numpy as np
+import orjson
+import pytest
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from api.responses import FastJSONResponse
+from models.session import TaskInfo
+
+
+class TestFastJSONResponse:
+    """Tests for rendering content with orjson."""
+
+    def test_nested_models_and_native_types(self):
+        """Test that models, datetimes, UUIDs and arrays are encoded."""
+        task = TaskInfo(id="t1", title="Plan", created_at="2025-01-01T00:00:00")
+        content = {
+            "tasks": [task],
+            "at": datetime(2025, 1, 1, tzinfo=UTC),
+            "id": UUID(int=1),
+            "scores": np.arange(3),
+            "tags": {"a"},
+            1: "non-string key",
+        }
+
+        body = orjson.loads(FastJSONResponse(content).body)
+
+        assert body["tasks"] == [task.model_dump(mode="json")]
+        assert body["at"] == "2025-01-01T00:00:00+00:00"
+        assert body["id"] == str(UUID(int=1))
+        assert body["scores"] == [0, 1, 2]
+        assert body["tags"] == ["a"]
+        assert body["1"] == "non-string key"
+
+    def test_model_and_bytes_pass_through(self):
+        """Test that a model uses its own encoder and bytes are sent as is."""
+        task = TaskInfo(id="t1", title="Plan", created_at="2025-01-01T00:00:00")
+
+        assert FastJSONResponse(task).body == task.model_dump_json().encode()
+        assert FastJSONResponse(b'{"a": 1}').body == b'{"a": 1}'
+
+    def test_unknown_type(self):
+        """Test that unsupported values are rejected."""
+        with pytest.raises(TypeError):
+            FastJSONResponse({"value": object()})
@@ -0,0 +1,205 @@
+"""Unit tests for snapshots and point-in-time rollback."""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from graphstore.journal import PatchJournal
+from graphstore.memory import InMemoryGraphStore
+from graphstore.rollback import (
+    RollbackManager,
+    RollbackUnavailableError,
+    SnapshotStore,
+)
+from models.graph import AddEdge, AddNode, Delete, UpdateProps
+
+
+def _graph(store: InMemoryGraphStore) -> tuple[dict, dict]:
+    nodes = {n.id: (n.type, n.properties) for n in store.nodes()}
+    edges = {(e.source, e.type, e.target): e.properties for e in store.edges()}
+    return nodes, edges
+
+
+@pytest.fixture
+def history(tmp_path: Path):
+    """Provide a store with a journal, snapshots every 2 versions and 5 versions.
+
+    v1 add a, b; v2 link a BLOCKS b; v3 update a; v4 delete b; v5 add c.
+    """
+    store = InMemoryGraphStore()
+    journal = PatchJournal(tmp_path / "journal", segment_bytes=300)
+    snapshots = SnapshotStore(tmp_path / "snapshots", every=2)
+    store.subscribe(lambda patches: journal.append(patches, store.version))
+    store.subscribe(lambda _patches: snapshots.maybe_take(store))
+
+    store.upsert(
+        [
+            AddNode(id="a", type="Issue", properties={"status": "pending"}),
+            AddNode(id="b", type="Issue", properties={"name": "B"}),
+        ]
+    )
+    store.upsert([AddEdge(source="a", target="b", type="BLOCKS")])
+    store.upsert([UpdateProps(id="a", properties={"estimate": 3})])
+    store.upsert([Delete(id="b")])
+    store.upsert([AddNode(id="c", type="Epic")])
+
+    yield store, journal, snapshots, RollbackManager(store, journal, snapshots)
+    journal.close()
+
+
+class TestSnapshots:
+    """Tests for the periodic snapshot store."""
+
+    def test_snapshots_taken_periodically(self, history):
+        """Test that a snapshot is written every configured number of versions."""
+        _, _, snapshots, _ = history
+
+        assert snapshots.versions == [2, 4]
+
+    def test_nearest_snapshot(self, history):
+        """Test loading the latest snapshot at or before a version."""
+        _, _, snapshots, _ = history
+
+        assert snapshots.nearest(1) is None
+        assert snapshots.nearest(3).version == 2
+        assert {n.id for n in snapshots.nearest(5).nodes} == {"a"}
+
+    def test_retention(self, tmp_path: Path):
+        """Test that only the most recent snapshots are kept."""
+        store = InMemoryGraphStore()
+        snapshots = SnapshotStore(tmp_path, every=1, keep=2)
+        for version in range(4):
+            store.upsert([AddNode(id=str(version), type="Issue")])
+            snapshots.maybe_take(store)
+
+        assert snapshots.versions == [3, 4]
+        assert len(list(tmp_path.glob("snapshot-*.json"))) == 2
+
+    def test_snapshot_written_in_background(self, tmp_path: Path):
+        """Test that the store listener does not wait for the snapshot write."""
+        store = InMemoryGraphStore()
+        snapshots = SnapshotStore(tmp_path, every=1)
+        released = threading.Event()
+        write = snapshots._write
+        snapshots._write = lambda snapshot: released.wait(5) and write(snapshot)
+        store.subscribe(lambda _patches: snapshots.maybe_take(store))
+
+        store.upsert([AddNode(id="a", type="Issue")])
+        store.upsert([AddNode(id="b", type="Issue")])
+        assert not list(tmp_path.glob("snapshot-*.json"))
+
+        released.set()
+        assert snapshots.versions == [1, 2]
+        assert {n.id for n in snapshots.nearest(1).nodes} == {"a"}
+
+
+class TestRollback:
+    """Tests for rebuilding and restoring past versions."""
+
+    def test_state_at_replays_tail(self, history):
+        """Test rebuilding a version between two snapshots."""
+        _, _, _, manager = history
+
+        nodes, edges = _graph(manager.state_at(3))
+
+        assert nodes["a"] == ("Issue", {"status": "pending", "estimate": 3})
+        assert nodes["b"] == ("Issue", {"name": "B"})
+        assert ("a", "BLOCKS", "b") in edges
+
+    def test_rollback_restores_version(self, history):
+        """Test that a rollback makes the live graph equal the target version."""
+        store, _, _, manager = history
+
+        result = manager.rollback(1)
+
+        assert result["success"]
+        assert result["version"] == 6
+        assert _graph(store) == _graph(manager.state_at(1))
+        assert "estimate" not in store.get_node("a").properties
+        assert store.get_node("c") is None
+
+    def test_rollback_is_one_journaled_batch(self, history):
+        """Test that the inverse patches are applied and journaled as one batch."""
+        store, journal, _, manager = history
+
+        manager.rollback(2)
+
+        assert store.version == 6
+        assert [r.version for r in journal.versions(5)] == [6]
+        assert _graph(store) == _graph(manager.state_at(2))
+
+    def test_rollback_to_current_version_is_noop(self, history):
+        """Test that rolling back to the live version changes nothing."""
+        store, _, _, manager = history
+
+        result = manager.rollback(store.version)
+
+        assert result["applied"] == 0
+        assert store.version == 5
+
+    def test_future_version_is_rejected(self, history):
+        """Test that versions ahead of the live graph are rejected."""
+        _, _, _, manager = history
+
+        with pytest.raises(ValueError, match="outside"):
+            manager.rollback(99)
+
+    def test_compacted_history_is_unavailable(self, history):
+        """Test that versions folded into a checkpoint cannot be rebuilt."""
+        _, journal, snapshots, manager = history
+        for version in snapshots.versions:
+            snapshots._path(version).unlink()
+        snapshots._versions.clear()
+        compacted = journal.compact(before=float("inf"))
+        checkpoint = journal.checkpoint_version()
+
+        assert compacted > 1
+        with pytest.raises(RollbackUnavailableError):
+            manager.state_at(checkpoint - 1)
+        assert _graph(manager.state_at(5)) == _graph(history[0])
+
+
+class TestRecovery:
+    """Tests for reloading the graph from its history after a restart."""
+
+    def test_restart_resumes_history(self, history, tmp_path: Path):
+        """Test that a new process continues the versions of the previous one."""
+        store, journal, snapshots, _ = history
+        before = _graph(store)
+        journal.close()
+        snapshots.flush()
+
+        # A fresh process: empty store, history reopened from disk
+        restarted = InMemoryGraphStore()
+        journal = PatchJournal(tmp_path / "journal", segment_bytes=300)
+        snapshots = SnapshotStore(tmp_path / "snapshots", every=2)
+        restarted.subscribe(lambda patches: journal.append(patches, restarted.version))
+        restarted.subscribe(lambda _patches: snapshots.maybe_take(restarted))
+        manager = RollbackManager(restarted, journal, snapshots)
+
+        assert manager.recover() == 5
+        assert _graph(restarted) == before
+
+        restarted.upsert([AddNode(id="d", type="Issue")])
+        assert restarted.version == 6
+        assert [r.version for r in journal.versions(4)] == [5, 6]
+        assert snapshots.versions[-1] == 6
+
+        manager.rollback(3)
+        nodes, _ = _graph(restarted)
+        assert set(nodes) == {"a", "b"}
+        assert restarted.version == 7
+        journal.close()
+
+    def test_recover_leaves_live_store(self, history):
+        """Test that recovering a store that already holds changes is a no-op."""
+        store, _, _, manager = history
+        before = _graph(store)
+
+        assert manager.recover() == 5
+        assert _graph(store) == before
@@ -4,6 +4,7 @@ This module contains tests for SessionManager and Session classes
 to ensure proper session lifecycle management and message handling.
 """
 
+import asyncio
 import sys
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
@@ -17,7 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
 
 from api.session_manager import SessionManager, SessionNotFoundError
 from api.user_session import UserSession as Session
-from models.session import SessionStatus
+from models.session import SessionResponse, SessionStatus
 
 
 class TestSessionManager:
@@ -95,6 +96,17 @@ class TestSessionManager:
         assert len(user1_sessions) == 2
         assert all(s.user_id == "user1" for s in user1_sessions)
 
+    @pytest.mark.asyncio
+    async def test_restart_after_stop(self, session_manager):
+        """Test that a stopped manager runs again once restarted."""
+        await session_manager.stop()
+        assert not session_manager.is_running
+
+        await session_manager.start()
+        await asyncio.sleep(0)
+
+        assert session_manager.is_running
+
     @pytest.mark.asyncio
     async def test_agent_registration(self, session_manager):
         """Test agent registration."""
@@ -213,6 +225,37 @@ class TestSession:
         assert session.status == SessionStatus.EXPIRED
         assert session._cleanup_complete.is_set()
 
+    @pytest.mark.asyncio
+    async def test_response_json_matches_model(self, session):
+        """Test that the encoded session validates as a SessionResponse."""
+        await session.initialize()
+        await session.add_task({"title": "Test task"})
+
+        response = SessionResponse.model_validate_json(session.response_json())
+
+        info = session.session_info
+        assert response.session_id == info.session_id
+        assert response.project_id == info.project_id
+        assert response.last_activity == info.last_activity.isoformat()
+        assert response.is_active is True
+        assert response.task_count == 1
+        assert response.metadata == info.metadata
+
+    @pytest.mark.asyncio
+    async def test_response_json_cache(self, session):
+        """Test that the encoding is reused until the session changes."""
+        first = session.response_json()
+        cached = session._response_cache
+
+        assert session.response_json() == first
+        assert session._response_cache is cached
+
+        await session.add_task({"title": "Test task"})
+        assert b'"task_count": 1' in session.response_json()
+
+        session.expires_at = datetime.now(UTC) - timedelta(seconds=1)
+        assert b'"is_expired": true' in session.response_json()
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
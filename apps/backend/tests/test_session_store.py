@@ -0,0 +1,160 @@
+"""Unit tests for session state shared between workers."""
+
+import json
+import sys
+import threading
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from api.session_manager import SessionManager, SessionNotFoundError
+from api.session_store import SQLiteSessionStateStore
+from api.user_session import UserSession, state_is_active, state_response_json
+
+
+@pytest_asyncio.fixture
+async def workers(tmp_path: Path):
+    """Provide two session managers sharing one SQLite state store."""
+    managers = [
+        SessionManager(SQLiteSessionStateStore(tmp_path / "sessions.db"), name)
+        for name in ("worker-a", "worker-b")
+    ]
+    try:
+        yield managers
+    finally:
+        for manager in managers:
+            await manager.stop()
+
+
+class TestSessionState:
+    """Tests for serializing session state."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self):
+        """Test that a rebuilt session keeps its identity, context and tasks."""
+        session = UserSession(uuid4(), "user1", uuid4(), {"source": "web"})
+        await session.update_project_context({"sprint": 3})
+        await session.add_task({"title": "Write report", "priority": "high"})
+
+        restored = UserSession.from_state(session.to_state())
+
+        assert restored.to_state() == session.to_state()
+        assert (await restored.get_tasks())[0].priority == "high"
+
+
+class TestSharedSessions:
+    """Tests for sessions reachable from several workers."""
+
+    @pytest.mark.asyncio
+    async def test_other_worker_takes_over(self, workers):
+        """Test that a worker adopts a session created by another one."""
+        first, second = workers
+        session = await first.create_session("user1")
+        await session.add_task({"title": "Plan sprint"})
+
+        adopted = await second.get_session(session.session_id)
+
+        assert adopted is not session
+        assert [t.title for t in await adopted.get_tasks()] == ["Plan sprint"]
+        assert second.session_count == 1
+
+        # The first worker notices it no longer owns the session
+        await adopted.update_project_context({"phase": "build"})
+        again = await first.get_session(session.session_id)
+        assert again is not session
+        assert await again.get_project_context() == {"phase": "build"}
+
+    @pytest.mark.asyncio
+    async def test_destroy_is_seen_by_all_workers(self, workers):
+        """Test that a session destroyed by one worker is gone for the others."""
+        first, second = workers
+        session = await first.create_session("user1")
+
+        assert await second.destroy_session(session.session_id)
+
+        with pytest.raises(SessionNotFoundError):
+            await first.get_session(session.session_id)
+        assert first.session_count == 0
+
+    @pytest.mark.asyncio
+    async def test_list_includes_other_workers(self, workers):
+        """Test that listing returns sessions run by any worker."""
+        first, second = workers
+        await first.create_session("user1")
+        await second.create_session("user1")
+        await second.create_session("user2")
+
+        assert len(await first.list_sessions()) == 3
+        assert len(await first.list_sessions(user_id="user1")) == 2
+
+    @pytest.mark.asyncio
+    async def test_state_response_matches_live_response(self, workers):
+        """Test that another worker's session encodes like the live session."""
+        first, second = workers
+        session = await first.create_session("user1", metadata={"source": "web"})
+        await session.add_task({"title": "Plan sprint"})
+
+        ((state, live),) = await second.session_states()
+
+        assert live is None
+        assert json.loads(state_response_json(state)) == json.loads(
+            session.response_json()
+        )
+        assert state_is_active(state)
+
+    @pytest.mark.asyncio
+    async def test_purge_expired(self, tmp_path: Path):
+        """Test that expired states are removed from the store."""
+        store = SQLiteSessionStateStore(tmp_path / "sessions.db")
+        session = UserSession(uuid4(), "user1")
+        store.save(session.to_state(), "worker-a")
+
+        assert store.purge_expired(datetime.now(UTC)) == 0
+        assert store.purge_expired(datetime.now(UTC) + timedelta(hours=2)) == 1
+        assert store.load(session.session_id) is None
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_sqlite_lookups_run_off_the_loop(self, workers):
+        """Test that a blocking state store is queried from a worker thread."""
+        first, _ = workers
+        session = await first.create_session("user1")
+        threads = []
+        owner = first._state_store.owner
+
+        def record_thread(session_id):
+            threads.append(threading.current_thread())
+            return owner(session_id)
+
+        first._state_store.owner = record_thread
+
+        assert await first.get_session(session.session_id) is session
+        assert threads
+        assert threads[0] is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    async def test_sqlite_saves_run_off_the_loop(self, workers):
+        """Test that state changes are written to a blocking store from a thread."""
+        first, second = workers
+        session = await first.create_session("user1")
+        threads = []
+        save = first._state_store.save
+
+        def record_thread(state, worker_id):
+            threads.append(threading.current_thread())
+            save(state, worker_id)
+
+        first._state_store.save = record_thread
+
+        await session.update_project_context({"sprint": 4})
+
+        assert threads
+        assert threads[0] is not threading.main_thread()
+        ((state, _),) = await second.session_states()
+        assert state["project_context"] == {"sprint": 4}
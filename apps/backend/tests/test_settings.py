@@ -0,0 +1,111 @@
+"""Unit tests for the typed settings and configuration reloads."""
+
+import sys
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from api.session_manager import SessionManager
+from api.session_store import MemorySessionStateStore
+from config.config import get_config
+from config.settings import Settings, apply_env_overrides
+
+
+class TestSettings:
+    """Tests for validating the configuration."""
+
+    def test_defaults_and_extra_keys(self):
+        """Test that missing settings get defaults and unknown keys are kept."""
+        settings = Settings.model_validate({"runtime": {"custom_knob": 3}})
+
+        assert settings.runtime.max_sessions == 1000
+        assert settings.runtime.session_create_limit.burst == 5
+        assert settings.runtime.custom_knob == 3
+
+    def test_frozen(self):
+        """Test that a snapshot cannot be modified."""
+        settings = Settings()
+
+        with pytest.raises(ValidationError):
+            settings.runtime.max_sessions = 5
+
+    def test_invalid_values_rejected(self):
+        """Test that out-of-range settings fail validation."""
+        with pytest.raises(ValidationError):
+            Settings.model_validate({"runtime": {"max_sessions": 0}})
+        with pytest.raises(ValidationError):
+            Settings.model_validate({"logging": {"format": "xml"}})
+
+    def test_env_overrides(self):
+        """Test that BACKEND__ variables override nested keys, parsed as JSON."""
+        config = {"runtime": {"max_sessions": 10}}
+        environ = {
+            "BACKEND__RUNTIME__MAX_SESSIONS": "25",
+            "BACKEND__RUNTIME__RATE_LIMITS": '{"/agent": {"rate": 4}}',
+            "BACKEND__SERVER__HOST": "127.0.0.1",
+            "UNRELATED": "1",
+        }
+
+        settings = Settings.model_validate(apply_env_overrides(config, environ))
+
+        assert settings.runtime.max_sessions == 25
+        assert settings.runtime.rate_limits["/agent"].rate == 4
+        assert settings.server.host == "127.0.0.1"
+        assert config == {"runtime": {"max_sessions": 10}}
+
+
+class TestReload:
+    """Tests for swapping in a new configuration snapshot."""
+
+    @pytest.fixture
+    def config(self, monkeypatch: pytest.MonkeyPatch):
+        """Provide the global configuration, reloaded from disk afterwards."""
+        config = get_config()
+        try:
+            yield config
+        finally:
+            monkeypatch.undo()
+            config.reload()
+
+    def test_session_manager_reads_runtime_limits(self, config):
+        """Test that session limits come from the runtime section."""
+        manager = SessionManager(MemorySessionStateStore())
+
+        assert manager.max_sessions == config.settings.runtime.max_sessions
+        assert manager._session_timeout == config.config["runtime"]["session_timeout"]
+
+    @pytest.mark.asyncio
+    async def test_reload_updates_session_manager(
+        self, config, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that a reload swaps the snapshot and retunes live managers."""
+        manager = SessionManager(MemorySessionStateStore())
+        before = config.settings
+        monkeypatch.setenv("BACKEND__RUNTIME__MAX_SESSIONS", "7")
+        monkeypatch.setenv("BACKEND__RUNTIME__SESSION_TIMEOUT", "60")
+
+        after = config.reload()
+
+        assert after is config.settings is not before
+        assert before.runtime.max_sessions != 7
+        assert manager.max_sessions == 7
+        session = await manager.create_session("user1")
+        assert (session.expires_at - session.created_at).total_seconds() == 60
+        await manager.stop()
+
+    def test_invalid_reload_keeps_snapshot(
+        self, config, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that an invalid configuration leaves the current one in place."""
+        before = config.settings
+        monkeypatch.setenv("BACKEND__RUNTIME__MAX_SESSIONS", "0")
+
+        with pytest.raises(ValidationError):
+            config.reload()
+
+        assert config.settings is before
+        assert config.config["runtime"]["max_sessions"] != 0
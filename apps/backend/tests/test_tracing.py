@@ -0,0 +1,95 @@
+"""Unit tests for agent pipeline tracing."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from agent import graph
+from config.settings import RuntimeSettings
+from config.tracing import setup_tracing
+from graphstore.memory import InMemoryGraphStore
+from models.graph import ExtractedEntity
+
+
+@pytest.fixture(scope="module")
+def traces(tmp_path_factory):
+    """Install a tracer provider with file and in-memory exporters."""
+    logs_path = tmp_path_factory.mktemp("logs")
+    provider = setup_tracing(
+        RuntimeSettings(enable_tracing=True, tracing_exporter="file"), logs_path
+    )
+    memory = InMemorySpanExporter()
+    provider.add_span_processor(SimpleSpanProcessor(memory))
+    return provider, memory, logs_path / "traces.jsonl"
+
+
+def test_tracing_disabled_returns_none(tmp_path):
+    """Test that no provider is installed when tracing is disabled."""
+    assert setup_tracing(RuntimeSettings(), tmp_path) is None
+
+
+def test_agent_step_span_records_patch_count(traces):
+    """Test that graph nodes emit spans with their patch count."""
+    _, memory, _ = traces
+    memory.clear()
+
+    graph.resolve(
+        {
+            "validated_entities": [
+                ExtractedEntity(type="Issue", name="traced issue", progetto_id="px")
+            ]
+        }
+    )
+
+    span = next(s for s in memory.get_finished_spans() if s.name == "agent.resolve")
+    assert span.attributes["puntini.patch_count"] == 1
+
+
+def test_graph_store_calls_are_traced(traces):
+    """Test that GraphStore implementations are instrumented automatically."""
+    _, memory, _ = traces
+    memory.clear()
+
+    InMemoryGraphStore().upsert([])
+
+    span = next(s for s in memory.get_finished_spans() if s.name == "graphstore.upsert")
+    assert span.attributes["graphstore.backend"] == "InMemoryGraphStore"
+    assert span.attributes["puntini.patch_count"] == 0
+
+
+def test_file_exporter_writes_durations(traces):
+    """Test that the local exporter writes one JSON line per span."""
+    provider, _, trace_file = traces
+
+    InMemoryGraphStore().health()
+    provider.force_flush()
+
+    records = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    health = next(r for r in records if r["name"] == "graphstore.health")
+    assert health["duration_ms"] >= 0
+    assert health["attributes"]["graphstore.backend"] == "InMemoryGraphStore"
+
+
+def test_provider_is_installed_once(traces, tmp_path):
+    """Test that later setups reuse the provider and keep it recording."""
+    provider, memory, _ = traces
+
+    again = setup_tracing(
+        RuntimeSettings(enable_tracing=True, tracing_exporter="file"), tmp_path
+    )
+    provider.force_flush()
+    memory.clear()
+    InMemoryGraphStore().health()
+
+    assert again is provider
+    assert not (tmp_path / "traces.jsonl").exists()
+    assert [s.name for s in memory.get_finished_spans()] == ["graphstore.health"]
@@ -0,0 +1,230 @@
+"""Unit tests for the embedders and the vector index."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the parent directory to the Python path to allow for relative imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from agent.embeddings import HashingEmbedder
+from agent.vector_index import VectorIndex, open_vector_index
+from graphstore.memory import InMemoryGraphStore
+from models.graph import AddNode, Delete, UpdateProps
+
+TEXTS = {
+    "e1": ("Payments", "Card payments, refunds and payment gateway retries"),
+    "e2": ("Onboarding", "User signup, email verification and welcome tour"),
+    "i1": ("Refund fails", "Refunds to expired cards fail at the gateway"),
+    "i2": ("Slow signup", "Email verification emails arrive late at signup"),
+}
+
+
+@pytest.fixture
+def store() -> InMemoryGraphStore:
+    """Provide a store with two epics and two issues in one project."""
+    store = InMemoryGraphStore()
+    store.upsert(
+        [
+            AddNode(
+                id=node_id,
+                type="Epic" if node_id.startswith("e") else "Issue",
+                properties={
+                    "name": name,
+                    "description": description,
+                    "progetto_id": "p1",
+                },
+            )
+            for node_id, (name, description) in TEXTS.items()
+        ]
+    )
+    return store
+
+
+@pytest.fixture
+def index(store: InMemoryGraphStore) -> VectorIndex:
+    """Provide a vector index subscribed to the store."""
+    index = VectorIndex.from_nodes(store.nodes(), HashingEmbedder(64))
+    store.subscribe(index.apply)
+    return index
+
+
+class TestHashingEmbedder:
+    """Tests for the deterministic hashing embedder."""
+
+    def test_vectors_are_deterministic_unit_rows(self):
+        """Test that the same text always embeds to the same unit vector."""
+        embedder = HashingEmbedder(32)
+        first = embedder.embed(["Payment gateway", "payment  GATEWAY"])
+        second = HashingEmbedder(32).embed(["Payment gateway"])
+
+        assert first.shape == (2, 32)
+        assert first.dtype == np.float32
+        np.testing.assert_allclose(np.linalg.norm(first, axis=1), 1.0, rtol=1e-6)
+        np.testing.assert_array_equal(first[0], first[1])
+        np.testing.assert_array_equal(first[0], second[0])
+
+    def test_empty_text_embeds_to_zero(self):
+        """Test that a text without words yields a zero vector."""
+        assert not HashingEmbedder(16).embed(["  ?! "]).any()
+
+
+class TestSearch:
+    """Tests for nearest-neighbour queries."""
+
+    def test_nearest_entities(self, index: VectorIndex):
+        """Test that entities sharing vocabulary rank first."""
+        matches = index.search("refunds at the payment gateway", k=2)
+
+        assert {m.id for m in matches} == {"e1", "i1"}
+        assert matches[0].score >= matches[1].score
+
+    def test_filters(self, index: VectorIndex):
+        """Test the type and project filters."""
+        assert [m.id for m in index.search("signup", node_type="Issue", k=1)] == ["i2"]
+        assert index.search("signup", progetto_id="p2") == []
+
+    def test_blank_query(self, index: VectorIndex):
+        """Test that a query without features matches nothing."""
+        assert index.search("...") == []
+
+    def test_non_positive_k(self, index: VectorIndex):
+        """Test that asking for no matches returns none."""
+        assert index.search("signup", k=0) == []
+        assert index.search("signup", k=-1) == []
+
+
+class TestIncrementalUpdates:
+    """Tests for keeping the index in sync with applied patches."""
+
+    def test_description_update_reembeds(
+        self, store: InMemoryGraphStore, index: VectorIndex
+    ):
+        """Test that changing a description moves the entity in vector space."""
+        store.upsert(
+            [
+                UpdateProps(
+                    id="e2",
+                    properties={"description": "Invoice export to accounting"},
+                )
+            ]
+        )
+
+        assert index.search("invoice export accounting", k=1)[0].id == "e2"
+
+    def test_delete_frees_row(self, store: InMemoryGraphStore, index: VectorIndex):
+        """Test that deleted entities disappear and their rows are reused."""
+        store.upsert([Delete(id="i1")])
+        assert "i1" not in {m.id for m in index.search("refund gateway")}
+
+        store.upsert(
+            [AddNode(id="i3", type="Issue", properties={"name": "Gateway timeout"})]
+        )
+        assert len(index) == 4
+        assert index.search("gateway timeout", k=1)[0].id == "i3"
+
+    def test_unindexed_types_are_skipped(
+        self, store: InMemoryGraphStore, index: VectorIndex
+    ):
+        """Test that only the configured node types are embedded."""
+        store.upsert(
+            [AddNode(id="u1", type="Utente", properties={"name": "Refund expert"})]
+        )
+
+        assert "u1" not in {m.id for m in index.search("refund expert")}
+
+
+class TestIvf:
+    """Tests for the IVF partitioning."""
+
+    def test_trained_index_finds_exact_text(self):
+        """Test that probing the nearest clusters finds an indexed text."""
+        rng = np.random.default_rng(1)
+        words = [f"w{i}" for i in range(200)]
+        nodes = {
+            f"n{i}": " ".join(rng.choice(words, 5, replace=False)) for i in range(400)
+        }
+        index = VectorIndex(HashingEmbedder(64), nprobe=2)
+        index.apply(
+            AddNode(id=node_id, type="Issue", properties={"name": name})
+            for node_id, name in nodes.items()
+        )
+
+        index.train(8)
+
+        assert index.trained
+        for node_id in ("n0", "n123", "n399"):
+            assert index.search(nodes[node_id], k=1)[0].id == node_id
+
+    def test_training_needs_enough_rows(self, index: VectorIndex):
+        """Test that more clusters than rows are rejected."""
+        with pytest.raises(ValueError, match="cannot train"):
+            index.train(16)
+
+
+class TestPersistence:
+    """Tests for saving and memory-mapping the index."""
+
+    def test_round_trip_is_memory_mapped(self, index: VectorIndex, tmp_path: Path):
+        """Test that a loaded index maps its vectors and answers the same."""
+        index.train(2)
+        index.save(tmp_path)
+
+        loaded = VectorIndex.load(tmp_path, HashingEmbedder(64))
+
+        assert isinstance(loaded._vectors, np.memmap)
+        assert loaded.trained
+        assert loaded.search("email signup") == index.search("email signup")
+
+    def test_loaded_index_accepts_updates(self, index: VectorIndex, tmp_path: Path):
+        """Test that updates to a mapped index do not touch the saved file."""
+        index.save(tmp_path)
+        loaded = VectorIndex.load(tmp_path, HashingEmbedder(64))
+
+        loaded.apply([Delete(id="e1")])
+        loaded.apply(
+            [AddNode(id="i9", type="Issue", properties={"name": "Audit trail"})]
+        )
+
+        assert loaded.search("audit trail", k=1)[0].id == "i9"
+        reloaded = VectorIndex.load(tmp_path, HashingEmbedder(64))
+        assert "e1" in {m.id for m in reloaded.search("card payments")}
+
+    def test_embedder_mismatch(self, index: VectorIndex, tmp_path: Path):
+        """Test that an index is not loaded with a different embedder."""
+        index.save(tmp_path)
+
+        with pytest.raises(ValueError, match="built with"):
+            VectorIndex.load(tmp_path, HashingEmbedder(128))
+
+    def test_open_reuses_index_of_current_version(
+        self, store: InMemoryGraphStore, index: VectorIndex, tmp_path: Path
+    ):
+        """Test that an index saved at the store's version is mapped as is."""
+        index.save(tmp_path, graph_version=store.version)
+
+        opened = open_vector_index(tmp_path, store, HashingEmbedder(64))
+
+        assert isinstance(opened._vectors, np.memmap)
+        assert opened.graph_version == store.version
+
+    def test_open_rebuilds_stale_index(self, store: InMemoryGraphStore, tmp_path: Path):
+        """Test that an index saved before later store changes is rebuilt."""
+        index = VectorIndex.from_nodes(store.nodes(), HashingEmbedder(64))
+        index.save(tmp_path, graph_version=store.version)
+        store.upsert(
+            [AddNode(id="i9", type="Issue", properties={"name": "Audit trail"})]
+        )
+
+        opened = open_vector_index(tmp_path, store, HashingEmbedder(64))
+
+        assert not isinstance(opened._vectors, np.memmap)
+        assert opened.search("audit trail", k=1)[0].id == "i9"
+        assert (
+            open_vector_index(tmp_path, store, HashingEmbedder(128))
+            .search("audit trail", k=1)[0]
+            .id
+            == "i9"
+        )